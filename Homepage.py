@@ -2,6 +2,8 @@ import streamlit as st
 from streamlit_lottie import st_lottie
 import requests
 
+from caresphere import model_pool
+
 # ----------------------------
 # Streamlit Page Config
 # ----------------------------
@@ -10,6 +12,9 @@ st.set_page_config(
     page_icon="👋",
 )
 
+# Start loading the models named in CARESPHERE_PREWARM while the landing page renders
+model_pool.prewarm_from_env()
+
 # ----------------------------
 # Page Header
 # ----------------------------
@@ -0,0 +1,66 @@
+"""Throughput and peak memory of chunked CSV scoring with the tabular models.
+
+Usage: python -m benchmarks.bulk_scoring [--model diabetes] [--rows 1000000] [--chunk-sizes 10000 50000]
+
+Writes a synthetic registry of ``--rows`` patients (uniform values inside each
+column's accepted range, 1% of rows deliberately invalid) to a temporary CSV,
+then scores it with ``bulk_scoring.score_csv`` once per chunk size. Peak RSS is
+read after each run; with bounded chunks it should not grow with ``--rows``.
+"""
+import argparse
+import os
+import resource
+import tempfile
+
+import numpy as np
+
+from caresphere import bulk_scoring, tabular_engine
+
+
+def _write_registry(key: str, rows: int, path: str, block: int = 100_000) -> None:
+    import pandas as pd
+
+    spec = tabular_engine.get_spec(key)
+    rng = np.random.default_rng(0)
+    for start in range(0, rows, block):
+        n = min(block, rows - start)
+        frame = pd.DataFrame({"Id": np.arange(start, start + n)})
+        for feature in spec.features:
+            if feature.choices is not None:
+                frame[feature.name] = rng.choice(list(feature.choices), size=n)
+            else:
+                values = rng.uniform(feature.minimum, feature.maximum, size=n)
+                frame[feature.name] = np.round(values) if feature.integer else np.round(values, 3)
+        broken = rng.random(n) < 0.01
+        first = spec.features[0].name
+        frame[first] = frame[first].astype(object)
+        frame.loc[broken, first] = "n/a"
+        frame.to_csv(path, mode="a", header=start == 0, index=False)
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", choices=sorted(tabular_engine.TABULAR_MODELS), default="diabetes")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[10_000, 50_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source, output = os.path.join(tmp, "registry.csv"), os.path.join(tmp, "scores.csv")
+        _write_registry(args.model, args.rows, source)
+        tabular_engine.get_model(args.model)
+        print(f"{args.model}: {args.rows:,} rows, {os.path.getsize(source) / 2 ** 20:.0f} MB CSV, "
+              f"baseline peak RSS {_peak_rss_mb():.0f} MB")
+        print(f"{'chunk':>8}{'rows/s':>12}{'seconds':>10}{'invalid':>10}{'peak RSS MB':>13}")
+        for chunk_size in args.chunk_sizes:
+            summary = bulk_scoring.score_csv(args.model, source, output, chunk_size, keep=["Id"])
+            print(f"{chunk_size:>8}{summary.rows_per_second:>12,.0f}{summary.seconds:>10.2f}"
+                  f"{summary.invalid:>10}{_peak_rss_mb():>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Per-call latency of the compiled TensorFlow backends against ``model.predict``.
+
+Usage: python -m benchmarks.compiled_keras [--calls 200] [--batch 32]
+
+For every audio model this loads the ``keras`` (``model.predict``),
+``tf-function`` (traced graph, fixed ``(None, 40)`` signature), ``tf-xla``
+(the same graph under XLA) and ``numpy`` backends, checks the compiled
+outputs against ``model.predict`` and times single-row and batched calls.
+Load time includes tracing / compilation and the warm-up call.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from caresphere import audio_engine
+
+BACKENDS = ["keras", "tf-function", "tf-xla", "numpy"]
+
+
+def _per_call_ms(model, X: np.ndarray, calls: int) -> float:
+    model.predict(X)
+    start = time.perf_counter()
+    for _ in range(calls):
+        model.predict(X)
+    return (time.perf_counter() - start) * 1000 / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=32)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(0, 30, size=(args.batch, audio_engine.N_MFCC)).astype(np.float32)
+    for key in audio_engine.AUDIO_MODELS:
+        print(f"[{key}]")
+        print(f"  {'backend':<12}{'load ms':>10}{'1 row ms':>10}{f'{args.batch} rows ms':>12}{'max |dp|':>11}")
+        reference = None
+        for backend in BACKENDS:
+            start = time.perf_counter()
+            model = audio_engine.get_model(key, backend)
+            load_ms = (time.perf_counter() - start) * 1000
+            probs = model.predict(X)
+            if reference is None:
+                reference = probs
+            err = np.abs(probs - reference).max()
+            one = _per_call_ms(model, X[:1], args.calls)
+            many = _per_call_ms(model, X, max(1, args.calls // 4))
+            print(f"  {backend:<12}{load_ms:>10.0f}{one:>10.3f}{many:>12.3f}{err:>11.1e}")
+            assert np.array_equal(probs.argmax(axis=1), reference.argmax(axis=1)), f"{key}/{backend} argmax differs"
+
+
+if __name__ == "__main__":
+    main()
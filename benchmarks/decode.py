@@ -0,0 +1,87 @@
+"""Decode + resample latency of the feature path on long uploads.
+
+Usage: python -m benchmarks.decode [--seconds 60] [--repeat 5]
+
+The bundled recordings are tiled into long 44.1 kHz WAV and MP3 uploads (the
+common phone/stethoscope export rates). For each one this times the original
+full-call ``librosa.load(..., sr=22050, offset, duration)`` path against
+``audio_engine.decode`` + ``resample`` with every candidate resampler, and
+reports how far the resulting MFCC vectors and model predictions move from
+the original path. Only switch ``CARESPHERE_RES_TYPE`` to a resampler that keeps
+argmax agreement at 100%.
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import librosa
+import numpy as np
+import soundfile
+
+from caresphere import audio_engine
+
+SAMPLE_DIR = Path(audio_engine.MODEL_DIR) / "Webapp Testing Data"
+UPLOAD_SR = 44100
+RES_TYPES = ["soxr_hq", "soxr_mq", "soxr_lq", "polyphase"]
+
+
+def _make_uploads(out_dir: Path, seconds: float):
+    uploads = []
+    for wav in sorted(SAMPLE_DIR.glob("*.wav")):
+        y, _ = librosa.load(wav, sr=UPLOAD_SR)
+        y = np.tile(y, int(np.ceil(seconds * UPLOAD_SR / len(y))))[: int(seconds * UPLOAD_SR)]
+        for fmt in ("WAV", "MP3"):
+            path = out_dir / f"{wav.stem}.{fmt.lower()}"
+            soundfile.write(path, y, UPLOAD_SR, format=fmt)
+            uploads.append(path)
+    return uploads
+
+
+def _original(path: Path) -> np.ndarray:
+    y, sr = librosa.load(path, sr=audio_engine.SAMPLE_RATE, offset=audio_engine.OFFSET,
+                         duration=audio_engine.DURATION)
+    return audio_engine.extract_mfcc(y, sr)
+
+
+def _windowed(path: Path, res_type: str) -> np.ndarray:
+    y, native_sr = audio_engine.decode(str(path))
+    return audio_engine.extract_mfcc(audio_engine.resample(y, native_sr, res_type=res_type))
+
+
+def _median_ms(fn, repeat: int) -> float:
+    fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0, help="length of the generated uploads")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        uploads = _make_uploads(Path(tmp), args.seconds)
+        for path in uploads:
+            reference = _original(path)
+            print(f"{path.name} ({args.seconds:.0f} s @ {UPLOAD_SR} Hz)")
+            print(f"  {'original':<18}{_median_ms(lambda: _original(path), args.repeat):9.1f} ms")
+            for res_type in RES_TYPES:
+                features = _windowed(path, res_type)
+                ms = _median_ms(lambda: _windowed(path, res_type), args.repeat)
+                line = f"  {'window+' + res_type:<18}{ms:9.1f} ms  max |dMFCC|={np.abs(features - reference).max():.3f}"
+                for key in audio_engine.AUDIO_MODELS:
+                    ref_probs, probs = audio_engine.predict_features(key, np.stack([reference, features]))
+                    same = ref_probs.argmax() == probs.argmax()
+                    line += f"  {key}: {'same' if same else 'DIFF'} |dp|={np.abs(ref_probs - probs).max():.1e}"
+                print(line)
+
+
+if __name__ == "__main__":
+    main()
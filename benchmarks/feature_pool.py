@@ -0,0 +1,51 @@
+"""Scaling of process-pool feature extraction with the number of workers.
+
+Usage: python -m benchmarks.feature_pool [--recordings 1000] [--workers 1 2 4 8]
+
+The bundled ``Webapp Testing Data`` recordings are replicated to build a
+corpus of the requested size (passed as in-memory bytes, like uploads). The
+thread-pool path used by the pages is measured as the baseline.
+"""
+import argparse
+import os
+import time
+from pathlib import Path
+
+from caresphere import audio_engine
+from caresphere.feature_pool import FeaturePool
+
+SAMPLE_DIR = Path(audio_engine.MODEL_DIR) / "Webapp Testing Data"
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recordings", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1))))
+    args = parser.parse_args()
+
+    samples = [p.read_bytes() for p in sorted(SAMPLE_DIR.glob("*.wav"))]
+    corpus = [samples[i % len(samples)] for i in range(args.recordings)]
+    print(f"{args.recordings} recordings, {cpus} CPUs")
+
+    start = time.perf_counter()
+    audio_engine.extract_features_batch(corpus)
+    baseline = time.perf_counter() - start
+    print(f"{'threads (default)':<20}{baseline:8.2f} s  {args.recordings / baseline:8.1f} files/s")
+
+    first = None
+    for workers in args.workers:
+        with FeaturePool(workers) as pool:
+            pool.extract(corpus[:workers])  # warm the workers up
+            start = time.perf_counter()
+            features, errors = pool.extract(corpus)
+            elapsed = time.perf_counter() - start
+        assert not errors, errors
+        first = first or (workers, elapsed)
+        print(f"{f'processes x{workers}':<20}{elapsed:8.2f} s  {args.recordings / elapsed:8.1f} files/s"
+              f"  speedup vs x{first[0]}: {first[1] / elapsed:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
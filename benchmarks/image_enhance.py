@@ -0,0 +1,88 @@
+"""Milliseconds per megapixel of the grayscale enhancement presets vs the original PIL/OpenCV chain.
+
+Usage: python -m benchmarks.image_enhance [--sizes 640x480 1600x1200 4000x3000] [--repeats 5]
+
+Renders a synthetic medicine-strip photo (dark print on a tinted, unevenly lit
+background with sensor noise and a slight blur) at each size. It then times
+``image_enhance.enhance`` for every preset and ``_legacy_enhance``, which is
+the chain ``enhance_image_quality`` ran before (PIL enhancers on RGB copies,
+then OpenCV). Each output is compared with the legacy output: mean absolute
+difference and PSNR in grey levels. Timings are per megapixel of the input.
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+from PIL import Image, ImageEnhance, ImageFilter
+
+from caresphere import image_enhance
+
+
+def _legacy_enhance(img: np.ndarray) -> np.ndarray:
+    """The original MediRxScan enhance_image_quality(), minus the file I/O"""
+    pil_img = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+    width, height = pil_img.size
+    if width < 800 or height < 600:
+        scale_factor = max(800 / width, 600 / height)
+        pil_img = pil_img.resize((int(width * scale_factor), int(height * scale_factor)), Image.LANCZOS)
+    pil_img = ImageEnhance.Contrast(pil_img).enhance(2.0)
+    pil_img = ImageEnhance.Brightness(pil_img).enhance(1.2)
+    pil_img = ImageEnhance.Sharpness(pil_img).enhance(2.0)
+    pil_img = pil_img.filter(ImageFilter.UnsharpMask(radius=2, percent=150, threshold=3))
+    enhanced_img = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
+    gray = cv2.cvtColor(enhanced_img, cv2.COLOR_BGR2GRAY)
+    enhanced_gray = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(gray)
+    blurred = cv2.GaussianBlur(enhanced_gray, (0, 0), 2.0)
+    unsharp_mask = cv2.addWeighted(enhanced_gray, 1.5, blurred, -0.5, 0)
+    return cv2.morphologyEx(unsharp_mask, cv2.MORPH_CLOSE, np.ones((1, 1), np.uint8))
+
+
+def _scan(width: int, height: int, rng) -> np.ndarray:
+    # Warm tinted background with a lighting gradient
+    ramp = np.linspace(0.75, 1.0, width, dtype=np.float32)[None, :, None]
+    img = (np.array([175, 200, 215], dtype=np.float32) * ramp).repeat(height, axis=0)
+    img = np.ascontiguousarray(img.astype(np.uint8))
+    scale = height / 300
+    for i, line in enumerate(["PARACETAMOL TABLETS IP", "500 mg  Batch B2417", "EXP 08/2027  MFD 09/2025"]):
+        cv2.putText(img, line, (int(20 * scale), int((80 + 70 * i) * scale)), cv2.FONT_HERSHEY_SIMPLEX,
+                    0.9 * scale, (60, 45, 40), max(1, int(2 * scale)), cv2.LINE_AA)
+    noisy = img.astype(np.int16) + rng.normal(0, 6, img.shape).astype(np.int16)
+    return cv2.GaussianBlur(np.clip(noisy, 0, 255).astype(np.uint8), (0, 0), 0.8 * scale)
+
+
+def _best_ms(fn, image: np.ndarray, repeats: int):
+    fn(image)
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        out = fn(image)
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times), out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["640x480", "1600x1200", "4000x3000"])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for size in args.sizes:
+        width, height = (int(v) for v in size.split("x"))
+        image = _scan(width, height, rng)
+        megapixels = width * height / 1e6
+        legacy_ms, reference = _best_ms(_legacy_enhance, image, args.repeats)
+        print(f"[{size}] {megapixels:.2f} MP, output {reference.shape[1]}x{reference.shape[0]}")
+        print(f"  {'legacy':<10} {legacy_ms:8.1f} ms  {legacy_ms / megapixels:8.1f} ms/MP")
+        for name in image_enhance.PRESETS:
+            ms, out = _best_ms(lambda img: image_enhance.enhance(img, name), image, args.repeats)
+            diff = np.abs(out.astype(np.int16) - reference.astype(np.int16))
+            mse = float(np.mean(diff.astype(np.float64) ** 2))
+            psnr = 10 * np.log10(255 ** 2 / mse) if mse else float("inf")
+            print(f"  {name:<10} {ms:8.1f} ms  {ms / megapixels:8.1f} ms/MP  {legacy_ms / ms:5.1f}x  "
+                  f"vs legacy: mean |d|={diff.mean():5.2f}  PSNR={psnr:5.1f} dB")
+
+
+if __name__ == "__main__":
+    main()
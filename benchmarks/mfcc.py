@@ -0,0 +1,91 @@
+"""Validate the native MFCC extractor against librosa and compare latency.
+
+Usage: python -m benchmarks.mfcc [--random 200] [--calls 100] [--batch 32]
+
+Checks the mel filterbank and mean-MFCC vectors of the bundled recordings and
+of random 3-second signals (white noise, tones, silence-padded clips) against
+``librosa.feature.mfcc``, asserts the model predictions do not change, then
+times one window and a batch of windows through both implementations.
+"""
+import argparse
+import time
+from pathlib import Path
+
+import librosa
+import numpy as np
+
+from caresphere import audio_engine
+from caresphere.mfcc import MFCCExtractor, mel_filterbank
+
+SAMPLE_DIR = Path(audio_engine.MODEL_DIR) / "Webapp Testing Data"
+SR = audio_engine.SAMPLE_RATE
+N = int(audio_engine.DURATION * SR)
+
+
+def _librosa_mfcc(y: np.ndarray) -> np.ndarray:
+    return np.mean(librosa.feature.mfcc(y=y, sr=SR, n_mfcc=audio_engine.N_MFCC).T, axis=0)
+
+
+def _signals(n_random: int) -> np.ndarray:
+    recorded = [audio_engine.load_window(str(p)) for p in sorted(SAMPLE_DIR.glob("*.wav"))]
+    rng = np.random.default_rng(0)
+    t = np.arange(N) / SR
+    signals = [np.pad(y, (0, N - len(y))) for y in recorded]
+    for i in range(n_random):
+        kind = i % 3
+        if kind == 0:
+            y = rng.normal(0, rng.uniform(0.01, 0.5), N)
+        elif kind == 1:
+            y = rng.uniform(0.05, 0.8) * np.sin(2 * np.pi * rng.uniform(20, 4000) * t)
+        else:
+            y = np.zeros(N)
+            start = rng.integers(0, N // 2)
+            y[start:start + N // 4] = rng.normal(0, 0.2, N // 4)
+        signals.append(y)
+    return np.stack(signals).astype(np.float32)
+
+
+def _ms(fn, calls: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) * 1000 / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--random", type=int, default=200, help="number of synthetic 3 s signals")
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--batch", type=int, default=32)
+    args = parser.parse_args()
+
+    extractor = MFCCExtractor(sr=SR, n_mfcc=audio_engine.N_MFCC)
+    fb_err = np.abs(mel_filterbank(SR, 2048) - librosa.filters.mel(sr=SR, n_fft=2048)).max()
+    print(f"mel filterbank max |diff| = {fb_err:.2e}")
+
+    X = _signals(args.random)
+    reference = np.stack([_librosa_mfcc(y) for y in X])
+    native = extractor(X)
+    single = np.stack([extractor(y) for y in X[:8]])
+    print(f"{len(X)} signals: max |dMFCC| = {np.abs(native - reference).max():.2e}, "
+          f"batch vs single max |diff| = {np.abs(native[:8] - single).max():.2e}")
+    for key in audio_engine.AUDIO_MODELS:
+        ref_probs = audio_engine.predict_features(key, reference)
+        probs = audio_engine.predict_features(key, native)
+        agree = np.mean(ref_probs.argmax(axis=1) == probs.argmax(axis=1))
+        print(f"  [{key}] argmax agreement={agree:.4f} max |dp|={np.abs(ref_probs - probs).max():.2e}")
+        assert agree == 1.0, f"{key}: native MFCC changes predictions"
+
+    batch = X[: args.batch]
+    print(f"  librosa  1 window  {_ms(lambda: _librosa_mfcc(X[0]), args.calls):7.2f} ms")
+    print(f"  native   1 window  {_ms(lambda: extractor(X[0]), args.calls):7.2f} ms")
+    per_item = _ms(lambda: [_librosa_mfcc(y) for y in batch], max(1, args.calls // 10)) / len(batch)
+    print(f"  librosa  {len(batch)} windows {per_item:7.2f} ms/window")
+    per_item = _ms(lambda: extractor(batch), max(1, args.calls // 10)) / len(batch)
+    print(f"  native   {len(batch)} windows {per_item:7.2f} ms/window")
+    assert np.allclose(native, reference, atol=1e-2), "native MFCC drifted from librosa"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Throughput and latency of concurrent single-row requests with and without micro-batching.
+
+Usage: python -m benchmarks.micro_batching [--backend keras] [--clients 16] [--requests 50]
+
+Each client thread sends single ``(1, 40)`` rows back to back, as concurrent
+Streamlit sessions pressing "Analyze" do. The baseline calls the shared
+model directly; the batched runs go through a ``MicroBatcher`` for every
+combination of ``--batch-sizes`` and ``--waits``.
+"""
+import argparse
+import statistics
+import threading
+import time
+
+import numpy as np
+
+from caresphere import audio_engine
+from caresphere.batching import MicroBatcher
+
+
+def _run(predict, clients: int, requests: int, X: np.ndarray) -> dict:
+    latencies = []
+    lock = threading.Lock()
+
+    def client(offset):
+        local = []
+        for i in range(requests):
+            row = X[(offset + i) % len(X)][None]
+            start = time.perf_counter()
+            predict(row)
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(c * requests,)) for c in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", choices=sorted(audio_engine.AUDIO_MODELS), default="heartbeat")
+    parser.add_argument("--backend", choices=sorted(audio_engine.BACKENDS), default="keras")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=50, help="requests per client")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[8, 32])
+    parser.add_argument("--waits", type=float, nargs="+", default=[1.0, 2.0, 5.0], help="max wait in ms")
+    args = parser.parse_args()
+
+    model = audio_engine.get_model(args.model, args.backend)
+    X = np.random.default_rng(0).normal(0, 30, size=(256, audio_engine.N_MFCC)).astype(np.float32)
+    model.predict(X[:1])
+
+    print(f"{args.model}/{args.backend}: {args.clients} clients x {args.requests} single-row requests")
+    print(f"{'mode':<24}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'rows/batch':>12}")
+    base = _run(model.predict, args.clients, args.requests, X)
+    print(f"{'direct':<24}{base['throughput']:>10.0f}{base['p50_ms']:>10.2f}{base['p95_ms']:>10.2f}{1:>12.1f}")
+    for max_batch in args.batch_sizes:
+        for wait in args.waits:
+            batcher = MicroBatcher(model.predict, max_batch=max_batch, max_wait_ms=wait, name="bench")
+            result = _run(batcher.predict, args.clients, args.requests, X)
+            rows = batcher.stats()["mean_batch_rows"]
+            batcher.close()
+            label = f"batch<={max_batch} wait={wait:g}ms"
+            print(f"{label:<24}{result['throughput']:>10.0f}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}{rows:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
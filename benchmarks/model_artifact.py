@@ -0,0 +1,90 @@
+"""Time loading the tabular models from pickles and from model artifacts.
+
+Usage: python -m benchmarks.model_artifact [--loads 200] [--rows 20000]
+
+For every registered tabular model this converts the pickle to a model
+artifact in a temporary directory and asserts that its scorer matches the
+unpickled estimator. It checks that a corrupted payload and a mismatched
+feature list are both rejected. It then reports the mean time to open each
+format: ``pickle.load`` with scikit-learn already imported, and
+``model_artifact.load`` with and without checksum verification.
+"""
+import argparse
+import pickle
+import shutil
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.numpy_tabular import _records
+from caresphere import model_artifact, tabular_engine
+
+
+def _mean_us(fn, loads: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(loads):
+        fn()
+    return (time.perf_counter() - start) * 1e6 / loads
+
+
+def _unpickle(path: Path):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        with open(path, "rb") as fh:
+            return pickle.load(fh)
+
+
+def _check_rejected(directory: Path, tmp: Path, feature_names) -> None:
+    corrupt = tmp / "corrupt.artifact"
+    shutil.copytree(directory, corrupt)
+    payload = bytearray((corrupt / model_artifact.PAYLOAD).read_bytes())
+    payload[-1] ^= 0xFF
+    (corrupt / model_artifact.PAYLOAD).write_bytes(payload)
+    for path, names in ((corrupt, feature_names), (directory, feature_names[::-1])):
+        try:
+            model_artifact.load(path, names)
+        except model_artifact.ArtifactError as e:
+            print(f"  rejected: {e}")
+        else:
+            raise AssertionError(f"{path.name}: invalid artifact was accepted")
+    shutil.rmtree(corrupt)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--loads", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for key, spec in tabular_engine.TABULAR_MODELS.items():
+            estimator = _unpickle(spec.model_path)
+            directory = model_artifact.convert_pickle(spec.model_path, tmp / f"{key}.artifact", spec.feature_names)
+
+            X = _records(spec, args.rows, rng)
+            expected = tabular_engine.SklearnClassifier(estimator, spec).predict(X)
+            max_err = np.abs(model_artifact.load(directory, spec.feature_names).scorer().predict(X) - expected).max()
+            manifest = model_artifact.read_manifest(directory)
+            print(f"[{key}] {manifest['estimator']} trained with scikit-learn {manifest['sklearn_version']}, "
+                  f"payload={manifest['payload_bytes']} B, max |dp|={max_err:.1e}")
+            assert max_err < 1e-9, f"{key}: artifact scorer differs from the pickle"
+            _check_rejected(directory, tmp, spec.feature_names)
+
+            timings = {
+                "pickle.load": lambda: _unpickle(spec.model_path),
+                "artifact load": lambda: model_artifact.load(directory, spec.feature_names),
+                "artifact load (no checksum)": lambda: model_artifact.load(directory, spec.feature_names, False),
+                "artifact load + scorer": lambda: model_artifact.load(directory, spec.feature_names).scorer(),
+            }
+            for name, fn in timings.items():
+                print(f"  {name:<28} {_mean_us(fn, args.loads):9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Check the NumPy backend against Keras and compare per-call latency.
+
+Usage: python -m benchmarks.numpy_backend [--rows 1000] [--calls 200]
+
+For every registered audio model this feeds the bundled test recordings plus
+random MFCC-like rows through both backends, asserts identical argmax and
+probabilities within float tolerance, then times single-row predict calls and
+the cold load of each backend.
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from caresphere import audio_engine
+
+SAMPLE_DIR = Path(audio_engine.MODEL_DIR) / "Webapp Testing Data"
+
+
+def _sample_features(rows: int) -> np.ndarray:
+    recorded = [audio_engine.extract_features(str(p)) for p in sorted(SAMPLE_DIR.glob("*.wav"))]
+    rng = np.random.default_rng(0)
+    # Spread random rows around the scale of real MFCC means (c0 is large and negative)
+    scale = np.r_[150.0, np.full(audio_engine.N_MFCC - 1, 30.0)]
+    centre = np.r_[-450.0, np.zeros(audio_engine.N_MFCC - 1)]
+    synthetic = rng.normal(centre, scale, size=(rows, audio_engine.N_MFCC))
+    return np.vstack(recorded + [synthetic]).astype(np.float32)
+
+
+def _per_call_ms(model, row: np.ndarray, calls: int) -> float:
+    model.predict(row)
+    start = time.perf_counter()
+    for _ in range(calls):
+        model.predict(row)
+    return (time.perf_counter() - start) * 1000 / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    X = _sample_features(args.rows)
+    for key in audio_engine.AUDIO_MODELS:
+        load_ms = {}
+        for backend in ("numpy", "keras"):
+            start = time.perf_counter()
+            audio_engine.get_model(key, backend)
+            load_ms[backend] = (time.perf_counter() - start) * 1000
+
+        keras_probs = audio_engine.predict_features(key, X, "keras")
+        numpy_probs = audio_engine.predict_features(key, X, "numpy")
+        agree = np.mean(keras_probs.argmax(axis=1) == numpy_probs.argmax(axis=1))
+        max_err = np.abs(keras_probs - numpy_probs).max()
+
+        print(f"[{key}] rows={len(X)} argmax agreement={agree:.4f} max |dp|={max_err:.2e}")
+        for backend in ("numpy", "keras"):
+            per_call = _per_call_ms(audio_engine.get_model(key, backend), X[:1], args.calls)
+            print(f"  {backend:<6} load={load_ms[backend]:8.1f} ms  predict(1 row)={per_call:8.3f} ms")
+
+        assert agree == 1.0, f"{key}: NumPy and Keras argmax disagree"
+        assert np.allclose(keras_probs, numpy_probs, atol=1e-5), f"{key}: probabilities differ"
+
+
+if __name__ == "__main__":
+    main()
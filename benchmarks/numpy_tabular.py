@@ -0,0 +1,90 @@
+"""Check the NumPy tabular scorers against scikit-learn and compare latency.
+
+Usage: python -m benchmarks.numpy_tabular [--rows 20000] [--calls 2000]
+
+For every registered tabular model this scores random in-range records with
+both backends and asserts identical probabilities. The same check runs on a
+``LogisticRegression`` and a ``RandomForestClassifier`` fitted on those records,
+the other estimators the notebooks train. It then times the cold load,
+single-record calls and one batch call of each backend.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from caresphere import model_artifact, tabular_engine
+
+
+def _records(spec: tabular_engine.TabularModelSpec, rows: int, rng) -> np.ndarray:
+    columns = []
+    for feature in spec.features:
+        if feature.choices is not None:
+            columns.append(rng.choice(list(feature.choices.values()), size=rows).astype(np.float64))
+        else:
+            values = rng.uniform(feature.minimum, feature.maximum, size=rows)
+            columns.append(np.round(values) if feature.integer else np.round(values, 3))
+    return np.column_stack(columns)
+
+
+def _per_call_us(model, X: np.ndarray, calls: int) -> float:
+    model.predict(X)
+    start = time.perf_counter()
+    for _ in range(calls):
+        model.predict(X)
+    return (time.perf_counter() - start) * 1e6 / calls
+
+
+def _check_estimators(spec, X: np.ndarray, tmp: Path, rng) -> None:
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+
+    # A noisy synthetic target so the forest grows deep trees
+    y = (X[:, 1] > np.median(X[:, 1])).astype(int) ^ (rng.random(len(X)) < 0.1)
+    for estimator in (LogisticRegression(max_iter=5000), RandomForestClassifier(n_estimators=50, random_state=0)):
+        estimator.fit(X, y)
+        directory = model_artifact.convert_sklearn(estimator, tmp / "model.artifact", spec.feature_names)
+        scorer = model_artifact.load(directory, spec.feature_names).scorer()
+        max_err = np.abs(estimator.predict_proba(X) - scorer.predict(X)).max()
+        print(f"  {type(estimator).__name__:<24} max |dp|={max_err:.1e}")
+        assert max_err < 1e-9, f"{spec.key}: {type(estimator).__name__} export differs"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        for key, spec in tabular_engine.TABULAR_MODELS.items():
+            X = _records(spec, args.rows, rng)
+            load_ms = {}
+            for backend in ("numpy", "sklearn"):
+                start = time.perf_counter()
+                tabular_engine.get_model(key, backend)
+                load_ms[backend] = (time.perf_counter() - start) * 1000
+
+            numpy_probs = tabular_engine.predict_proba(key, X, "numpy")
+            sklearn_probs = tabular_engine.predict_proba(key, X, "sklearn")
+            agree = np.mean(numpy_probs.argmax(axis=1) == sklearn_probs.argmax(axis=1))
+            max_err = np.abs(numpy_probs - sklearn_probs).max()
+            print(f"[{key}] {type(tabular_engine.get_model(key, 'sklearn').model).__name__}, rows={len(X)} "
+                  f"argmax agreement={agree:.4f} max |dp|={max_err:.1e}")
+            for backend in ("numpy", "sklearn"):
+                model = tabular_engine.get_model(key, backend)
+                single = _per_call_us(model, X[:1], args.calls)
+                batch = _per_call_us(model, X, 5) / 1000
+                print(f"  {backend:<8} load={load_ms[backend]:8.1f} ms  predict(1 row)={single:7.1f} us  "
+                      f"predict({len(X)} rows)={batch:7.2f} ms")
+
+            assert agree == 1.0, f"{key}: NumPy and scikit-learn argmax disagree"
+            assert max_err < 1e-9, f"{key}: probabilities differ"
+            _check_estimators(spec, X, Path(tmp), rng)
+
+
+if __name__ == "__main__":
+    main()
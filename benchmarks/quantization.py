@@ -0,0 +1,104 @@
+"""Accuracy regression check and cost of the quantised NumPy backends.
+
+Usage: python -m benchmarks.quantization [--dataset DIR --model respiratory] [--max-drop 0.5]
+
+Without ``--dataset`` the float16 and int8 variants are compared to the
+float32 ``numpy`` backend on the bundled recordings plus synthetic MFCC rows
+(argmax agreement and max probability error). With ``--dataset`` pointing at
+a labelled recording folder laid out like the training notebooks' datasets
+(the label is the file name prefix before the first ``_``, e.g.
+``Asthma_RS_20 (1).wav``; classes are indexed alphabetically, as
+``LabelEncoder`` did), accuracy is measured for every variant and the run
+fails if a variant loses more than ``--max-drop`` percentage points.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from caresphere import audio_engine
+from caresphere.numpy_mlp import quantized_path
+
+# Backend -> quantisation mode of its artifact
+VARIANTS = {"numpy": None, "numpy-fp16": "float16", "numpy-int8": "int8"}
+SAMPLE_DIR = Path(audio_engine.MODEL_DIR) / "Webapp Testing Data"
+AUDIO_SUFFIXES = (".wav", ".mp3", ".m4a")
+
+
+def _per_call_ms(model, X: np.ndarray, calls: int) -> float:
+    model.predict(X)
+    start = time.perf_counter()
+    for _ in range(calls):
+        model.predict(X)
+    return (time.perf_counter() - start) * 1000 / calls
+
+
+def _labelled(dataset: Path, n_classes: int):
+    files = sorted(p for p in dataset.rglob("*") if p.suffix.lower() in AUDIO_SUFFIXES)
+    names = [p.name.split("_")[0].split(".")[0].lower() for p in files]
+    classes = sorted(set(names))
+    if len(classes) != n_classes:
+        raise SystemExit(f"Found {len(classes)} labels {classes}, the model has {n_classes} classes")
+    features, errors = audio_engine.extract_features_batch([str(p) for p in files])
+    keep = [i for i in range(len(files)) if i not in errors]
+    X = np.stack([features[i] for i in keep])
+    y = np.array([classes.index(names[i]) for i in keep])
+    return X, y, classes
+
+
+def _synthetic(rows: int) -> np.ndarray:
+    recorded = [audio_engine.extract_features(str(p)) for p in sorted(SAMPLE_DIR.glob("*.wav"))]
+    rng = np.random.default_rng(0)
+    scale = np.r_[150.0, np.full(audio_engine.N_MFCC - 1, 30.0)]
+    centre = np.r_[-450.0, np.zeros(audio_engine.N_MFCC - 1)]
+    return np.vstack(recorded + [rng.normal(centre, scale, size=(rows, audio_engine.N_MFCC))]).astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", type=Path, help="labelled recordings for the accuracy check")
+    parser.add_argument("--model", choices=sorted(audio_engine.AUDIO_MODELS), default="respiratory")
+    parser.add_argument("--rows", type=int, default=2000, help="synthetic rows when no dataset is given")
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--max-drop", type=float, default=0.5, help="allowed accuracy loss in percentage points")
+    args = parser.parse_args()
+
+    keys = [args.model] if args.dataset else list(audio_engine.AUDIO_MODELS)
+    failed = False
+    for key in keys:
+        spec = audio_engine.get_spec(key)
+        if args.dataset:
+            X, y, classes = _labelled(args.dataset, spec.n_classes)
+            print(f"[{key}] {len(X)} labelled recordings, classes {classes}")
+        else:
+            X, y = _synthetic(args.rows), None
+            print(f"[{key}] {len(X)} rows (bundled recordings + synthetic)")
+
+        reference = audio_engine.predict_features(key, X, "numpy")
+        baseline_acc = None
+        print(f"  {'variant':<12}{'weights KB':>11}{'file KB':>9}{'1 row ms':>10}{'agree':>8}{'max |dp|':>10}"
+              + ("  accuracy" if y is not None else ""))
+        for variant, mode in VARIANTS.items():
+            model = audio_engine.get_model(key, variant)
+            probs = model.predict(X)
+            agree = np.mean(probs.argmax(axis=1) == reference.argmax(axis=1))
+            path = quantized_path(spec.npz_path, mode) if mode else spec.npz_path
+            file_kb = f"{path.stat().st_size / 1024:.0f}" if path.exists() else "-"
+            line = (f"  {variant:<12}{model.nbytes / 1024:>11.0f}{file_kb:>9}"
+                    f"{_per_call_ms(model, X[:1], args.calls):>10.3f}{agree:>8.4f}{np.abs(probs - reference).max():>10.1e}")
+            if y is not None:
+                accuracy = np.mean(probs.argmax(axis=1) == y) * 100
+                baseline_acc = accuracy if baseline_acc is None else baseline_acc
+                line += f"  {accuracy:.2f}%"
+                if baseline_acc - accuracy > args.max_drop:
+                    line += "  REGRESSION"
+                    failed = True
+            print(line)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Cold-start cost of every CareSphere page.
+
+Usage: python -m benchmarks.startup [--repeat 3] [--json startup.json] [pages...]
+
+Each page is executed in a fresh interpreter (Streamlit "bare" mode, so widgets
+return their defaults and no button is pressed) which is what a new worker
+pays on first navigation. The report shows the framework import, the page's
+own execution time and which heavy libraries ended up imported; a heavy
+library showing up here means it is no longer deferred to analysis time.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ["tensorflow", "keras", "librosa", "torch", "easyocr", "cv2", "pytesseract", "sklearn"]
+
+_CHILD = """
+import json, logging, runpy, sys, time
+logging.disable(logging.WARNING)
+start = time.perf_counter()
+import streamlit
+framework_ms = (time.perf_counter() - start) * 1000
+error = None
+start = time.perf_counter()
+try:
+    runpy.run_path(sys.argv[1], run_name="__main__")
+except BaseException as e:
+    error = f"{type(e).__name__}: {e}"
+page_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({
+    "framework_ms": framework_ms,
+    "page_ms": page_ms,
+    "heavy": [m for m in sys.argv[2].split(",") if m in sys.modules],
+    "error": error,
+}))
+"""
+
+
+def measure(page: Path, timeout: float) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-c", _CHILD, str(page), ",".join(HEAVY_MODULES)],
+        cwd=ROOT, capture_output=True, text=True, timeout=timeout,
+    )
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        return {"framework_ms": 0.0, "page_ms": 0.0, "heavy": [], "error": proc.stderr.strip()[-200:]}
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pages", nargs="*", help="page names (default: Homepage and every page)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    pages = [ROOT / "Homepage.py"] + sorted((ROOT / "pages").glob("*.py"))
+    if args.pages:
+        pages = [p for p in pages if p.stem in args.pages]
+
+    results = {}
+    print(f"{'page':<14}{'framework ms':>14}{'page ms':>12}  heavy imports")
+    for page in pages:
+        runs = [measure(page, args.timeout) for _ in range(args.repeat)]
+        result = {
+            "framework_ms": statistics.median(r["framework_ms"] for r in runs),
+            "page_ms": statistics.median(r["page_ms"] for r in runs),
+            "heavy": runs[-1]["heavy"],
+            "error": runs[-1]["error"],
+        }
+        results[page.stem] = result
+        note = ", ".join(result["heavy"]) or "-"
+        if result["error"]:
+            note += f"  [error: {result['error'][:60]}]"
+        print(f"{page.stem:<14}{result['framework_ms']:>14.0f}{result['page_ms']:>12.0f}  {note}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
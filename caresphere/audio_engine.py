@@ -0,0 +1,731 @@
+"""Shared audio inference engine for the heartbeat and respiratory classifiers.
+
+Both models consume the same features: the time-mean of 40 MFCCs computed over
+3 seconds of audio starting 0.5 s into the recording, resampled to 22.05 kHz.
+This module owns that decode/feature path, a process-wide warm model cache and
+the result schema, so the Streamlit pages, batch jobs and benchmarks all run
+exactly the same code.
+"""
+import hashlib
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from caresphere.batching import BatcherClosed, MicroBatcher
+from caresphere.feature_cache import AudioCache
+from caresphere.lazy import lazy_import
+from caresphere.metrics import StageTimer
+from caresphere.model_pool import POOL
+from caresphere.mfcc import get_extractor
+from caresphere.numpy_mlp import NumpyMLP, quantize, quantized_path
+
+# librosa pulls in numba/scipy; only import it once a recording is actually decoded
+librosa = lazy_import("librosa")
+soundfile = lazy_import("soundfile")
+
+# ----------------------------
+# Feature Parameters
+# ----------------------------
+SAMPLE_RATE = 22050
+OFFSET = 0.5
+DURATION = 3.0
+N_MFCC = 40
+# Resampler used to reach SAMPLE_RATE. "soxr_hq" is librosa's default and what the
+# models were trained with; cheaper ones ("soxr_mq", "soxr_lq", "polyphase") can be
+# selected after checking prediction agreement with benchmarks/decode.py.
+RES_TYPE = os.getenv("CARESPHERE_RES_TYPE", "soxr_hq")
+# "native" uses caresphere.mfcc (precomputed bases, batch axis); "librosa" calls
+# librosa.feature.mfcc. They agree to ~1e-3 on the mean MFCC vector.
+MFCC_IMPL = os.getenv("CARESPHERE_MFCC", "native")
+# Bump whenever the decode/feature path changes numerically; it is part of every cache key
+FEATURE_VERSION = "native-mfcc-1"
+
+MODEL_DIR = Path(__file__).resolve().parent.parent
+
+AudioSource = Union[str, Path, bytes, io.IOBase]
+
+
+# ----------------------------
+# Model Registry
+# ----------------------------
+@dataclass
+class AudioModelSpec:
+    """Everything needed to load and interpret one audio classifier"""
+    key: str
+    model_file: str
+    conditions: Dict[int, Dict[str, str]]
+    normal_label: int
+
+    @property
+    def model_path(self) -> Path:
+        return MODEL_DIR / self.model_file
+
+    @property
+    def npz_path(self) -> Path:
+        return self.model_path.with_suffix(".npz")
+
+    @cached_property
+    def version(self) -> str:
+        """Short digest of the trained weights, used to invalidate cached predictions"""
+        return hashlib.blake2b(self.model_path.read_bytes(), digest_size=6).hexdigest()
+
+    @property
+    def n_classes(self) -> int:
+        return len(self.conditions)
+
+
+HEARTBEAT_CONDITIONS = {
+    0: {
+        'name': 'Artifact',
+        'class': 'result-artifact',
+        'emoji': '⚡',
+        'description': 'Audio artifacts detected - this may be due to noise, poor recording quality, or technical interference in the heartbeat recording.',
+        'recommendation': 'Please try recording again in a quieter environment with better audio quality. Ensure proper placement of recording device.',
+        'confidence_class': 'conf-artifact'
+    },
+    1: {
+        'name': 'A-Unlabelled Test',
+        'class': 'result-aunlabelledtest',
+        'emoji': '🔍',
+        'description': 'An unlabelled cardiac pattern (Type A) has been detected. This requires further medical evaluation for proper classification.',
+        'recommendation': 'Consult with a cardiologist for comprehensive cardiac evaluation and proper diagnosis of this heart pattern.',
+        'confidence_class': 'conf-aunlabelledtest'
+    },
+    2: {
+        'name': 'B-Unlabelled Test',
+        'class': 'result-bunlabelledtest',
+        'emoji': '🔬',
+        'description': 'An unlabelled cardiac pattern (Type B) has been identified. Professional medical assessment is needed for accurate classification.',
+        'recommendation': 'Schedule an appointment with a cardiac specialist for detailed heart examination and proper diagnosis.',
+        'confidence_class': 'conf-bunlabelledtest'
+    },
+    3: {
+        'name': 'Extrahls',
+        'class': 'result-extrahls',
+        'emoji': '🎵',
+        'description': 'Extra heart sounds (gallops) detected - these are additional sounds that may indicate cardiac conditions like heart failure or ventricular dysfunction.',
+        'recommendation': 'Medical evaluation recommended. Extra heart sounds can be significant and may require cardiac assessment and treatment.',
+        'confidence_class': 'conf-extrahls'
+    },
+    4: {
+        'name': 'Extrasystole',
+        'class': 'result-extrastole',
+        'emoji': '💓',
+        'description': 'Extrasystoles (premature heartbeats) detected. These are early heartbeats that can be benign or indicate underlying cardiac issues.',
+        'recommendation': 'Consult with a cardiologist to determine if these irregular beats require treatment or monitoring.',
+        'confidence_class': 'conf-extrastole'
+    },
+    5: {
+        'name': 'Murmur',
+        'class': 'result-murmur',
+        'emoji': '🌊',
+        'description': 'A heart murmur has been detected. This is an extra sound during heartbeat cycle, which can be innocent or indicate heart valve problems.',
+        'recommendation': 'Cardiac evaluation recommended to determine if the murmur is benign or requires treatment. Further tests like echocardiogram may be needed.',
+        'confidence_class': 'conf-murmur'
+    },
+    6: {
+        'name': 'Normal',
+        'class': 'result-normal',
+        'emoji': '✅',
+        'description': 'Excellent news! Normal heart sounds detected. Your cardiac rhythm appears healthy with regular heart beats and normal sound patterns.',
+        'recommendation': 'Continue maintaining good cardiovascular health with regular exercise, healthy diet, and routine check-ups.',
+        'confidence_class': 'conf-normal'
+    },
+    7: {
+        'name': 'Unlabelled Test',
+        'class': 'result-unlabelledtest',
+        'emoji': '❓',
+        'description': 'An unclassified cardiac pattern has been detected. This pattern doesn\'t match standard categories and needs professional evaluation.',
+        'recommendation': 'Medical consultation strongly recommended for proper cardiac assessment and diagnosis of this unusual heart pattern.',
+        'confidence_class': 'conf-unlabelledtest'
+    }
+}
+
+RESPIRATORY_CONDITIONS = {
+    0: {
+        'name': 'Asthma',
+        'class': 'result-asthma',
+        'emoji': '🫁',
+        'description': 'The AI has detected respiratory patterns consistent with asthma. This includes characteristic wheeze patterns and airway obstruction indicators in the audio analysis.',
+        'recommendation': 'Please consult with a pulmonologist or your primary care physician for proper diagnosis and treatment planning. Early intervention can significantly improve quality of life.',
+        'confidence_class': 'conf-asthma'
+    },
+    1: {
+        'name': 'Bronchial',
+        'class': 'result-bronchial',
+        'emoji': '🌬️',
+        'description': 'Bronchial has been detected in the breath patterns. The audio shows signs of bronchial tube irritation and inflammation.',
+        'recommendation': 'Seek medical advice for appropriate bronchial treatment and management. Your doctor may recommend anti-inflammatory treatments or further testing.',
+        'confidence_class': 'conf-bronchial'
+    },
+    2: {
+        'name': 'Chronic Obstructive Pulmonary Disease',
+        'class': 'result-copd',
+        'emoji': '⚠️',
+        'description': 'The analysis suggests possible Chronic Obstructive Pulmonary Disease. Audio indicates airflow limitation and breathing difficulties.',
+        'recommendation': 'Medical evaluation is strongly recommended for COPD assessment and management. Early diagnosis and treatment can help slow disease progression.',
+        'confidence_class': 'conf-copd'
+    },
+    3: {
+        'name': 'Healthy',
+        'class': 'result-healthy',
+        'emoji': '✅',
+        'description': 'Excellent news! Normal breathing patterns have been detected. Your respiratory health appears to be in good condition based on the audio analysis.',
+        'recommendation': 'Continue maintaining good respiratory health with regular exercise, clean air exposure, and avoiding smoking. Keep up the good work!',
+        'confidence_class': 'conf-healthy'
+    },
+    4: {
+        'name': 'Pneumonia',
+        'class': 'result-pneumonia',
+        'emoji': '🚨',
+        'description': 'The respiratory patterns may indicate pneumonia. The audio analysis shows signs consistent with lung infection and possible fluid accumulation.',
+        'recommendation': 'Immediate medical consultation is strongly recommended for proper diagnosis and treatment. Pneumonia requires prompt medical attention.',
+        'confidence_class': 'conf-pneumonia'
+    }
+}
+
+AUDIO_MODELS: Dict[str, AudioModelSpec] = {}
+
+
+def register_model(spec: AudioModelSpec) -> None:
+    AUDIO_MODELS[spec.key] = spec
+
+
+def get_spec(key: str) -> AudioModelSpec:
+    try:
+        return AUDIO_MODELS[key]
+    except KeyError:
+        raise KeyError(f"Unknown audio model '{key}'. Available: {sorted(AUDIO_MODELS)}") from None
+
+
+register_model(AudioModelSpec("heartbeat", "Heartbeat_audioclassification.keras", HEARTBEAT_CONDITIONS, normal_label=6))
+register_model(AudioModelSpec("respiratory", "Asthma_audioclassification.keras", RESPIRATORY_CONDITIONS, normal_label=3))
+
+
+# ----------------------------
+# Inference Backends
+# ----------------------------
+class KerasClassifier:
+    """Adapter giving a Keras model the same ``predict(X) -> probabilities`` call as the other backends"""
+
+    def __init__(self, model):
+        self.model = model
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return np.asarray(self.model.predict(X, verbose=0))
+
+
+def _load_keras(spec: AudioModelSpec):
+    import tensorflow as tf
+
+    return KerasClassifier(tf.keras.models.load_model(spec.model_path))
+
+
+class CompiledKerasClassifier:
+    """Keras model traced once into a ``tf.function`` with a fixed ``(None, N_MFCC)`` signature.
+
+    Calling the concrete function skips ``model.predict``'s data-adapter and
+    callback machinery. With ``jit_compile`` the graph is also compiled by XLA;
+    XLA specialises on the batch size, so the common single-row shape is
+    compiled at load time and other sizes compile on first use.
+    """
+
+    def __init__(self, model, jit_compile: bool = False):
+        import tensorflow as tf
+
+        self.jit_compile = jit_compile
+        self._fn = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec(shape=(None, N_MFCC), dtype=tf.float32)],
+            jit_compile=jit_compile,
+        )
+        self.predict(np.zeros((1, N_MFCC), dtype=np.float32))
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self._fn(np.asarray(X, dtype=np.float32)).numpy()
+
+
+def _load_tf_function(spec: AudioModelSpec):
+    return CompiledKerasClassifier(_load_keras(spec).model)
+
+
+def _load_tf_xla(spec: AudioModelSpec):
+    return CompiledKerasClassifier(_load_keras(spec).model, jit_compile=True)
+
+
+def _load_numpy(spec: AudioModelSpec):
+    if not spec.npz_path.exists():
+        # Serving never reads the Keras archive; the export is an explicit build step
+        raise FileNotFoundError(f"{spec.npz_path.name} is missing; export it with "
+                                f"`python -m caresphere.numpy_mlp {spec.model_path.name}`")
+    return NumpyMLP.load(spec.npz_path)
+
+
+def _load_quantized(mode: str):
+    def load(spec: AudioModelSpec):
+        # Use a converted artifact when one was written, otherwise quantise in memory (microseconds)
+        path = quantized_path(spec.npz_path, mode)
+        if path.exists():
+            return NumpyMLP.load(path)
+        return quantize(_load_numpy(spec), mode)
+    return load
+
+
+# Backend name -> loader returning an object with ``predict(X) -> (N, n_classes)``
+BACKENDS = {
+    "numpy": _load_numpy,
+    "numpy-fp16": _load_quantized("float16"),
+    "numpy-int8": _load_quantized("int8"),
+    "keras": _load_keras,
+    "tf-function": _load_tf_function,
+    "tf-xla": _load_tf_xla,
+}
+BACKEND_LABELS = {
+    "numpy": "NumPy (fast, no TensorFlow)",
+    "numpy-fp16": "NumPy float16 weights (half size)",
+    "numpy-int8": "NumPy int8 weights (quarter size)",
+    "keras": "Keras / TensorFlow",
+    "tf-function": "TensorFlow (compiled graph)",
+    "tf-xla": "TensorFlow (XLA compiled)",
+}
+DEFAULT_BACKEND = "numpy"
+
+
+# ----------------------------
+# Warm Model Cache
+# ----------------------------
+def _pool_name(key: str, backend: str) -> str:
+    return f"audio/{key}/{backend}"
+
+
+def _register_in_pool(key: str, backend: str) -> str:
+    if backend not in BACKENDS:
+        raise KeyError(f"Unknown inference backend '{backend}'. Available: {sorted(BACKENDS)}")
+    spec = get_spec(key)
+    name = _pool_name(key, backend)
+    POOL.register(
+        name,
+        lambda: BACKENDS[backend](spec),
+        # The NumPy variants are a few hundred KB; only TensorFlow-backed models are worth evicting
+        heavy=not backend.startswith("numpy"),
+        size_hint=lambda model: getattr(model, "nbytes", 0),
+        on_evict=lambda model: _drop_batcher(key, backend),
+    )
+    return name
+
+
+def get_model(key: str, backend: str = DEFAULT_BACKEND):
+    """Return the loaded classifier for ``key`` on ``backend`` from the process-wide model pool"""
+    return POOL.get(_register_in_pool(key, backend))
+
+
+# ----------------------------
+# Micro-batching
+# ----------------------------
+# Backends whose single-row calls are coalesced across sessions. Keras pays a
+# large fixed cost per predict call, so batching concurrent requests pays off;
+# the NumPy forward pass (~30 us) is cheaper than the hand-off to the worker.
+MICROBATCH_BACKENDS = {b for b in os.getenv("CARESPHERE_MICROBATCH", "keras").split(",") if b}
+BATCH_MAX_ROWS = int(os.getenv("CARESPHERE_BATCH_MAX_ROWS", "32"))
+BATCH_WAIT_MS = float(os.getenv("CARESPHERE_BATCH_WAIT_MS", "2.0"))
+
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(key: str, backend: str = DEFAULT_BACKEND) -> MicroBatcher:
+    """The process-wide request coalescer in front of ``get_model(key, backend)``"""
+    batcher = _batchers.get((key, backend))
+    if batcher is None:
+        model = get_model(key, backend)
+        with _batchers_lock:
+            batcher = _batchers.get((key, backend))
+            if batcher is None:
+                batcher = MicroBatcher(model.predict, BATCH_MAX_ROWS, BATCH_WAIT_MS, name=f"{key}.{backend}")
+                _batchers[(key, backend)] = batcher
+    return batcher
+
+
+def _drop_batcher(key: str, backend: str) -> None:
+    # The batcher holds the model's predict; drop it so an evicted model can be freed
+    with _batchers_lock:
+        batcher = _batchers.pop((key, backend), None)
+    if batcher is not None:
+        batcher.close()
+
+
+for _key in AUDIO_MODELS:
+    for _backend in BACKENDS:
+        _register_in_pool(_key, _backend)
+
+
+# ----------------------------
+# Feature / Prediction Cache
+# ----------------------------
+CACHE = AudioCache(
+    max_entries=int(os.getenv("CARESPHERE_AUDIO_CACHE_SIZE", "2048")),
+    disk_dir=os.getenv("CARESPHERE_AUDIO_CACHE_DIR"),
+)
+
+
+def feature_params() -> tuple:
+    return (FEATURE_VERSION, RES_TYPE, MFCC_IMPL, SAMPLE_RATE, OFFSET, DURATION, N_MFCC)
+
+
+def model_tag(key: str, backend: str) -> str:
+    return f"{key}-{get_spec(key).version}-{backend}"
+
+
+def read_bytes(source: AudioSource) -> bytes:
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, Path)):
+        return Path(source).read_bytes()
+    source.seek(0)
+    return source.read()
+
+
+def _stages(timer: Optional[StageTimer]):
+    return timer.stage if timer is not None else (lambda name: nullcontext())
+
+
+# ----------------------------
+# Decode / Feature Path
+# ----------------------------
+def _as_source(source: AudioSource):
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
+def _decode_soundfile(source: AudioSource, offset: float, duration: float):
+    # Same frame arithmetic and channel averaging as librosa.load, so results are identical
+    with soundfile.SoundFile(_as_source(source)) as f:
+        sr = f.samplerate
+        f.seek(int(offset * sr))
+        y = f.read(frames=int(duration * sr), dtype="float32", always_2d=True)
+    return (y[:, 0] if y.shape[1] == 1 else y.mean(axis=1)), sr
+
+
+def _run_ffmpeg(path: str, offset: float, duration: float):
+    # Input-side -ss seeks in the container instead of decoding from the start, and
+    # ffmpeg resamples straight to SAMPLE_RATE while it is at it
+    proc = subprocess.run(
+        ["ffmpeg", "-nostdin", "-v", "error", "-ss", str(offset), "-t", str(duration),
+         "-i", path, "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "f32le", "-"],
+        capture_output=True, check=True,
+    )
+    return np.frombuffer(proc.stdout, dtype=np.float32).copy(), SAMPLE_RATE
+
+
+def _decode_ffmpeg(source: AudioSource, offset: float, duration: float):
+    if isinstance(source, (str, Path)):
+        return _run_ffmpeg(str(source), offset, duration)
+    # Containers such as M4A keep their index at the end and need a seekable input
+    with tempfile.NamedTemporaryFile() as tmp:
+        tmp.write(read_bytes(source))
+        tmp.flush()
+        return _run_ffmpeg(tmp.name, offset, duration)
+
+
+class AudioDecodeError(ValueError):
+    """A recording that no available decoder can read"""
+
+
+def decode(source: AudioSource, offset: float = OFFSET, duration: float = DURATION):
+    """Decode only the analysis window, at the file's native sample rate where possible.
+
+    libsndfile (WAV, FLAC, OGG, MP3) seeks straight to ``offset`` and reads just
+    ``duration`` seconds. Anything it cannot open goes to ffmpeg with an
+    input-side seek when ffmpeg is installed, and to ``librosa.load`` otherwise.
+    Raises ``AudioDecodeError`` when every decoder fails.
+    """
+    try:
+        return _decode_soundfile(source, offset, duration)
+    except soundfile.SoundFileRuntimeError:
+        pass
+    if shutil.which("ffmpeg"):
+        try:
+            return _decode_ffmpeg(source, offset, duration)
+        except subprocess.CalledProcessError:
+            pass
+    try:
+        return librosa.load(_as_source(source), sr=None, offset=offset, duration=duration)
+    except Exception as e:
+        raise AudioDecodeError(f"Could not decode audio: {str(e) or type(e).__name__}") from e
+
+
+def resample(y: np.ndarray, native_sr: int, sr: int = SAMPLE_RATE, res_type: Optional[str] = None) -> np.ndarray:
+    if native_sr == sr:
+        return y
+    return librosa.resample(y, orig_sr=native_sr, target_sr=sr, res_type=res_type or RES_TYPE)
+
+
+def extract_mfcc(y: np.ndarray, sr: int = SAMPLE_RATE, n_mfcc: int = N_MFCC) -> np.ndarray:
+    """Time-averaged MFCC vector, the only feature the classifiers consume.
+
+    ``y`` may also be a ``(batch, samples)`` array of equal-length signals, giving
+    ``(batch, n_mfcc)``.
+    """
+    if MFCC_IMPL == "native":
+        return get_extractor(sr, n_mfcc)(y)
+    if np.ndim(y) == 2:
+        return np.stack([extract_mfcc(row, sr, n_mfcc) for row in y])
+    return np.mean(librosa.feature.mfcc(y=y, sr=sr, n_mfcc=n_mfcc).T, axis=0)
+
+
+def extract_mfcc_batch(signals: Sequence[np.ndarray], sr: int = SAMPLE_RATE) -> List[np.ndarray]:
+    """MFCC vectors for signals of any lengths; equal-length ones share one batched call"""
+    by_length: Dict[int, List[int]] = {}
+    for i, y in enumerate(signals):
+        by_length.setdefault(len(y), []).append(i)
+    features: List[Optional[np.ndarray]] = [None] * len(signals)
+    for indices in by_length.values():
+        batch = extract_mfcc(np.stack([signals[i] for i in indices]), sr)
+        for row, i in enumerate(indices):
+            features[i] = batch[row]
+    return features
+
+
+def load_window(source: AudioSource, timer: Optional[StageTimer] = None) -> np.ndarray:
+    """The analysis window of one recording, mono at SAMPLE_RATE"""
+    stage = _stages(timer)
+    with stage("decode"):
+        y, native_sr = decode(source)
+    with stage("resample"):
+        return resample(y, native_sr)
+
+
+def extract_features(source: AudioSource, timer: Optional[StageTimer] = None) -> np.ndarray:
+    """Decode, resample and summarise one recording into a ``(N_MFCC,)`` vector"""
+    y = load_window(source, timer)
+    with _stages(timer)("mfcc"):
+        return extract_mfcc(y)
+
+
+def predict_features(key: str, features: np.ndarray, backend: str = DEFAULT_BACKEND) -> np.ndarray:
+    """Class probabilities for a ``(N_MFCC,)`` vector or an ``(N, N_MFCC)`` matrix"""
+    features = np.atleast_2d(np.asarray(features, dtype=np.float32))
+    return get_model(key, backend).predict(features)
+
+
+def predict_shared(key: str, features: np.ndarray, backend: str = DEFAULT_BACKEND) -> np.ndarray:
+    """``predict_features`` for per-request callers, coalesced with concurrent ones where enabled"""
+    if backend in MICROBATCH_BACKENDS:
+        try:
+            return get_batcher(key, backend).predict(features)
+        except BatcherClosed:
+            # The model was evicted between fetching the batcher and queueing; run this request directly
+            pass
+    return predict_features(key, features, backend)
+
+
+# ----------------------------
+# Result Schema
+# ----------------------------
+@dataclass
+class AudioPrediction:
+    model: str
+    label: int
+    name: str
+    confidence: float
+    probabilities: np.ndarray
+    features: np.ndarray = field(repr=False)
+
+    @property
+    def condition(self) -> Dict[str, str]:
+        return get_spec(self.model).conditions[self.label]
+
+    @property
+    def is_normal(self) -> bool:
+        return self.label == get_spec(self.model).normal_label
+
+    def to_dict(self) -> Dict:
+        conditions = get_spec(self.model).conditions
+        return {
+            "model": self.model,
+            "label": self.label,
+            "name": self.name,
+            "confidence": self.confidence,
+            "probabilities": {conditions[i]['name']: float(p) for i, p in enumerate(self.probabilities)},
+        }
+
+    def to_row(self) -> Dict:
+        """Flat, percentage-scaled view used for result tables and CSV export"""
+        conditions = get_spec(self.model).conditions
+        row = {"Condition": self.name, "Confidence (%)": round(self.confidence * 100, 2)}
+        for i, p in enumerate(self.probabilities):
+            row[f"{conditions[i]['name']} (%)"] = round(float(p) * 100, 2)
+        return row
+
+
+def build_prediction(key: str, probabilities: np.ndarray, features: np.ndarray) -> AudioPrediction:
+    label = int(np.argmax(probabilities))
+    return AudioPrediction(
+        model=key,
+        label=label,
+        name=get_spec(key).conditions[label]['name'],
+        confidence=float(probabilities[label]),
+        probabilities=probabilities,
+        features=features,
+    )
+
+
+def analyze(key: str, source: AudioSource, timer: Optional[StageTimer] = None,
+            backend: str = DEFAULT_BACKEND, use_cache: bool = True) -> AudioPrediction:
+    """Run the full decode -> MFCC -> predict pipeline for one recording.
+
+    With ``use_cache`` the audio bytes are hashed first; a previously seen
+    recording skips decoding (and prediction, for the same model and backend).
+    """
+    stage = _stages(timer)
+    content = features = probabilities = None
+    if use_cache:
+        with stage("cache"):
+            source = read_bytes(source)
+            content = CACHE.content_key(source, feature_params())
+            features = CACHE.get_features(content)
+            if features is not None:
+                probabilities = CACHE.get_prediction(content, model_tag(key, backend))
+    if features is None:
+        features = extract_features(source, timer)
+        if content is not None:
+            CACHE.put_features(content, features)
+    if probabilities is None:
+        with stage("predict"):
+            probabilities = predict_shared(key, features, backend)[0]
+        if content is not None:
+            CACHE.put_prediction(content, model_tag(key, backend), probabilities)
+    return build_prediction(key, probabilities, features)
+
+
+# ----------------------------
+# Batch Analysis
+# ----------------------------
+@dataclass
+class BatchAnalysis:
+    """Per-source results aligned with the input order; failed sources are ``None``"""
+    predictions: List[Optional[AudioPrediction]]
+    errors: Dict[int, str]
+
+
+def _default_workers() -> int:
+    return min(8, os.cpu_count() or 1)
+
+
+def extract_features_batch(sources: Sequence[AudioSource], max_workers: Optional[int] = None):
+    """Decode and featurise many recordings concurrently, preserving input order.
+
+    Decoding runs on a thread pool; the decoded windows then go through the
+    MFCC extractor together, batched by length. Returns ``(features, errors)``
+    where ``features`` holds a vector or ``None`` per source and ``errors`` maps
+    the index of each failed source to its message.
+    """
+    def _safe_load(source):
+        try:
+            return load_window(source), None
+        except Exception as e:
+            return None, str(e) or type(e).__name__
+
+    with ThreadPoolExecutor(max_workers=max_workers or _default_workers()) as pool:
+        outcomes = list(pool.map(_safe_load, sources))
+    errors = {i: error for i, (_, error) in enumerate(outcomes) if error is not None}
+    loaded = [i for i, (y, _) in enumerate(outcomes) if y is not None]
+    features: List[Optional[np.ndarray]] = [None] * len(outcomes)
+    for i, vector in zip(loaded, extract_mfcc_batch([outcomes[i][0] for i in loaded])):
+        features[i] = vector
+    return features, errors
+
+
+def analyze_batch(key: str, sources: Sequence[AudioSource], backend: str = DEFAULT_BACKEND,
+                  timer: Optional[StageTimer] = None, max_workers: Optional[int] = None,
+                  pool=None, use_cache: bool = True) -> BatchAnalysis:
+    """Featurise every source in parallel, then classify them all in one ``(N, N_MFCC)`` predict call.
+
+    Features are extracted on a thread pool unless ``pool`` (e.g. a
+    ``feature_pool.FeaturePool``) is given, in which case its ``extract`` is used.
+    Cached recordings are served from ``CACHE`` and only the misses are decoded
+    and predicted.
+    """
+    stage = _stages(timer)
+    sources = list(sources)
+    n = len(sources)
+    contents: List[Optional[str]] = [None] * n
+    features: List[Optional[np.ndarray]] = [None] * n
+    probabilities: List[Optional[np.ndarray]] = [None] * n
+    tag = model_tag(key, backend)
+    errors: Dict[int, str] = {}
+
+    if use_cache:
+        with stage("cache"):
+            for i, source in enumerate(sources):
+                try:
+                    data = read_bytes(source)
+                    contents[i] = CACHE.content_key(data, feature_params())
+                except Exception as e:
+                    # One unreadable source fails on its own, as it would without the cache
+                    errors[i] = str(e) or type(e).__name__
+                    continue
+                # Paths stay paths so bulk runs do not hold every file in memory
+                if not isinstance(source, (str, Path)):
+                    sources[i] = data
+                features[i] = CACHE.get_features(contents[i])
+                if features[i] is not None:
+                    probabilities[i] = CACHE.get_prediction(contents[i], tag)
+
+    missing = [i for i in range(n) if features[i] is None and i not in errors]
+    with stage("features"):
+        if missing:
+            todo = [sources[i] for i in missing]
+            extracted, failed = pool.extract(todo) if pool is not None else extract_features_batch(todo, max_workers)
+            for j, i in enumerate(missing):
+                features[i] = extracted[j]
+                if j in failed:
+                    errors[i] = failed[j]
+                elif contents[i] is not None:
+                    CACHE.put_features(contents[i], features[i])
+
+    pending = [i for i in range(n) if features[i] is not None and probabilities[i] is None]
+    with stage("predict"):
+        if pending:
+            batch_probabilities = predict_features(key, np.stack([features[i] for i in pending]), backend)
+            for row, i in enumerate(pending):
+                probabilities[i] = batch_probabilities[row]
+                if contents[i] is not None:
+                    CACHE.put_prediction(contents[i], tag, probabilities[i])
+
+    predictions: List[Optional[AudioPrediction]] = [
+        build_prediction(key, probabilities[i], features[i]) if probabilities[i] is not None else None
+        for i in range(n)
+    ]
+    return BatchAnalysis(predictions, errors)
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Classify audio recordings outside Streamlit")
+    parser.add_argument("model", choices=sorted(AUDIO_MODELS))
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND)
+    args = parser.parse_args()
+
+    batch = analyze_batch(args.model, args.files, backend=args.backend)
+    for i, (path, prediction) in enumerate(zip(args.files, batch.predictions)):
+        if prediction is None:
+            print(json.dumps({"file": path, "error": batch.errors[i]}))
+        else:
+            print(json.dumps({"file": path, **prediction.to_dict()}))
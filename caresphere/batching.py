@@ -0,0 +1,142 @@
+"""Dynamic micro-batching in front of a shared classifier.
+
+Concurrent Streamlit sessions (and server requests) each want a forward pass
+on a single ``(1, 40)`` row. ``MicroBatcher`` queues those requests and a
+single worker thread coalesces them: once the first request arrives it waits
+at most ``max_wait_ms`` for company or until ``max_batch`` rows are queued,
+runs one batched ``predict_fn`` call and hands each caller its own rows back.
+Requests that already waited while the worker was busy are flushed without
+further delay, so the added latency is bounded by ``max_wait_ms``.
+
+Every batch is reported through ``caresphere.metrics.emit`` as
+``<name>.batch`` with its size, queue wait and predict time.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, List
+
+import numpy as np
+
+from caresphere.metrics import emit
+
+
+class BatcherClosed(RuntimeError):
+    """The batcher was closed (e.g. its model was evicted) before the request could run"""
+
+
+@dataclass
+class _Request:
+    rows: np.ndarray
+    future: Future = field(default_factory=Future)
+    enqueued: float = field(default_factory=time.perf_counter)
+
+
+class MicroBatcher:
+    """Coalesce concurrent ``predict`` calls into batched ``predict_fn`` calls"""
+
+    def __init__(self, predict_fn: Callable[[np.ndarray], np.ndarray], max_batch: int = 32,
+                 max_wait_ms: float = 2.0, name: str = "microbatch"):
+        self.predict_fn = predict_fn
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.name = name
+        self.batches = 0
+        self.rows = 0
+        self.requests = 0
+        self._queue = queue.Queue()
+        self._closed = False
+        # Serialises submit against close so no request is queued behind the stop sentinel
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name=f"{name}-worker", daemon=True)
+        self._worker.start()
+
+    def submit(self, rows: np.ndarray) -> Future:
+        """Queue one ``(N_MFCC,)`` vector or ``(n, N_MFCC)`` block; the future resolves to its probabilities"""
+        request = _Request(np.atleast_2d(np.asarray(rows, dtype=np.float32)))
+        with self._lock:
+            if self._closed:
+                raise BatcherClosed(f"{self.name} is closed")
+            self._queue.put(request)
+        return request.future
+
+    def predict(self, rows: np.ndarray) -> np.ndarray:
+        """Blocking form of ``submit``, a drop-in for ``model.predict``"""
+        return self.submit(rows).result()
+
+    def _collect(self, first: _Request) -> List[_Request]:
+        batch = [first]
+        n_rows = len(first.rows)
+        deadline = first.enqueued + self.max_wait_ms / 1000
+        while n_rows < self.max_batch:
+            try:
+                # Drain whatever is already queued, then wait out the remainder of the window
+                request = self._queue.get(timeout=max(0.0, deadline - time.perf_counter()))
+            except queue.Empty:
+                break
+            if request is None:
+                self._queue.put(None)
+                break
+            batch.append(request)
+            n_rows += len(request.rows)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                self._fail_pending()
+                return
+            batch = self._collect(first)
+            started = time.perf_counter()
+            try:
+                probabilities = self.predict_fn(np.concatenate([r.rows for r in batch]))
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            predict_ms = (time.perf_counter() - started) * 1000
+
+            offset = 0
+            for request in batch:
+                request.future.set_result(probabilities[offset:offset + len(request.rows)])
+                offset += len(request.rows)
+
+            self.batches += 1
+            self.rows += offset
+            self.requests += len(batch)
+            emit(f"{self.name}.batch", {
+                "rows": offset,
+                "requests": len(batch),
+                "queue_wait_ms": (started - batch[0].enqueued) * 1000,
+                "predict_ms": predict_ms,
+            })
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "rows": self.rows,
+            "mean_batch_rows": self.rows / self.batches if self.batches else 0.0,
+        }
+
+    def _fail_pending(self) -> None:
+        # Anything still queued after the sentinel would otherwise wait on its future forever
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if request is not None:
+                request.future.set_exception(BatcherClosed(f"{self.name} is closed"))
+
+    def close(self) -> None:
+        """Finish queued requests and stop the worker"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join()
@@ -0,0 +1,212 @@
+"""Chunked CSV scoring of whole patient registries with the tabular disease models.
+
+Usage: python -m caresphere.bulk_scoring diabetes patients.csv scores.csv [--chunk-size 50000] [--keep Id]
+
+The input is read ``chunk_size`` rows at a time (only the model's columns and
+any ``--keep`` columns are parsed). Each chunk is validated and encoded
+column-wise, with the same names, ranges and encodings as
+``tabular_engine.feature_matrix`` (e.g. ``GENDER`` M/F -> 1/0). The valid
+rows are scored with one ``predict`` call, and the results are appended to
+the output before the next chunk is read. Memory is therefore bounded by
+the chunk size, not the file size.
+
+Invalid rows are not dropped: they are written with an empty risk and an
+``error`` naming the missing or invalid columns, so the output lines up with the
+input row for row.
+"""
+import io
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from caresphere import tabular_engine
+from caresphere.lazy import lazy_import
+from caresphere.metrics import emit
+
+pd = lazy_import("pandas")
+
+CHUNK_SIZE = 50_000
+
+CsvSource = Union[str, Path, io.IOBase]
+
+
+@dataclass
+class BulkSummary:
+    """Totals for one bulk scoring run"""
+    model: str
+    rows: int = 0
+    scored: int = 0
+    invalid: int = 0
+    positive: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "model": self.model,
+            "rows": self.rows,
+            "scored": self.scored,
+            "invalid": self.invalid,
+            "positive": self.positive,
+            "chunks": self.chunks,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+# ----------------------------
+# Column-wise Validation
+# ----------------------------
+def _normalise(name) -> str:
+    return str(name).strip().lower()
+
+
+def resolve_columns(spec: tabular_engine.TabularModelSpec, columns: Sequence[str]) -> List[str]:
+    """The CSV header name for each training column, matched ignoring case and surrounding spaces"""
+    by_name = {_normalise(c): c for c in columns}
+    missing = [f.name for f in spec.features if _normalise(f.name) not in by_name]
+    if missing:
+        raise tabular_engine.FeatureValidationError([f"{name}: column missing" for name in missing])
+    return [by_name[_normalise(f.name)] for f in spec.features]
+
+
+def encode_column(feature: tabular_engine.Feature, column) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorised ``Feature.encode``: ``(float64 values, invalid mask)`` for a pandas Series"""
+    if feature.choices is not None and not pd.api.types.is_numeric_dtype(column):
+        # Labels and their codes written as text; a dict lookup is far cheaper than to_numeric on strings
+        lookup = dict(feature.accepted_labels)
+        lookup.update({str(code): code for code in feature.choices.values()})
+        values = column.astype(str).str.strip().str.lower().map(lookup)
+    else:
+        values = pd.to_numeric(column, errors="coerce")
+    values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    with np.errstate(invalid="ignore"):
+        invalid = ~((values >= feature.minimum) & (values <= feature.maximum))
+    if feature.integer:
+        invalid |= values != np.round(values)
+    if feature.choices is not None:
+        invalid |= ~np.isin(values, list(feature.choices.values()))
+    return values, invalid
+
+
+def encode_chunk(spec: tabular_engine.TabularModelSpec, chunk, columns: Sequence[str]):
+    """Encode one chunk: ``(X, invalid row mask, per-row error text)``"""
+    X = np.empty((len(chunk), len(spec.features)), dtype=np.float64)
+    bad = np.zeros(X.shape, dtype=bool)
+    for j, (feature, column) in enumerate(zip(spec.features, columns)):
+        X[:, j], bad[:, j] = encode_column(feature, chunk[column])
+    invalid = bad.any(axis=1)
+    errors = np.full(len(chunk), "", dtype=object)
+    if invalid.any():
+        names = np.array([f.name.strip() for f in spec.features])
+        errors[invalid] = ["missing or invalid " + ", ".join(names[row]) for row in bad[invalid]]
+    return X, invalid, errors
+
+
+# ----------------------------
+# Scoring
+# ----------------------------
+def score_chunk(spec: tabular_engine.TabularModelSpec, model, chunk, columns: Sequence[str]):
+    """Score the valid rows of one chunk in a single ``predict`` call: ``(labels, risk, errors)``.
+
+    Invalid rows get an empty label, a NaN risk and their error text.
+    """
+    X, invalid, errors = encode_chunk(spec, chunk, columns)
+    risk = np.full(len(chunk), np.nan)
+    if (~invalid).any():
+        risk[~invalid] = model.predict(X[~invalid])[:, spec.positive_label]
+    labels = np.where(risk >= 0.5, spec.outcomes[spec.positive_label],
+                      spec.outcomes[1 - spec.positive_label]).astype(object)
+    labels[invalid] = ""
+    return labels, risk, errors
+
+
+def iter_scored_chunks(key: str, source: CsvSource, chunk_size: int = CHUNK_SIZE,
+                       keep: Sequence[str] = (), summary: Optional[BulkSummary] = None,
+                       backend: str = tabular_engine.DEFAULT_BACKEND) -> Iterator:
+    """Yield one scored DataFrame per input chunk (``row``, kept columns, label, risk, error)"""
+    spec = tabular_engine.get_spec(key)
+    model = tabular_engine.get_model(key, backend)
+    summary = summary if summary is not None else BulkSummary(key)
+    wanted = {_normalise(f.name) for f in spec.features} | {_normalise(c) for c in keep}
+    reader = pd.read_csv(source, chunksize=chunk_size, usecols=lambda c: _normalise(c) in wanted)
+
+    columns = None
+    offset = 0
+    for chunk in reader:
+        if columns is None:
+            columns = resolve_columns(spec, chunk.columns)
+            kept = [c for c in chunk.columns if _normalise(c) in {_normalise(k) for k in keep}]
+        labels, risk, errors = score_chunk(spec, model, chunk, columns)
+        valid = errors == ""
+
+        scored = pd.DataFrame({"row": np.arange(offset, offset + len(chunk))})
+        for column in kept:
+            scored[column] = chunk[column].to_numpy()
+        scored[f"{key}_label"] = labels
+        scored[f"{key}_risk"] = np.round(risk, 6)
+        scored["error"] = errors
+
+        offset += len(chunk)
+        summary.rows += len(chunk)
+        summary.scored += int(valid.sum())
+        summary.invalid += int((~valid).sum())
+        summary.positive += int((risk[valid] >= 0.5).sum())
+        summary.chunks += 1
+        yield scored
+
+
+def score_csv(key: str, source: CsvSource, output: Union[str, Path, io.IOBase],
+              chunk_size: int = CHUNK_SIZE, keep: Sequence[str] = (),
+              progress: Optional[Callable[[BulkSummary], None]] = None,
+              backend: str = tabular_engine.DEFAULT_BACKEND) -> BulkSummary:
+    """Score every row of ``source`` and write the results to ``output`` chunk by chunk"""
+    summary = BulkSummary(key)
+    # Load the model up front so the reported throughput is scoring only
+    tabular_engine.get_model(key, backend)
+    start = time.perf_counter()
+    fh = open(output, "w", newline="", encoding="utf-8") if isinstance(output, (str, Path)) else output
+    try:
+        for scored in iter_scored_chunks(key, source, chunk_size, keep, summary, backend):
+            scored.to_csv(fh, header=summary.chunks == 1, index=False)
+            summary.seconds = time.perf_counter() - start
+            if progress is not None:
+                progress(summary)
+    finally:
+        if fh is not output:
+            fh.close()
+    summary.seconds = time.perf_counter() - start
+    emit(f"tabular.{key}.bulk", {"rows": summary.rows, "invalid": summary.invalid,
+                                 "total_ms": summary.seconds * 1000, "rows_per_second": summary.rows_per_second})
+    return summary
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import sys
+
+    parser = argparse.ArgumentParser(description="Score a patient CSV with a tabular disease model")
+    parser.add_argument("model", choices=sorted(tabular_engine.TABULAR_MODELS))
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--keep", nargs="*", default=[], help="input columns copied to the output (e.g. an ID)")
+    parser.add_argument("--backend", choices=sorted(tabular_engine.BACKENDS), default=tabular_engine.DEFAULT_BACKEND)
+    args = parser.parse_args()
+
+    try:
+        result = score_csv(args.model, args.input, args.output, args.chunk_size, args.keep,
+                           progress=lambda s: print(f"{s.rows} rows ({s.rows_per_second:,.0f} rows/s)",
+                                                    file=sys.stderr),
+                           backend=args.backend)
+    except tabular_engine.FeatureValidationError as e:
+        sys.exit(f"{args.input}: {e}")
+    print(json.dumps(result.to_dict()))
@@ -0,0 +1,131 @@
+"""Content-addressed cache for MFCC feature vectors and model outputs.
+
+Entries are keyed by a SHA-256 digest of the raw audio bytes combined with the
+feature parameters, so re-uploading the same recording (or replaying the QA
+corpus) skips decoding entirely. Predictions are additionally keyed by a model
+tag (model name, weights version and backend) so a new model never serves a
+stale softmax. The in-memory tier is a size-bounded LRU; an optional on-disk
+tier survives restarts and is shared between worker processes.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Hashable, Optional, Sequence, Union
+
+import numpy as np
+
+
+class LRUCache:
+    """Thread-safe mapping that evicts the least recently used entry past ``max_entries``"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class AudioCache:
+    """Two-tier (memory LRU + optional directory) cache of features and predictions"""
+
+    def __init__(self, max_entries: int = 1024, disk_dir: Optional[Union[str, Path]] = None):
+        self.memory = LRUCache(max_entries)
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def content_key(data: bytes, params: Sequence) -> str:
+        """Digest of the audio bytes plus every parameter that shapes the features"""
+        # SHA-256 is hardware accelerated on current CPUs and beats BLAKE2 on multi-MB uploads
+        digest = hashlib.sha256(data)
+        digest.update(repr(tuple(params)).encode())
+        return digest.hexdigest()[:40]
+
+    # ----------------------------
+    # Disk tier
+    # ----------------------------
+    def _disk_path(self, name: str) -> Path:
+        return self.disk_dir / name[:2] / f"{name}.npy"
+
+    def _disk_get(self, name: str) -> Optional[np.ndarray]:
+        if self.disk_dir is None:
+            return None
+        try:
+            return np.load(self._disk_path(name), allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+
+    def _disk_put(self, name: str, value: np.ndarray) -> None:
+        if self.disk_dir is None:
+            return
+        path = self._disk_path(name)
+        path.parent.mkdir(exist_ok=True)
+        # Write then rename so concurrent readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            np.save(fh, value, allow_pickle=False)
+        os.replace(tmp, path)
+
+    # ----------------------------
+    # Lookups
+    # ----------------------------
+    def _get(self, name: str) -> Optional[np.ndarray]:
+        value = self.memory.get(name)
+        if value is None:
+            value = self._disk_get(name)
+            if value is not None:
+                self.memory.put(name, value)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def _put(self, name: str, value: np.ndarray) -> None:
+        # Private read-only copy: callers keep a writable array, cached entries stay immutable
+        value = np.array(value, dtype=np.float32)
+        value.setflags(write=False)
+        self.memory.put(name, value)
+        self._disk_put(name, value)
+
+    def get_features(self, content_key: str) -> Optional[np.ndarray]:
+        return self._get(f"{content_key}.features")
+
+    def put_features(self, content_key: str, features: np.ndarray) -> None:
+        self._put(f"{content_key}.features", features)
+
+    def get_prediction(self, content_key: str, model_tag: str) -> Optional[np.ndarray]:
+        return self._get(f"{content_key}.{model_tag}")
+
+    def put_prediction(self, content_key: str, model_tag: str, probabilities: np.ndarray) -> None:
+        self._put(f"{content_key}.{model_tag}", probabilities)
+
+    def clear(self) -> None:
+        """Drop the in-memory tier (the disk tier is left untouched)"""
+        self.memory.clear()
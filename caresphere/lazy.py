@@ -0,0 +1,47 @@
+"""Deferred imports for the heavy ML / OCR stacks.
+
+Page modules run top to bottom on every navigation, so a top-level
+``import tensorflow`` or ``import easyocr`` is paid by every new worker before
+the first widget renders. ``lazy_import`` returns a stand-in module object
+that performs the real import on first attribute access, which in practice is
+the moment an analysis actually runs.
+"""
+import importlib
+import sys
+import threading
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports ``name`` the first time an attribute is read"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._lock = threading.Lock()
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self.__name__)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        # Only reached for attributes not set in __init__, i.e. the real module's
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._module is not None
+
+
+def lazy_import(name: str):
+    """Return ``name`` if it is already imported, otherwise a ``LazyModule`` for it"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
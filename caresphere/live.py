@@ -0,0 +1,193 @@
+"""Live-capture classification with incremental ring-buffer features.
+
+Audio arrives in small chunks (a microphone, or a recording replayed at real
+time as a stand-in). ``LiveClassifier`` keeps a fixed-size ring of mel-spectrum
+frames covering the last ``window`` seconds: every chunk is resampled with a
+streaming resampler, only the STFT frames it completes are computed, and they
+overwrite the oldest rows of the ring. Every ``update_every`` seconds the
+window's mean MFCC is summarised straight from the ring (the mean and the
+top_db peak do not depend on frame order, so the ring is never unrolled) and
+classified. Nothing is ever re-decoded, so the cost of an update is constant
+and the sound-to-verdict latency is a fraction of a millisecond plus at most
+one update interval of buffering.
+
+The ring holds a continuous frame sequence, whereas the upload path zero-pads
+each window at both ends, so live features differ slightly from offline ones
+at window boundaries.
+"""
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+import numpy as np
+
+from caresphere import audio_engine
+from caresphere.lazy import lazy_import
+from caresphere.mfcc import get_extractor
+from caresphere.streaming import AudioStream
+
+soxr = lazy_import("soxr")
+
+UPDATE_SECONDS = 0.5
+CHUNK_SECONDS = 0.1
+MIN_SECONDS = 1.0
+
+
+@dataclass
+class LiveUpdate:
+    """A rolling verdict; ``time`` is the seconds of audio received when it was produced"""
+    time: float
+    prediction: audio_engine.AudioPrediction
+    latency_ms: float
+
+    def to_row(self) -> dict:
+        return {"Time (s)": round(self.time, 2), **self.prediction.to_row(), "Latency (ms)": round(self.latency_ms, 3)}
+
+
+class LiveClassifier:
+    """Incremental classifier over the most recent ``window`` seconds of a live feed"""
+
+    def __init__(self, key: str, window: float = audio_engine.DURATION, update_every: float = UPDATE_SECONDS,
+                 input_sr: int = audio_engine.SAMPLE_RATE, backend: str = audio_engine.DEFAULT_BACKEND,
+                 min_seconds: float = MIN_SECONDS):
+        self.key = key
+        self.backend = backend
+        # Load (or reuse) the model up front so the first update pays no load cost
+        audio_engine.get_model(key, backend)
+        self.extractor = get_extractor(audio_engine.SAMPLE_RATE, audio_engine.N_MFCC)
+        sr, hop = audio_engine.SAMPLE_RATE, self.extractor.hop_length
+        self.capacity = max(1, int(window * sr) // hop)
+        self.min_frames = min(self.capacity, max(1, int(min_seconds * sr) // hop))
+        self.ring = np.empty((self.capacity, self.extractor.mel_basis_t.shape[1]), dtype=np.float32)
+        self.filled = 0
+        self.position = 0
+        # Zero lead-in so the first frame is centred on sample 0, as in the upload path
+        self.pending = np.zeros(self.extractor.n_fft // 2, dtype=np.float32)
+        self.update_samples = max(1, int(update_every * sr))
+        self.since_update = 0
+        self.received = 0
+        self.resampler = None
+        if input_sr != sr:
+            self.resampler = soxr.ResampleStream(input_sr, sr, 1, dtype="float32")
+        self.latencies = deque(maxlen=200)
+
+    def _add_frames(self, y: np.ndarray) -> None:
+        n_fft, hop = self.extractor.n_fft, self.extractor.hop_length
+        self.pending = np.concatenate([self.pending, y])
+        n_new = (len(self.pending) - n_fft) // hop + 1
+        if n_new <= 0:
+            return
+        frames = np.lib.stride_tricks.sliding_window_view(self.pending, n_fft)[::hop][:n_new]
+        db = self.extractor.frame_db(frames)[-self.capacity:]
+        rows = (self.position + np.arange(len(db))) % self.capacity
+        self.ring[rows] = db
+        self.position = (self.position + len(db)) % self.capacity
+        self.filled = min(self.capacity, self.filled + len(db))
+        self.pending = self.pending[n_new * hop:]
+
+    def features(self) -> np.ndarray:
+        """Mean MFCC of the frames currently in the ring"""
+        return self.extractor.summarise(self.ring[: self.filled])
+
+    def classify(self) -> audio_engine.AudioPrediction:
+        features = self.features()
+        probabilities = audio_engine.predict_features(self.key, features, self.backend)[0]
+        return audio_engine.build_prediction(self.key, probabilities, features)
+
+    def push(self, chunk: np.ndarray) -> Optional[LiveUpdate]:
+        """Feed one chunk of mono audio; returns a fresh verdict when an update is due"""
+        start = time.perf_counter()
+        y = np.asarray(chunk, dtype=np.float32)
+        if self.resampler is not None:
+            y = self.resampler.resample_chunk(y)
+        self._add_frames(y)
+        self.received += len(y)
+        self.since_update += len(y)
+        if self.since_update < self.update_samples or self.filled < self.min_frames:
+            return None
+        # Keep the remainder so updates stay on a fixed cadence whatever the chunk size
+        self.since_update %= self.update_samples
+        return self._update(start)
+
+    def finish(self) -> Optional[LiveUpdate]:
+        """End of the feed: flush the resampler and frame the tail; returns a last verdict if there is new audio"""
+        start = time.perf_counter()
+        y = np.zeros(0, dtype=np.float32)
+        if self.resampler is not None:
+            # soxr holds back the last few milliseconds until told the stream has ended
+            y = self.resampler.resample_chunk(y, last=True)
+            self.resampler = None
+        # Zero lead-out so the last samples get centred frames, as in the upload path
+        self._add_frames(np.concatenate([y, np.zeros(self.extractor.n_fft // 2, dtype=np.float32)]))
+        self.received += len(y)
+        self.since_update += len(y)
+        if not self.since_update or self.filled < self.min_frames:
+            return None
+        self.since_update = 0
+        return self._update(start)
+
+    def _update(self, start: float) -> LiveUpdate:
+        prediction = self.classify()
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.latencies.append(latency_ms)
+        return LiveUpdate(self.received / audio_engine.SAMPLE_RATE, prediction, latency_ms)
+
+    def latency_stats(self) -> dict:
+        """Median and 95th percentile push-to-verdict latency over recent updates"""
+        if not self.latencies:
+            return {"p50_ms": 0.0, "p95_ms": 0.0}
+        values = np.array(self.latencies)
+        return {"p50_ms": float(np.median(values)), "p95_ms": float(np.percentile(values, 95))}
+
+
+def live_session(key: str, source: audio_engine.AudioSource, update_every: float = UPDATE_SECONDS,
+                 chunk_seconds: float = CHUNK_SECONDS, realtime: bool = True,
+                 backend: str = audio_engine.DEFAULT_BACKEND) -> Iterator[LiveUpdate]:
+    """Replay a recording as a live feed of ``chunk_seconds`` chunks and yield the rolling verdicts.
+
+    Stands in for a microphone: with ``realtime`` each chunk is delivered no
+    sooner than it would have been captured.
+    """
+    stream = AudioStream(source, chunk_seconds=chunk_seconds)
+    classifier = None
+    started = time.perf_counter()
+    delivered = 0.0
+    for chunk in stream:
+        if classifier is None:
+            classifier = LiveClassifier(key, update_every=update_every, input_sr=stream.sr, backend=backend)
+        delivered += len(chunk) / stream.sr
+        if realtime:
+            time.sleep(max(0.0, started + delivered - time.perf_counter()))
+        update = classifier.push(chunk)
+        if update is not None:
+            yield update
+    if classifier is not None:
+        update = classifier.finish()
+        if update is not None:
+            yield update
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Replay recordings as a live feed and report rolling verdicts")
+    parser.add_argument("model", choices=sorted(audio_engine.AUDIO_MODELS))
+    parser.add_argument("file")
+    parser.add_argument("--update-ms", type=float, default=UPDATE_SECONDS * 1000)
+    parser.add_argument("--chunk-ms", type=float, default=CHUNK_SECONDS * 1000)
+    parser.add_argument("--realtime", action="store_true", help="pace chunks at capture speed")
+    parser.add_argument("--backend", choices=sorted(audio_engine.BACKENDS), default=audio_engine.DEFAULT_BACKEND)
+    args = parser.parse_args()
+
+    latencies = []
+    for update in live_session(args.model, args.file, args.update_ms / 1000, args.chunk_ms / 1000,
+                               args.realtime, args.backend):
+        latencies.append(update.latency_ms)
+        print(json.dumps({"time": round(update.time, 2), "name": update.prediction.name,
+                          "confidence": round(update.prediction.confidence, 4),
+                          "latency_ms": round(update.latency_ms, 3)}))
+    if latencies:
+        print(json.dumps({"updates": len(latencies), "p50_ms": float(np.median(latencies)),
+                          "p95_ms": float(np.percentile(latencies, 95))}))
@@ -0,0 +1,124 @@
+"""Per-stage timing for the analysis pipelines and the sinks that receive it."""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger("caresphere.metrics")
+
+# A sink receives an event name (e.g. "cardioecho.analyze") and a flat mapping
+# of metric name -> value. Durations are always reported in milliseconds.
+MetricsSink = Callable[[str, Dict[str, float]], None]
+
+_sinks: List[MetricsSink] = []
+_sinks_lock = threading.Lock()
+
+
+# ----------------------------
+# Sinks
+# ----------------------------
+def log_sink(event: str, values: Dict[str, float]) -> None:
+    """Write the metrics to the ``caresphere.metrics`` logger"""
+    formatted = " ".join(f"{name}={value:.2f}" for name, value in values.items())
+    logger.info("%s %s", event, formatted)
+
+
+class JsonLinesSink:
+    """Append one JSON object per event to a file (safe across threads)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, event: str, values: Dict[str, float]) -> None:
+        record = {"event": event, "ts": time.time(), **values}
+        line = json.dumps(record)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(line + "\n")
+
+
+def register_sink(sink: MetricsSink) -> None:
+    """Add a sink that will receive every emitted event"""
+    with _sinks_lock:
+        if sink not in _sinks:
+            _sinks.append(sink)
+
+
+def unregister_sink(sink: MetricsSink) -> None:
+    with _sinks_lock:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+
+def emit(event: str, values: Dict[str, float]) -> None:
+    """Send an event to every registered sink; a failing sink never breaks the caller"""
+    with _sinks_lock:
+        sinks = list(_sinks)
+    for sink in sinks:
+        try:
+            sink(event, values)
+        except Exception as e:
+            logger.warning("Metrics sink %r failed: %s", sink, e)
+
+
+register_sink(log_sink)
+if os.getenv("CARESPHERE_METRICS_PATH"):
+    register_sink(JsonLinesSink(os.environ["CARESPHERE_METRICS_PATH"]))
+
+
+# ----------------------------
+# Stage Timer
+# ----------------------------
+class StageTimer:
+    """Measure named pipeline stages and report them as one event.
+
+    ``stages`` is the expected stage order; it is only used to compute the
+    completed fraction passed to ``on_progress(fraction, stage_name)``. The
+    fraction follows the position of the finished stage, so stages that are
+    skipped (e.g. decoding on a cache hit) do not leave progress short of 1.
+    """
+
+    def __init__(
+        self,
+        event: str,
+        stages: Sequence[str] = (),
+        on_progress: Optional[Callable[[float, str], None]] = None,
+    ):
+        self.event = event
+        self.stages = list(stages)
+        self.on_progress = on_progress
+        self.durations: Dict[str, float] = {}
+        self._progress = 0
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.durations[name] = self.durations.get(name, 0.0) + elapsed_ms
+        if self.on_progress is not None:
+            if name in self.stages:
+                done = max(self.stages.index(name) + 1, self._progress)
+                total = len(self.stages)
+            else:
+                done, total = len(self.durations), len(self.stages) or len(self.durations)
+            self._progress = done
+            self.on_progress(min(done / total, 1.0), name)
+
+    @property
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000
+
+    def finish(self) -> Dict[str, float]:
+        """Emit the collected durations (plus ``total``) and return them"""
+        values = {f"{name}_ms": value for name, value in self.durations.items()}
+        values["total_ms"] = self.total_ms
+        emit(self.event, values)
+        return dict(self.durations, total=values["total_ms"])
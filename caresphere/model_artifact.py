@@ -0,0 +1,186 @@
+"""Self-describing, pickle-free artifacts for the tabular disease models.
+
+An artifact is a directory holding two files:
+
+* ``manifest.json``: format version, model key, estimator type, feature
+  names, label encodings, the scikit-learn version the estimator was trained
+  with, and the dtype, shape and byte offset of every array. It also records
+  the payload's size and BLAKE2b checksum.
+* ``arrays.bin``: the raw arrays from ``numpy_tabular.sklearn_arrays``,
+  concatenated in native layout, each starting on a 64-byte boundary.
+
+``load`` parses the manifest and checks it against the caller's expectations
+(format, feature names). It then memory-maps the payload, verifies its size
+and checksum, and returns zero-copy read-only views. Nothing is unpickled and
+scikit-learn is never imported, so an artifact can be opened safely on a
+shared node. ``convert_pickle`` is the one place a pickle is still read:
+it writes the artifact from an existing ``*_model_pickle``.
+"""
+import hashlib
+import json
+import math
+import mmap
+import os
+import pickle
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from caresphere import numpy_tabular
+
+FORMAT = "caresphere-tabular"
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+PAYLOAD = "arrays.bin"
+ALIGNMENT = 64
+# Manifest entries that numpy_tabular.from_arrays reads as scalars rather than arrays
+_SCALARS = ("scorer", "depth")
+
+
+class ArtifactError(ValueError):
+    """An artifact that is missing, corrupt or not the model the caller expects"""
+
+
+@dataclass
+class Artifact:
+    """A validated manifest and zero-copy views of its arrays"""
+    path: Path
+    manifest: dict
+    arrays: Dict[str, np.ndarray]
+
+    @property
+    def feature_names(self):
+        return self.manifest["feature_names"]
+
+    def scorer(self):
+        """The ``numpy_tabular`` scorer evaluating this artifact"""
+        arrays = dict(self.arrays)
+        arrays.update({name: self.manifest[name] for name in _SCALARS if name in self.manifest})
+        arrays["feature_names"] = self.feature_names
+        return numpy_tabular.from_arrays(arrays)
+
+
+# ----------------------------
+# Writing
+# ----------------------------
+def _checksum(buffer) -> str:
+    return "blake2b:" + hashlib.blake2b(buffer, digest_size=16).hexdigest()
+
+
+def write(directory: Union[str, Path], arrays: Mapping[str, np.ndarray], metadata: Mapping) -> Path:
+    """Write ``arrays`` and ``metadata`` as an artifact directory; returns its path"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    layout, payload = {}, bytearray()
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        if array.dtype.hasobject or array.dtype.kind in "US":
+            raise ArtifactError(f"Array '{name}' has dtype {array.dtype}; only numeric arrays are stored")
+        payload.extend(b"\0" * (-len(payload) % ALIGNMENT))
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": len(payload)}
+        payload.extend(array.tobytes())
+
+    manifest = {"format": FORMAT, "format_version": FORMAT_VERSION, **metadata, "arrays": layout,
+                "payload_bytes": len(payload), "checksum": _checksum(payload)}
+    # Payload first: a reader never sees a manifest describing a payload that is not there yet
+    (directory / PAYLOAD).write_bytes(payload)
+    (directory / MANIFEST).write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    return directory
+
+
+def convert_sklearn(estimator, directory: Union[str, Path], feature_names: Sequence[str],
+                    **metadata) -> Path:
+    """Write a fitted scikit-learn classifier as an artifact (extra ``metadata`` goes in the manifest)"""
+    arrays = numpy_tabular.sklearn_arrays(estimator)
+    scalars = {name: arrays.pop(name).item() for name in _SCALARS if name in arrays}
+    manifest = {"estimator": type(estimator).__name__, **scalars, "feature_names": list(feature_names),
+                "classes": arrays["classes"].tolist(), **metadata}
+    return write(directory, arrays, manifest)
+
+
+def convert_pickle(pickle_path: Union[str, Path], directory: Union[str, Path], feature_names: Sequence[str],
+                   **metadata) -> Path:
+    """Convert a pickled scikit-learn classifier, recording the version it was trained with"""
+    import sklearn
+
+    pickle_path = Path(pickle_path)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        with open(pickle_path, "rb") as fh:
+            estimator = pickle.load(fh)
+    # scikit-learn warns when unpickling across versions and names the original one
+    trained_with = next((str(w.message.original_sklearn_version) for w in caught
+                         if hasattr(w.message, "original_sklearn_version")), sklearn.__version__)
+    source = {"file": pickle_path.name,
+              "blake2b": hashlib.blake2b(pickle_path.read_bytes(), digest_size=6).hexdigest()}
+    return convert_sklearn(estimator, directory, feature_names, sklearn_version=trained_with,
+                           converted_with_sklearn=sklearn.__version__, source=source, **metadata)
+
+
+# ----------------------------
+# Loading
+# ----------------------------
+def read_manifest(directory: Union[str, Path]) -> dict:
+    path = Path(directory) / MANIFEST
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        raise ArtifactError(f"{path} does not exist") from None
+    except ValueError as e:
+        raise ArtifactError(f"{path} is not valid JSON: {e}") from None
+    if manifest.get("format") != FORMAT or manifest.get("format_version") != FORMAT_VERSION:
+        raise ArtifactError(f"{path}: unsupported format {manifest.get('format')!r} "
+                            f"version {manifest.get('format_version')!r}")
+    return manifest
+
+
+def load(directory: Union[str, Path], feature_names: Optional[Sequence[str]] = None,
+         verify: bool = True) -> Artifact:
+    """Validate an artifact and memory-map its arrays.
+
+    ``feature_names`` (if given) must match the manifest exactly. ``verify``
+    checks the payload checksum, which touches every page of the payload.
+    """
+    directory = Path(directory)
+    manifest = read_manifest(directory)
+    if feature_names is not None and list(feature_names) != manifest.get("feature_names"):
+        raise ArtifactError(f"{directory.name} was written for {manifest.get('feature_names')}, "
+                            f"expected {list(feature_names)}")
+
+    payload_path = directory / PAYLOAD
+    try:
+        with open(payload_path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size != manifest["payload_bytes"]:
+                raise ArtifactError(f"{payload_path} is {size} bytes, the manifest says {manifest['payload_bytes']}")
+            # The mapping stays valid after the file is closed; the array views keep it alive
+            payload = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+    except FileNotFoundError:
+        raise ArtifactError(f"{payload_path} does not exist") from None
+    if verify and _checksum(payload) != manifest["checksum"]:
+        raise ArtifactError(f"{payload_path} does not match the manifest checksum")
+
+    arrays = {}
+    for name, entry in manifest["arrays"].items():
+        dtype = np.dtype(entry["dtype"])
+        count = math.prod(entry["shape"])
+        offset = entry["offset"]
+        if offset % dtype.alignment or offset + count * dtype.itemsize > size:
+            raise ArtifactError(f"{directory.name}: array '{name}' lies outside the payload")
+        arrays[name] = np.frombuffer(payload, dtype, count, offset).reshape(entry["shape"])
+    return Artifact(directory, manifest, arrays)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert a pickled scikit-learn classifier to a model artifact")
+    parser.add_argument("pickle_path")
+    parser.add_argument("directory")
+    parser.add_argument("--features", nargs="+", required=True, help="training column names, in order")
+    args = parser.parse_args()
+
+    print(f"Wrote {convert_pickle(args.pickle_path, args.directory, args.features)}")
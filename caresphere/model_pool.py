@@ -0,0 +1,231 @@
+"""Process-wide warm pool for every model the CareSphere pages load.
+
+Models are registered by name with a loader (``audio/heartbeat/keras``,
+``ocr/easyocr``, ...), loaded on first use and shared by every session in the
+worker. For each load the pool records how much resident memory (RSS) the
+process grew by, which is what the model actually costs the worker. When a
+memory budget is set (``CARESPHERE_MODEL_BUDGET_MB``) the least recently used
+heavy models are evicted until the pool fits again; light models such as the
+NumPy classifiers are never evicted. ``CARESPHERE_PREWARM`` (comma-separated
+names) loads chosen models in the background at startup.
+
+RSS deltas are attributed to whichever model triggered them, so the first
+model of a framework also carries the framework's import (TensorFlow,
+PyTorch), and eviction cannot return memory the framework keeps.
+"""
+import gc
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from importlib import import_module
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from caresphere.metrics import emit
+
+logger = logging.getLogger("caresphere.model_pool")
+
+# Modules whose import registers loaders with POOL; imported before pre-warming
+PROVIDERS = ("caresphere.audio_engine", "caresphere.ocr", "caresphere.tabular_engine")
+
+
+def resident_bytes() -> Optional[int]:
+    """Current resident set size of this process, or ``None`` where it cannot be read"""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+@dataclass
+class PoolEntry:
+    """A registered model and what it costs once loaded"""
+    name: str
+    loader: Callable[[], Any]
+    heavy: bool = True
+    size_hint: Optional[Callable[[Any], int]] = None
+    on_evict: Optional[Callable[[Any], None]] = None
+    model: Any = None
+    resident_bytes: int = 0
+    load_ms: float = 0.0
+    hits: int = 0
+    last_used: float = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self.model is not None
+
+
+class ModelPool:
+    """Named, lazily loaded models with memory accounting and LRU eviction"""
+
+    def __init__(self, budget_mb: Optional[float] = None):
+        self.budget_bytes = int(budget_mb * 2 ** 20) if budget_mb else None
+        self._entries: Dict[str, PoolEntry] = {}
+        # Loaded entries in least- to most-recently-used order
+        self._lru: "OrderedDict[str, PoolEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._loading: Dict[str, threading.Lock] = {}
+
+    def register(self, name: str, loader: Callable[[], Any], heavy: bool = True,
+                 size_hint: Optional[Callable[[Any], int]] = None,
+                 on_evict: Optional[Callable[[Any], None]] = None) -> None:
+        """Declare how to load ``name``; registering again keeps an already loaded model"""
+        with self._lock:
+            if name not in self._entries:
+                self._entries[name] = PoolEntry(name, loader, heavy, size_hint, on_evict)
+                self._loading[name] = threading.Lock()
+
+    def names(self) -> List[str]:
+        return sorted(self._entries)
+
+    def get(self, name: str) -> Any:
+        """The loaded model for ``name``, loading it (and evicting others if over budget) on first use"""
+        try:
+            entry = self._entries[name]
+        except KeyError:
+            raise KeyError(f"Unknown model '{name}'. Registered: {self.names()}") from None
+        with self._lock:
+            if entry.loaded:
+                return self._touch(entry)
+        # Per-model lock: two sessions never load the same model twice, and
+        # loading one model does not block lookups of the others
+        with self._loading[name]:
+            if not entry.loaded:
+                self._load(entry)
+        with self._lock:
+            model = self._touch(entry)
+            victims = self._over_budget(keep=name)
+        # Evict outside the pool lock: on_evict and gc.collect() can take a while
+        # and must not block other sessions' lookups
+        for victim in victims:
+            self.evict(victim)
+        return model
+
+    def _touch(self, entry: PoolEntry) -> Any:
+        entry.hits += 1
+        entry.last_used = time.time()
+        self._lru[entry.name] = entry
+        self._lru.move_to_end(entry.name)
+        return entry.model
+
+    def _load(self, entry: PoolEntry) -> None:
+        before = resident_bytes()
+        start = time.perf_counter()
+        model = entry.loader()
+        entry.load_ms = (time.perf_counter() - start) * 1000
+        after = resident_bytes()
+        measured = (after - before) if before is not None and after is not None else 0
+        hinted = entry.size_hint(model) if entry.size_hint is not None else 0
+        entry.resident_bytes = max(measured, hinted, 0)
+        entry.model = model
+        emit("model_pool.load", {"load_ms": entry.load_ms, "resident_mb": entry.resident_bytes / 2 ** 20})
+        logger.info("Loaded %s in %.0f ms (%.1f MB)", entry.name, entry.load_ms, entry.resident_bytes / 2 ** 20)
+
+    def evict(self, name: str) -> bool:
+        """Drop a loaded model; returns whether anything was evicted"""
+        with self._lock:
+            entry = self._lru.pop(name, None)
+            if entry is None:
+                return False
+            model, entry.model = entry.model, None
+        if entry.on_evict is not None:
+            entry.on_evict(model)
+        del model
+        gc.collect()
+        emit("model_pool.evict", {"resident_mb": entry.resident_bytes / 2 ** 20})
+        logger.info("Evicted %s (%.1f MB)", entry.name, entry.resident_bytes / 2 ** 20)
+        return True
+
+    def _over_budget(self, keep: str) -> List[str]:
+        # Least recently used heavy models to evict, oldest first, until the pool fits the budget
+        if self.budget_bytes is None:
+            return []
+        victims, total = [], self.total_bytes()
+        for name, entry in self._lru.items():
+            if total <= self.budget_bytes:
+                break
+            if entry.heavy and name != keep:
+                victims.append(name)
+                total -= entry.resident_bytes
+        return victims
+
+    def total_bytes(self) -> int:
+        return sum(entry.resident_bytes for entry in self._lru.values())
+
+    def prewarm(self, names: Iterable[str], background: bool = True) -> Optional[threading.Thread]:
+        """Load ``names`` now, or on a daemon thread so startup is not blocked"""
+        names = list(names)
+
+        def _warm():
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception as e:
+                    logger.warning("Pre-warming %s failed: %s", name, e)
+
+        if not background:
+            _warm()
+            return None
+        thread = threading.Thread(target=_warm, name="model-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def report(self) -> List[Dict]:
+        """One row per registered model, most recently used first"""
+        with self._lock:
+            order = list(reversed(self._lru)) + [n for n in self.names() if n not in self._lru]
+            return [
+                {
+                    "Model": name,
+                    "Loaded": self._entries[name].loaded,
+                    "Heavy": self._entries[name].heavy,
+                    "Resident (MB)": round(self._entries[name].resident_bytes / 2 ** 20, 1),
+                    "Load (ms)": round(self._entries[name].load_ms, 1),
+                    "Hits": self._entries[name].hits,
+                }
+                for name in order
+            ]
+
+
+_budget = os.getenv("CARESPHERE_MODEL_BUDGET_MB")
+POOL = ModelPool(float(_budget) if _budget else None)
+
+_prewarmed = False
+
+
+def prewarm_from_env() -> Optional[threading.Thread]:
+    """Start pre-warming the models named in ``CARESPHERE_PREWARM`` (once per process)"""
+    global _prewarmed
+    names = [n.strip() for n in os.getenv("CARESPHERE_PREWARM", "").split(",") if n.strip()]
+    if _prewarmed or not names:
+        return None
+    _prewarmed = True
+    for module in PROVIDERS:
+        import_module(module)
+    return POOL.prewarm(names)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Load models through the pool and report their memory")
+    parser.add_argument("names", nargs="*", help="models to load (default: list the registered names)")
+    parser.add_argument("--budget-mb", type=float, help="override CARESPHERE_MODEL_BUDGET_MB")
+    args = parser.parse_args()
+
+    for module in PROVIDERS:
+        import_module(module)
+    # Run as a script this module is __main__; the providers registered with the importable copy
+    pool = import_module("caresphere.model_pool").POOL
+    if args.budget_mb:
+        pool.budget_bytes = int(args.budget_mb * 2 ** 20)
+    pool.prewarm(args.names, background=False)
+    for row in pool.report():
+        print(json.dumps(row))
+    print(json.dumps({"total_mb": round(pool.total_bytes() / 2 ** 20, 1),
+                      "rss_mb": round((resident_bytes() or 0) / 2 ** 20, 1)}))
@@ -0,0 +1,202 @@
+"""Pure-NumPy inference for the small dense audio classifiers.
+
+The heartbeat and respiratory models are Dense(100)-Dense(200)-Dense(100)-
+softmax MLPs over a 40-dim MFCC vector (the heartbeat model adds a
+BatchNormalization after each hidden Dense). ``export_keras_archive`` reads a
+Keras 3 ``.keras`` archive directly with h5py, folds every BatchNormalization
+into the Dense layer before it and writes the resulting weights to a compact
+``.npz``. ``NumpyMLP`` evaluates that file with plain matmuls, so serving needs
+neither TensorFlow nor Keras.
+
+``quantize`` derives post-training variants with float16 or int8 kernels
+(int8 is symmetric per output column with a float32 scale; biases and
+activations stay float32). They shrink the weights 2x / 4x; NumPy has no
+low-precision GEMM, so kernels are widened to float32 inside each matmul.
+"""
+import json
+import zipfile
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+ACTIVATIONS = ("linear", "relu", "softmax")
+QUANTIZATIONS = ("float16", "int8")
+
+
+# ----------------------------
+# Export
+# ----------------------------
+def _layer_weights(weights, class_name: str, index: int) -> List[np.ndarray]:
+    # Keras 3 stores weights per layer under a snake_case path numbered in creation order
+    base = {"Dense": "dense", "BatchNormalization": "batch_normalization"}[class_name]
+    path = f"layers/{base}" if index == 0 else f"layers/{base}_{index}"
+    group = weights[path]["vars"]
+    return [np.asarray(group[str(i)]) for i in range(len(group))]
+
+
+def read_keras_archive(keras_path: Union[str, Path]) -> List[Tuple[np.ndarray, np.ndarray, str]]:
+    """Return ``[(kernel, bias, activation), ...]`` with BatchNorm folded in"""
+    import h5py
+
+    with zipfile.ZipFile(keras_path) as archive:
+        config = json.loads(archive.read("config.json"))
+        with archive.open("model.weights.h5") as fh:
+            weights = h5py.File(fh, "r")
+            blocks = []
+            counters = {"Dense": 0, "BatchNormalization": 0}
+            for layer in config["config"]["layers"]:
+                class_name, layer_config = layer["class_name"], layer["config"]
+                if class_name == "Dense":
+                    values = _layer_weights(weights, class_name, counters[class_name])
+                    kernel = values[0].astype(np.float64)
+                    bias = values[1].astype(np.float64) if layer_config.get("use_bias", True) \
+                        else np.zeros(kernel.shape[1])
+                    blocks.append([kernel, bias, layer_config.get("activation", "linear")])
+                elif class_name == "BatchNormalization":
+                    values = _layer_weights(weights, class_name, counters[class_name])
+                    gamma = values.pop(0) if layer_config.get("scale", True) else 1.0
+                    beta = values.pop(0) if layer_config.get("center", True) else 0.0
+                    mean, var = values
+                    if not blocks or blocks[-1][2] != "linear":
+                        # Folding is only exact into an affine layer; after a non-linearity it would be wrong
+                        raise ValueError("BatchNormalization can only be exported directly after a linear Dense layer")
+                    scale = gamma / np.sqrt(var.astype(np.float64) + layer_config.get("epsilon", 1e-3))
+                    kernel, bias, _ = blocks[-1]
+                    blocks[-1][0] = kernel * scale
+                    blocks[-1][1] = (bias - mean) * scale + beta
+                elif class_name == "Activation":
+                    blocks[-1][2] = layer_config["activation"]
+                elif class_name not in ("InputLayer", "Dropout"):
+                    raise ValueError(f"Unsupported layer for NumPy export: {class_name}")
+                if class_name in counters:
+                    counters[class_name] += 1
+            weights.close()
+
+    for _, _, activation in blocks:
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Unsupported activation for NumPy export: {activation}")
+    return [(kernel, bias, activation) for kernel, bias, activation in blocks]
+
+
+def export_keras_archive(keras_path: Union[str, Path], npz_path: Union[str, Path]) -> Path:
+    """Write the folded float32 weights of a ``.keras`` MLP to ``npz_path``"""
+    blocks = read_keras_archive(keras_path)
+    arrays = {}
+    for i, (kernel, bias, _) in enumerate(blocks):
+        arrays[f"W{i}"] = kernel.astype(np.float32)
+        arrays[f"b{i}"] = bias.astype(np.float32)
+    arrays["activations"] = np.array([activation for _, _, activation in blocks])
+    np.savez_compressed(npz_path, **arrays)
+    return Path(npz_path)
+
+
+# ----------------------------
+# Inference
+# ----------------------------
+class NumpyMLP:
+    """Forward pass of an exported MLP; ``predict`` mirrors ``keras.Model.predict``.
+
+    ``scales`` holds a per-column float32 scale for int8 kernels (``None`` for
+    float kernels), applied after the matmul.
+    """
+
+    def __init__(self, layers: List[Tuple[np.ndarray, np.ndarray, str]],
+                 scales: Optional[List[Optional[np.ndarray]]] = None):
+        self.layers = layers
+        self.scales = scales or [None] * len(layers)
+
+    @classmethod
+    def load(cls, npz_path: Union[str, Path]) -> "NumpyMLP":
+        with np.load(npz_path, allow_pickle=False) as data:
+            activations = [str(a) for a in data["activations"]]
+            layers = [
+                (np.ascontiguousarray(data[f"W{i}"]), data[f"b{i}"], activation)
+                for i, activation in enumerate(activations)
+            ]
+            scales = [data[f"s{i}"] if f"s{i}" in data else None for i in range(len(layers))]
+        return cls(layers, scales)
+
+    def save(self, npz_path: Union[str, Path]) -> Path:
+        arrays = {}
+        for i, ((kernel, bias, _), scale) in enumerate(zip(self.layers, self.scales)):
+            arrays[f"W{i}"] = kernel
+            arrays[f"b{i}"] = bias
+            if scale is not None:
+                arrays[f"s{i}"] = scale
+        arrays["activations"] = np.array([activation for _, _, activation in self.layers])
+        np.savez_compressed(npz_path, **arrays)
+        return Path(npz_path)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the weights, biases and scales"""
+        total = sum(kernel.nbytes + bias.nbytes for kernel, bias, _ in self.layers)
+        return total + sum(scale.nbytes for scale in self.scales if scale is not None)
+
+    @property
+    def input_dim(self) -> int:
+        return self.layers[0][0].shape[0]
+
+    @property
+    def n_classes(self) -> int:
+        return self.layers[-1][0].shape[1]
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        h = np.atleast_2d(np.asarray(X, dtype=np.float32))
+        for (kernel, bias, activation), scale in zip(self.layers, self.scales):
+            h = h @ kernel
+            if scale is not None:
+                h *= scale
+            h += bias
+            if activation == "relu":
+                np.maximum(h, 0, out=h)
+            elif activation == "softmax":
+                h -= h.max(axis=1, keepdims=True)
+                np.exp(h, out=h)
+                h /= h.sum(axis=1, keepdims=True)
+        return h
+
+
+# ----------------------------
+# Quantisation
+# ----------------------------
+def quantize(model: NumpyMLP, mode: str) -> NumpyMLP:
+    """Post-training copy of ``model`` with ``float16`` or ``int8`` kernels"""
+    if mode not in QUANTIZATIONS:
+        raise ValueError(f"Unknown quantization '{mode}'. Available: {QUANTIZATIONS}")
+    layers, scales = [], []
+    for kernel, bias, activation in model.layers:
+        kernel = kernel.astype(np.float32)
+        if mode == "float16":
+            layers.append((kernel.astype(np.float16), bias, activation))
+            scales.append(None)
+        else:
+            scale = np.abs(kernel).max(axis=0) / 127.0
+            scale[scale == 0] = 1.0
+            quantized = np.clip(np.round(kernel / scale), -127, 127).astype(np.int8)
+            layers.append((np.ascontiguousarray(quantized), bias, activation))
+            scales.append(scale.astype(np.float32))
+    return NumpyMLP(layers, scales)
+
+
+def quantized_path(npz_path: Union[str, Path], mode: str) -> Path:
+    """``Model.npz`` -> ``Model.int8.npz``"""
+    npz_path = Path(npz_path)
+    return npz_path.with_name(f"{npz_path.stem}.{mode}.npz")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export a .keras dense classifier to a NumPy .npz")
+    parser.add_argument("keras_path")
+    parser.add_argument("npz_path", nargs="?")
+    parser.add_argument("--quantize", choices=QUANTIZATIONS, action="append", default=[],
+                        help="also write a quantised variant next to the .npz (repeatable)")
+    args = parser.parse_args()
+
+    out = args.npz_path or str(Path(args.keras_path).with_suffix(".npz"))
+    print(f"Wrote {export_keras_archive(args.keras_path, out)}")
+    for mode in args.quantize:
+        print(f"Wrote {quantize(NumpyMLP.load(out), mode).save(quantized_path(out, mode))}")
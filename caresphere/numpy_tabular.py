@@ -0,0 +1,168 @@
+"""Pure-NumPy scoring for the tabular disease models.
+
+The notebooks in ``Text/`` train ``LogisticRegression``, ``DecisionTreeClassifier``,
+``RandomForestClassifier`` and a linear ``SVC``. ``sklearn_arrays`` reads the
+fitted parameters of any of them as plain arrays, which
+``caresphere.model_artifact`` stores on disk. The scorers below evaluate
+those arrays without scikit-learn, so serving never unpickles an estimator:
+
+* linear models (logistic regression, linear SVC) become ``sigmoid(X @ w + b)``.
+  For logistic regression this is exactly ``predict_proba``. For an SVC
+  without ``probability=True`` it is the same margin-sigmoid risk that
+  ``tabular_engine`` reports.
+* trees and forests are flattened into node arrays (feature, threshold,
+  left, right, class distribution) and traversed for all rows at once: one
+  vectorised step per tree level, with every tree of a forest advancing
+  together and rows dropping out as they reach a leaf. A few rows (a single
+  form submission) are walked node by node instead. Inputs are compared in
+  float32, as scikit-learn does, so the leaves reached are identical.
+"""
+from typing import List, Union
+
+import numpy as np
+
+SCORERS = ("linear", "trees")
+# Up to this many rows, trees are walked node by node in Python: a handful of list
+# lookups per level beats several NumPy dispatches per level for a single record
+SCALAR_ROWS = 8
+
+
+# ----------------------------
+# Export
+# ----------------------------
+def _tree_arrays(tree) -> dict:
+    value = tree.value[:, 0, :].astype(np.float64)
+    return {
+        "feature": tree.feature.astype(np.int32),
+        "threshold": tree.threshold.astype(np.float64),
+        "left": tree.children_left.astype(np.int32),
+        "right": tree.children_right.astype(np.int32),
+        # Counts (scikit-learn < 1.4) and fractions (>= 1.4) both normalise to the leaf distribution
+        "value": value / np.maximum(value.sum(axis=1, keepdims=True), np.finfo(np.float64).tiny),
+        "depth": np.int32(tree.max_depth),
+    }
+
+
+def sklearn_arrays(model) -> dict:
+    """The arrays describing a fitted binary classifier, keyed as ``from_arrays`` expects"""
+    classes = np.asarray(model.classes_)
+    if len(classes) != 2:
+        raise ValueError(f"Only binary classifiers can be exported, got classes {classes.tolist()}")
+    arrays = {"classes": classes.astype(np.int64)}
+    if hasattr(model, "tree_"):
+        trees = [model.tree_]
+    elif hasattr(model, "estimators_"):
+        trees = [estimator.tree_ for estimator in model.estimators_]
+    elif getattr(model, "kernel", "linear") == "linear" and hasattr(model, "coef_"):
+        arrays["scorer"] = np.array("linear")
+        arrays["coef"] = np.asarray(model.coef_, dtype=np.float64).ravel()
+        arrays["intercept"] = np.asarray(model.intercept_, dtype=np.float64).ravel()[:1]
+        return arrays
+    else:
+        raise ValueError(f"Unsupported estimator for NumPy export: {type(model).__name__}")
+
+    # Concatenate every tree's nodes; child indices are shifted to the combined array
+    parts = [_tree_arrays(tree) for tree in trees]
+    offsets = np.cumsum([0] + [len(p["feature"]) for p in parts[:-1]]).astype(np.int32)
+    for part, offset in zip(parts, offsets):
+        for side in ("left", "right"):
+            part[side] = np.where(part[side] >= 0, part[side] + offset, -1).astype(np.int32)
+    arrays["scorer"] = np.array("trees")
+    for name in ("feature", "threshold", "left", "right", "value"):
+        arrays[name] = np.concatenate([p[name] for p in parts])
+    arrays["roots"] = offsets
+    arrays["depth"] = np.int32(max(p["depth"] for p in parts))
+    return arrays
+
+
+# ----------------------------
+# Inference
+# ----------------------------
+class LinearScorer:
+    """``sigmoid(X @ coef + intercept)`` as a two-column probability matrix"""
+
+    def __init__(self, coef: np.ndarray, intercept: np.ndarray, feature_names: List[str]):
+        self.coef = coef
+        self.intercept = intercept
+        self.feature_names = feature_names
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        margin = np.atleast_2d(np.asarray(X, dtype=np.float64)) @ self.coef + self.intercept[0]
+        positive = 1.0 / (1.0 + np.exp(-margin))
+        return np.column_stack([1.0 - positive, positive])
+
+    @property
+    def nbytes(self) -> int:
+        return self.coef.nbytes + self.intercept.nbytes
+
+
+class TreeScorer:
+    """Level-synchronous traversal of one or more flattened decision trees, averaged like a forest"""
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, left: np.ndarray, right: np.ndarray,
+                 value: np.ndarray, roots: np.ndarray, depth: int, feature_names: List[str]):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.depth = int(depth)
+        self.feature_names = feature_names
+        # Index arrays in the platform's native index type (no conversion on every gather);
+        # leaves get split feature 0 so gathers stay in bounds
+        self._left, self._right, self._roots = (a.astype(np.intp) for a in (left, right, roots))
+        self._feature = np.where(left >= 0, feature, 0).astype(np.intp)
+        self._nodes = (feature.tolist(), threshold.tolist(), left.tolist(), right.tolist(), roots.tolist())
+
+    def leaves(self, X: np.ndarray) -> np.ndarray:
+        """Leaf node index reached by every row in every tree, shape ``(n_trees, n_rows)``"""
+        X = np.ascontiguousarray(np.atleast_2d(np.asarray(X, dtype=np.float32)))
+        if len(X) <= SCALAR_ROWS:
+            return self._leaves_scalar(X)
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        # One (tree, row) walk per position; walks that reach a leaf are recorded and dropped
+        position = np.arange(len(self.roots) * n_rows)
+        node = np.repeat(self._roots, n_rows)
+        offset = np.tile(np.arange(n_rows, dtype=np.intp) * n_features, len(self.roots))
+        leaves = np.empty(position.size, dtype=np.intp)
+        while position.size:
+            left = self._left[node]
+            at_leaf = left < 0
+            if at_leaf.any():
+                leaves[position[at_leaf]] = node[at_leaf]
+                keep = ~at_leaf
+                position, node, offset, left = position[keep], node[keep], offset[keep], left[keep]
+            go_right = flat[offset + self._feature[node]] > self.threshold[node]
+            node = np.where(go_right, self._right[node], left)
+        return leaves.reshape(len(self.roots), n_rows)
+
+    def _leaves_scalar(self, X: np.ndarray) -> np.ndarray:
+        feature, threshold, left, right, roots = self._nodes
+        leaves = np.empty((len(roots), len(X)), dtype=np.intp)
+        for r, row in enumerate(X.tolist()):
+            for t, node in enumerate(roots):
+                while left[node] >= 0:
+                    node = left[node] if row[feature[node]] <= threshold[node] else right[node]
+                leaves[t, r] = node
+        return leaves
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.value[self.leaves(X)].mean(axis=0)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (self.feature, self.threshold, self.left, self.right, self.value, self.roots))
+
+
+def from_arrays(arrays) -> Union[LinearScorer, TreeScorer]:
+    """Build the scorer described by a mapping of ``sklearn_arrays`` output plus ``feature_names``"""
+    scorer = str(arrays["scorer"])
+    names = [str(n) for n in arrays["feature_names"]] if "feature_names" in arrays else []
+    if scorer == "linear":
+        return LinearScorer(arrays["coef"], arrays["intercept"], names)
+    if scorer == "trees":
+        return TreeScorer(arrays["feature"], arrays["threshold"], arrays["left"], arrays["right"],
+                          arrays["value"], arrays["roots"], int(arrays["depth"]), names)
+    raise ValueError(f"Unknown scorer '{scorer}'. Available: {SCORERS}")
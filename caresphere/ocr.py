@@ -0,0 +1,230 @@
+"""OCR engines used by the prescription scanner.
+
+The EasyOCR reader loads PyTorch detection and recognition networks (several
+hundred MB), so it lives in the shared model pool as ``ocr/easyocr``: one
+reader per worker, accounted for and evictable under a memory budget.
+
+``run_engines`` runs every engine on the same image concurrently, so a scan
+takes as long as the slowest engine rather than the sum of all four:
+
+* each Tesseract pass (PSM 6, 8 and 13) is a ``tesseract`` subprocess, driven
+  from a thread pool; its timeout kills the subprocess.
+* EasyOCR runs on a dedicated single worker thread, which also serialises
+  concurrent sessions on the one pooled reader. A PyTorch call cannot be
+  interrupted, so an EasyOCR timeout abandons the result rather than the work.
+
+Every run is reported through ``caresphere.metrics.emit`` as ``ocr.run``,
+with the wall time and each engine's own time.
+
+Scans stay in memory: ``decode_image`` turns the upload into one BGR array,
+which enhancement and every engine share. EasyOCR takes the array directly;
+Tesseract is fed an uncompressed PNM copy on stdin instead of a temporary
+file. Nothing is written to disk unless ``CARESPHERE_OCR_SAVE_DIR`` is set,
+in which case ``save_image`` keeps lossless PNG copies there for debugging,
+each prefixed with its scan's ``scan_id``.
+"""
+import os
+import shlex
+import subprocess
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from caresphere.lazy import lazy_import
+from caresphere.metrics import emit
+from caresphere.model_pool import POOL
+
+cv2 = lazy_import("cv2")
+easyocr = lazy_import("easyocr")
+pytesseract = lazy_import("pytesseract")
+
+EASYOCR_LANGUAGES = ["en"]
+SAVE_DIR = os.getenv("CARESPHERE_OCR_SAVE_DIR")
+
+
+def _load_easyocr():
+    return easyocr.Reader(EASYOCR_LANGUAGES)
+
+
+POOL.register("ocr/easyocr", _load_easyocr, heavy=True)
+
+
+def get_easyocr_reader():
+    """The process-wide EasyOCR reader, built on first use"""
+    return POOL.get("ocr/easyocr")
+
+
+# ----------------------------
+# In-memory Images
+# ----------------------------
+def decode_image(data: bytes) -> np.ndarray:
+    """Decode an uploaded JPEG/PNG once into a BGR uint8 array"""
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("The upload is not a readable JPEG or PNG image")
+    return image
+
+
+def scan_id() -> str:
+    """A timestamped name unique to one scan, so sessions never overwrite each other's saved copies"""
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:12]}"
+
+
+def save_image(image: np.ndarray, name: str, directory: Optional[Union[str, Path]] = None) -> Optional[Path]:
+    """Write ``image`` as ``<directory>/<name>.png`` if a directory is given or configured; otherwise do nothing"""
+    directory = directory or SAVE_DIR
+    if not directory:
+        return None
+    path = Path(directory) / f"{name}.png"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cv2.imwrite(str(path), image)
+    return path
+
+
+# ----------------------------
+# Engines
+# ----------------------------
+EASYOCR = "EasyOCR"
+# Engine name -> Tesseract config, in the order results are reported
+TESSERACT_CONFIGS = {
+    "Tesseract PSM-6": "--psm 6 -c tessedit_char_whitelist="
+                       "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789 ",
+    "Tesseract PSM-8": "--psm 8",
+    "Tesseract PSM-13": "--psm 13",
+}
+# Seconds; EasyOCR's budget includes building the reader on a cold worker
+TIMEOUTS = {EASYOCR: 120.0, **{name: 30.0 for name in TESSERACT_CONFIGS}}
+# Seconds between checks for a queued engine having started (and its timeout with it)
+QUEUE_POLL = 0.05
+
+
+def _easyocr_text(image, timeout: float) -> str:
+    return " ".join(get_easyocr_reader().readtext(image, detail=0)).strip()
+
+
+def _tesseract_stdin(image: np.ndarray, config: str, timeout: float) -> str:
+    # PNM is a header plus the raw pixels: no compression cost and no temporary file
+    ok, encoded = cv2.imencode(".pnm", image)
+    if not ok:
+        raise ValueError("Could not encode the image for Tesseract")
+    command = [pytesseract.pytesseract.tesseract_cmd, "stdin", "stdout", *shlex.split(config)]
+    try:
+        proc = subprocess.run(command, input=encoded.tobytes(), capture_output=True, timeout=timeout or None)
+    except subprocess.TimeoutExpired:
+        raise RuntimeError("Tesseract process timeout") from None
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.decode(errors="replace").strip() or f"tesseract exited with {proc.returncode}")
+    return proc.stdout.decode("utf-8", errors="replace").strip()
+
+
+def _tesseract(config: str) -> Callable:
+    def run(image, timeout: float) -> str:
+        if isinstance(image, np.ndarray):
+            return _tesseract_stdin(image, config, timeout)
+        return pytesseract.image_to_string(str(image), config=config, timeout=timeout).strip()
+    return run
+
+
+# Engine name -> fn(image, timeout) -> text; image is a decoded array or a path
+ENGINES: Dict[str, Callable] = {
+    EASYOCR: _easyocr_text,
+    **{name: _tesseract(config) for name, config in TESSERACT_CONFIGS.items()},
+}
+DEFAULT_ENGINES = tuple(ENGINES)
+
+
+@dataclass
+class OcrResult:
+    """One engine's output; ``error`` is set instead of ``text`` when it failed or timed out"""
+    engine: str
+    text: str = ""
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# ----------------------------
+# Concurrent Execution
+# ----------------------------
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def _executor(engine: str) -> ThreadPoolExecutor:
+    # EasyOCR gets one thread of its own; the Tesseract subprocesses share a pool
+    kind = "easyocr" if engine == EASYOCR else "tesseract"
+    with _executors_lock:
+        if kind not in _executors:
+            workers = 1 if kind == "easyocr" else 2 * len(TESSERACT_CONFIGS)
+            _executors[kind] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"ocr-{kind}")
+        return _executors[kind]
+
+
+def _timed(engine: str, image, timeout: float, started: Dict[str, float]) -> OcrResult:
+    start = started[engine] = time.perf_counter()
+    try:
+        text = ENGINES[engine](image, timeout)
+    except Exception as e:
+        return OcrResult(engine, seconds=time.perf_counter() - start, error=str(e) or type(e).__name__)
+    return OcrResult(engine, text, time.perf_counter() - start)
+
+
+def iter_engines(image, engines: Sequence[str] = DEFAULT_ENGINES,
+                 timeouts: Optional[Dict[str, float]] = None) -> Iterator[OcrResult]:
+    """Run ``engines`` on ``image`` concurrently and yield each result as it completes.
+
+    An engine still running ``timeouts[engine]`` seconds after it started is
+    yielded as an error; the remaining engines are not held up by it. Time
+    spent queued behind other sessions' scans does not count.
+    """
+    timeouts = {**TIMEOUTS, **(timeouts or {})}
+    unknown = [e for e in engines if e not in ENGINES]
+    if unknown:
+        raise KeyError(f"Unknown OCR engine(s) {unknown}. Available: {list(ENGINES)}")
+    # Engine -> perf_counter() when its worker picked it up
+    started: Dict[str, float] = {}
+    futures = {_executor(e).submit(_timed, e, image, timeouts[e], started): e for e in engines}
+    pending = set(futures)
+    while pending:
+        # Wake on the next completion or the nearest deadline; poll while an engine is still queued
+        deadlines = [started[futures[f]] + timeouts[futures[f]] for f in pending if futures[f] in started]
+        wake = min(deadlines, default=float("inf")) - time.perf_counter()
+        if any(futures[f] not in started for f in pending):
+            wake = min(wake, QUEUE_POLL)
+        done, _ = wait(pending, timeout=max(0.0, wake), return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+        pending -= done
+        now = time.perf_counter()
+        for future in [f for f in pending if futures[f] in started]:
+            engine = futures[future]
+            if now < started[engine] + timeouts[engine]:
+                continue
+            # Tesseract kills its own subprocess at the timeout; this catches anything that still hangs
+            pending.discard(future)
+            yield OcrResult(engine, seconds=now - started[engine], error=f"timed out after {timeouts[engine]:g} s")
+
+
+def _metric_name(engine: str) -> str:
+    # "Tesseract PSM-6" -> "tesseract_psm6_ms"
+    return engine.lower().replace(" ", "_").replace("-", "") + "_ms"
+
+
+def run_engines(image, engines: Sequence[str] = DEFAULT_ENGINES,
+                timeouts: Optional[Dict[str, float]] = None) -> List[OcrResult]:
+    """Every engine's result, in ``engines`` order, after running them all concurrently"""
+    start = time.perf_counter()
+    results = {r.engine: r for r in iter_engines(image, engines, timeouts)}
+    total = time.perf_counter() - start
+    emit("ocr.run", {"total_ms": total * 1000, "engines": len(engines),
+                     **{_metric_name(r.engine): r.seconds * 1000 for r in results.values()}})
+    return [results[e] for e in engines]
@@ -0,0 +1,199 @@
+"""Combined diabetes / heart-attack / lung-cancer risk profiles for batches of patients.
+
+Usage: python -m caresphere.risk_profile registry.csv profiles.csv [--chunk-size 50000] [--keep Id]
+
+A patient record is one flat mapping of fields. Each field is routed to every
+model that uses it: training column names match ignoring case, so ``age``,
+``gender`` and ``glucose`` feed all the models that have them, and
+``PATIENT_FIELDS`` adds readable aliases for columns whose names differ
+between the notebooks (``diastolic_bp`` is the diabetes ``BloodPressure`` and
+the heart ``pressurelow``). The whole batch is encoded column-wise and each
+model runs once over all patients with the fields it needs. A model that
+lacks fields for a patient reports why instead of failing the batch.
+
+Glucose is shared as given: the diabetes dataset recorded a 2-hour plasma
+glucose and the heart-attack dataset a blood sugar reading, both in mg/dL.
+"""
+import io
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from caresphere import bulk_scoring, tabular_engine
+from caresphere.lazy import lazy_import
+from caresphere.metrics import emit
+
+pd = lazy_import("pandas")
+
+# Patient field -> {model key: training column} for columns not already shared by name
+PATIENT_FIELDS: Dict[str, Dict[str, str]] = {
+    "diastolic_bp": {"diabetes": "BloodPressure", "heart": "pressurelow"},
+    "systolic_bp": {"heart": "pressurehight"},
+    "heart_rate": {"heart": "impluse"},
+    "ck_mb": {"heart": "kcm"},
+    "pedigree": {"diabetes": "DiabetesPedigreeFunction"},
+}
+
+
+@dataclass
+class RiskProfile:
+    """Every model's verdict for one patient; a model that could not score it has an error instead"""
+    risks: Dict[str, Optional[float]] = field(default_factory=dict)
+    labels: Dict[str, Optional[str]] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def highest(self) -> Optional[str]:
+        """The model with the highest risk, or ``None`` if no model could score the patient"""
+        scored = {key: risk for key, risk in self.risks.items() if risk is not None}
+        return max(scored, key=scored.get) if scored else None
+
+    def to_dict(self) -> Dict:
+        return {"risks": self.risks, "labels": self.labels, "errors": self.errors, "highest": self.highest}
+
+
+# ----------------------------
+# Field Mapping
+# ----------------------------
+def _normalise(name) -> str:
+    return str(name).strip().lower()
+
+
+def model_columns(key: str, columns: Sequence[str]) -> Dict[str, List[str]]:
+    """Training column -> every input column that can supply it, for model ``key``"""
+    mapping = {}
+    for feature in tabular_engine.get_spec(key).features:
+        names = {_normalise(feature.name)} | {alias for alias, targets in PATIENT_FIELDS.items()
+                                              if targets.get(key) == feature.name}
+        mapping[feature.name] = [c for c in columns if _normalise(c) in names]
+    return mapping
+
+
+def _coalesce(frame, columns: List[str]):
+    # Records may spell a field differently ("age" / "Age" / an alias); take the first value given
+    if len(columns) == 1:
+        return frame[columns[0]]
+    return frame[columns].bfill(axis=1).iloc[:, 0]
+
+
+def score_frame(frame, models: Optional[Sequence[str]] = None,
+                backend: str = tabular_engine.DEFAULT_BACKEND):
+    """Score every patient row of ``frame`` with every model: ``<key>_risk``, ``_label`` and ``_error`` columns"""
+    models = list(models or tabular_engine.TABULAR_MODELS)
+    scored = pd.DataFrame(index=frame.index)
+    for key in models:
+        spec = tabular_engine.get_spec(key)
+        mapping = model_columns(key, frame.columns)
+        missing = [name.strip() for name, columns in mapping.items() if not columns]
+        if missing:
+            risk = np.full(len(frame), np.nan)
+            labels = np.full(len(frame), "", dtype=object)
+            errors = np.full(len(frame), "missing " + ", ".join(missing), dtype=object)
+        else:
+            inputs = pd.DataFrame({name: _coalesce(frame, columns) for name, columns in mapping.items()})
+            model = tabular_engine.get_model(key, backend)
+            labels, risk, errors = bulk_scoring.score_chunk(spec, model, inputs, spec.feature_names)
+        scored[f"{key}_risk"] = np.round(risk, 6)
+        scored[f"{key}_label"] = labels
+        scored[f"{key}_error"] = errors
+    return scored
+
+
+def score_patients(records: Union[Mapping, Sequence[Mapping]], models: Optional[Sequence[str]] = None,
+                   backend: str = tabular_engine.DEFAULT_BACKEND) -> List[RiskProfile]:
+    """One ``RiskProfile`` per record, with each model run once over the whole batch"""
+    if isinstance(records, Mapping):
+        records = [records]
+    records = list(records)
+    models = list(models or tabular_engine.TABULAR_MODELS)
+    # An explicit index keeps a row for every record, even one with no fields at all
+    frame = pd.DataFrame.from_records(records, index=range(len(records)))
+    scored = score_frame(frame, models, backend)
+    profiles = []
+    for row in scored.itertuples(index=False, name=None):
+        profile = RiskProfile()
+        for i, key in enumerate(models):
+            risk, label, error = row[3 * i], row[3 * i + 1], row[3 * i + 2]
+            profile.risks[key] = None if np.isnan(risk) else float(risk)
+            profile.labels[key] = label or None
+            if error:
+                profile.errors[key] = error
+        profiles.append(profile)
+    return profiles
+
+
+# ----------------------------
+# Registry Scoring
+# ----------------------------
+def iter_profile_chunks(source, chunk_size: int = bulk_scoring.CHUNK_SIZE, keep: Sequence[str] = (),
+                        models: Optional[Sequence[str]] = None,
+                        backend: str = tabular_engine.DEFAULT_BACKEND) -> Iterator:
+    """Yield one scored DataFrame per chunk of a patient CSV (``row``, kept columns, every model's columns)"""
+    offset = 0
+    kept_names = {_normalise(k) for k in keep}
+    for chunk in pd.read_csv(source, chunksize=chunk_size):
+        scored = score_frame(chunk, models, backend)
+        scored.insert(0, "row", np.arange(offset, offset + len(chunk)))
+        for i, column in enumerate(c for c in chunk.columns if _normalise(c) in kept_names):
+            scored.insert(1 + i, column, chunk[column].to_numpy())
+        offset += len(chunk)
+        yield scored
+
+
+def score_registry(source, output: Union[str, Path, io.IOBase], chunk_size: int = bulk_scoring.CHUNK_SIZE,
+                   keep: Sequence[str] = (), models: Optional[Sequence[str]] = None,
+                   backend: str = tabular_engine.DEFAULT_BACKEND, progress=None) -> Dict[str, bulk_scoring.BulkSummary]:
+    """Score a whole patient CSV with every model in one pass; returns a summary per model"""
+    models = list(models or tabular_engine.TABULAR_MODELS)
+    summaries = {key: bulk_scoring.BulkSummary(key) for key in models}
+    for key in models:
+        tabular_engine.get_model(key, backend)
+    start = time.perf_counter()
+    fh = open(output, "w", newline="", encoding="utf-8") if isinstance(output, (str, Path)) else output
+    try:
+        for i, scored in enumerate(iter_profile_chunks(source, chunk_size, keep, models, backend)):
+            scored.to_csv(fh, header=i == 0, index=False)
+            elapsed = time.perf_counter() - start
+            for key, summary in summaries.items():
+                risk = scored[f"{key}_risk"].to_numpy()
+                summary.rows += len(scored)
+                summary.scored += int((~np.isnan(risk)).sum())
+                summary.invalid += int(np.isnan(risk).sum())
+                summary.positive += int((risk >= 0.5).sum())
+                summary.chunks += 1
+                summary.seconds = elapsed
+            if progress is not None:
+                progress(summaries)
+    finally:
+        if fh is not output:
+            fh.close()
+    elapsed = time.perf_counter() - start
+    for summary in summaries.values():
+        summary.seconds = elapsed
+    rows = next(iter(summaries.values())).rows if summaries else 0
+    emit("tabular.risk_profile", {"rows": rows, "models": len(models), "total_ms": elapsed * 1000,
+                                  "rows_per_second": rows / elapsed if elapsed else 0.0})
+    return summaries
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import sys
+
+    parser = argparse.ArgumentParser(description="Score a patient CSV with every tabular disease model in one pass")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--chunk-size", type=int, default=bulk_scoring.CHUNK_SIZE)
+    parser.add_argument("--keep", nargs="*", default=[], help="input columns copied to the output (e.g. an ID)")
+    parser.add_argument("--models", nargs="+", choices=sorted(tabular_engine.TABULAR_MODELS))
+    parser.add_argument("--backend", choices=sorted(tabular_engine.BACKENDS), default=tabular_engine.DEFAULT_BACKEND)
+    args = parser.parse_args()
+
+    results = score_registry(args.input, args.output, args.chunk_size, args.keep, args.models, args.backend,
+                             progress=lambda s: print(f"{next(iter(s.values())).rows} rows", file=sys.stderr))
+    for summary in results.values():
+        print(json.dumps(summary.to_dict()))
@@ -0,0 +1,186 @@
+"""Headless HTTP inference service for the audio classifiers and tabular risk models.
+
+Usage: python -m caresphere.server [--host 0.0.0.0] [--port 8600] [--backend numpy]
+
+Serves the shared ``audio_engine`` without any Streamlit page code, so
+inference can be scaled and load balanced separately from the UI. Built on
+Starlette + uvicorn, which Streamlit already depends on.
+
+    POST /v1/heartbeat, /v1/respiratory
+        audio bytes (any non-JSON content type)  -> one prediction
+        {"features": [40 floats] | [[40 floats], ...]} -> one prediction per row
+        optional ?backend=numpy|keras
+    POST /v1/risk-profile
+        {"patients": [{field: value, ...}, ...], "models": [...] optional}
+        -> one diabetes / heart-attack / lung-cancer profile per patient
+    GET  /v1/models   registered models, classes and weight versions
+    GET  /healthz     liveness
+
+Models are loaded at startup and stay warm for the life of the process.
+Per-request forward passes go through ``audio_engine.predict_shared``, so
+concurrent requests are micro-batched on the backends configured for it.
+Handlers are async; decoding and the forward pass run in the thread pool so
+the event loop keeps accepting requests while a recording is being decoded.
+"""
+import contextlib
+import json
+from typing import List
+
+import numpy as np
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from caresphere import audio_engine, risk_profile, tabular_engine
+
+DEFAULT_PORT = 8600
+
+
+class BadRequest(ValueError):
+    """Client error reported as HTTP 400"""
+
+
+def _predict_audio(key: str, data: bytes, backend: str) -> List[dict]:
+    return [audio_engine.analyze(key, data, backend=backend).to_dict()]
+
+
+def _predict_features(key: str, rows, backend: str) -> List[dict]:
+    try:
+        features = np.asarray(rows, dtype=np.float32)
+    except (TypeError, ValueError):
+        raise BadRequest("'features' must be a list of numbers or a list of such lists")
+    if features.ndim == 1:
+        features = features[None]
+    if features.ndim != 2 or features.shape[1] != audio_engine.N_MFCC or len(features) == 0:
+        raise BadRequest(f"'features' must have shape ({audio_engine.N_MFCC},) or (n, {audio_engine.N_MFCC})")
+    if not np.isfinite(features).all():
+        raise BadRequest("'features' must be finite numbers (no null, NaN or Infinity)")
+    probabilities = audio_engine.predict_shared(key, features, backend)
+    return [audio_engine.build_prediction(key, p, f).to_dict() for p, f in zip(probabilities, features)]
+
+
+# ----------------------------
+# Handlers
+# ----------------------------
+async def predict(request: Request) -> JSONResponse:
+    key = request.path_params["model"]
+    if key not in audio_engine.AUDIO_MODELS:
+        return JSONResponse({"error": f"Unknown model '{key}'"}, status_code=404)
+    backend = request.query_params.get("backend", request.app.state.backend)
+    if backend not in audio_engine.BACKENDS:
+        return JSONResponse({"error": f"Unknown backend '{backend}'"}, status_code=400)
+
+    body = await request.body()
+    if not body:
+        return JSONResponse({"error": "Empty request body"}, status_code=400)
+    try:
+        if request.headers.get("content-type", "").startswith("application/json"):
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                raise BadRequest("Body is not valid JSON")
+            if not isinstance(payload, dict) or "features" not in payload:
+                raise BadRequest("JSON body must contain 'features'")
+            predictions = await run_in_threadpool(_predict_features, key, payload["features"], backend)
+        else:
+            predictions = await run_in_threadpool(_predict_audio, key, body, backend)
+    except BadRequest as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    except audio_engine.AudioDecodeError as e:
+        # Undecodable audio is the client's problem; anything else is a server fault (500)
+        return JSONResponse({"error": str(e)}, status_code=422)
+
+    return JSONResponse({
+        "model": key,
+        "backend": backend,
+        "feature_version": audio_engine.FEATURE_VERSION,
+        "predictions": predictions,
+    })
+
+
+def _risk_profiles(payload, backend: str) -> List[dict]:
+    if not isinstance(payload, dict) or not isinstance(payload.get("patients"), list) or not payload["patients"]:
+        raise BadRequest("JSON body must contain a non-empty 'patients' list")
+    if not all(isinstance(p, dict) for p in payload["patients"]):
+        raise BadRequest("Every patient must be a JSON object of fields")
+    models = payload.get("models") or None
+    if models is not None and not (isinstance(models, list) and all(isinstance(m, str) for m in models)):
+        raise BadRequest("'models' must be a list of model names")
+    unknown = [m for m in models or () if m not in tabular_engine.TABULAR_MODELS]
+    if unknown:
+        raise BadRequest(f"Unknown model(s): {', '.join(map(str, unknown))}")
+    return [p.to_dict() for p in risk_profile.score_patients(payload["patients"], models, backend)]
+
+
+async def profile(request: Request) -> JSONResponse:
+    backend = request.query_params.get("backend", tabular_engine.DEFAULT_BACKEND)
+    if backend not in tabular_engine.BACKENDS:
+        return JSONResponse({"error": f"Unknown backend '{backend}'"}, status_code=400)
+    try:
+        payload = json.loads(await request.body())
+    except ValueError:
+        return JSONResponse({"error": "Body is not valid JSON"}, status_code=400)
+    try:
+        profiles = await run_in_threadpool(_risk_profiles, payload, backend)
+    except BadRequest as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return JSONResponse({"backend": backend, "profiles": profiles})
+
+
+async def models(request: Request) -> JSONResponse:
+    return JSONResponse({
+        key: {
+            "version": spec.version,
+            "classes": [c['name'] for c in spec.conditions.values()],
+            "n_mfcc": audio_engine.N_MFCC,
+        }
+        for key, spec in audio_engine.AUDIO_MODELS.items()
+    })
+
+
+async def healthz(request: Request) -> JSONResponse:
+    return JSONResponse({"status": "ok", "backend": request.app.state.backend})
+
+
+# ----------------------------
+# Application
+# ----------------------------
+def create_app(backend: str = audio_engine.DEFAULT_BACKEND, warm: bool = True) -> Starlette:
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        if warm:
+            # Load every model and run one forward pass before accepting traffic
+            for key in audio_engine.AUDIO_MODELS:
+                await run_in_threadpool(audio_engine.predict_features, key,
+                                        np.zeros((1, audio_engine.N_MFCC), dtype=np.float32), backend)
+            for key in tabular_engine.TABULAR_MODELS:
+                await run_in_threadpool(tabular_engine.get_model, key)
+        yield
+
+    app = Starlette(
+        routes=[
+            Route("/v1/models", models, methods=["GET"]),
+            Route("/v1/risk-profile", profile, methods=["POST"]),
+            Route("/v1/{model}", predict, methods=["POST"]),
+            Route("/healthz", healthz, methods=["GET"]),
+        ],
+        lifespan=lifespan,
+    )
+    app.state.backend = backend
+    return app
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Headless audio inference server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--backend", choices=sorted(audio_engine.BACKENDS), default=audio_engine.DEFAULT_BACKEND)
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(args.backend), host=args.host, port=args.port)
@@ -0,0 +1,285 @@
+"""Sliding-window classification over whole recordings.
+
+The single-recording path scores seconds 0.5-3.5 and ignores the rest. This
+module walks the entire recording in overlapping fixed-length windows through
+a chain of generators:
+
+    AudioStream (native-rate chunks) -> sliding_windows -> window batches
+    -> batched MFCC + one predict call per batch -> WindowPrediction
+
+Only one chunk, one window buffer and one batch of windows are alive at any
+time, so audio memory stays constant however long the upload is. Each window
+is resampled on its own, exactly like the 3-second window of the single path,
+so a window at 0.5 s gives the same features as ``audio_engine.analyze``.
+"""
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from caresphere import audio_engine
+from caresphere.lazy import lazy_import
+
+librosa = lazy_import("librosa")
+soundfile = lazy_import("soundfile")
+
+WINDOW_SECONDS = audio_engine.DURATION
+HOP_SECONDS = 1.5
+BATCH_SIZE = 32
+CHUNK_SECONDS = 1.0
+
+
+# ----------------------------
+# Incremental Decoding
+# ----------------------------
+class AudioStream:
+    """A recording as mono float32 chunks at its native sample rate, read lazily.
+
+    libsndfile formats are read block by block. Other formats are piped through
+    ffmpeg when it is installed (still bounded), otherwise decoded in one go by
+    librosa as a last resort. ``duration`` is ``None`` when it is not known up front.
+    """
+
+    def __init__(self, source: audio_engine.AudioSource, chunk_seconds: float = CHUNK_SECONDS):
+        self.source = source
+        self.chunk_seconds = chunk_seconds
+        self.duration: Optional[float] = None
+        try:
+            info = soundfile.info(audio_engine._as_source(source))
+            self.kind, self.sr = "soundfile", info.samplerate
+            self.duration = info.frames / info.samplerate
+        except soundfile.SoundFileRuntimeError:
+            self.kind = "ffmpeg" if shutil.which("ffmpeg") else "librosa"
+            self.sr = audio_engine.SAMPLE_RATE if self.kind == "ffmpeg" else None
+
+    def _soundfile_chunks(self) -> Iterator[np.ndarray]:
+        with soundfile.SoundFile(audio_engine._as_source(self.source)) as f:
+            blocksize = int(self.chunk_seconds * f.samplerate)
+            for block in f.blocks(blocksize=blocksize, dtype="float32", always_2d=True):
+                yield block[:, 0] if block.shape[1] == 1 else block.mean(axis=1)
+
+    def _ffmpeg_chunks(self) -> Iterator[np.ndarray]:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self.source
+            if not isinstance(path, (str, Path)):
+                path = Path(tmp) / "upload"
+                path.write_bytes(audio_engine.read_bytes(self.source))
+            cmd = ["ffmpeg", "-nostdin", "-v", "error", "-i", str(path),
+                   "-ac", "1", "-ar", str(self.sr), "-f", "f32le", "-"]
+            chunk_bytes = int(self.chunk_seconds * self.sr) * 4
+            with subprocess.Popen(cmd, stdout=subprocess.PIPE) as proc:
+                while True:
+                    data = proc.stdout.read(chunk_bytes)
+                    if not data:
+                        break
+                    # A short read can split a sample; ffmpeg always writes whole ones in the end
+                    data = data[: len(data) - len(data) % 4]
+                    yield np.frombuffer(data, dtype=np.float32)
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        if self.kind == "soundfile":
+            return self._soundfile_chunks()
+        if self.kind == "ffmpeg":
+            return self._ffmpeg_chunks()
+        y, self.sr = librosa.load(audio_engine._as_source(self.source), sr=None)
+        self.duration = len(y) / self.sr
+        step = int(self.chunk_seconds * self.sr)
+        return (y[i:i + step] for i in range(0, len(y), step))
+
+
+def sliding_windows(chunks: Iterable[np.ndarray], size: int, hop: int) -> Iterator[Tuple[int, np.ndarray]]:
+    """``(start_sample, window)`` pairs of ``size`` samples every ``hop`` samples.
+
+    A recording shorter than one window yields a single short window. At most
+    one hop of trailing audio is not covered by a full window.
+    """
+    buffer = np.empty(0, dtype=np.float32)
+    start = 0
+    # Samples of a hop larger than the buffer that still have to be dropped from later chunks
+    skip = 0
+    emitted = False
+    for chunk in chunks:
+        if skip:
+            dropped = min(skip, len(chunk))
+            chunk = chunk[dropped:]
+            skip -= dropped
+        buffer = np.concatenate([buffer, chunk])
+        while len(buffer) >= size:
+            yield start, buffer[:size]
+            skip = max(0, hop - len(buffer))
+            buffer = buffer[hop:]
+            start += hop
+            emitted = True
+    if not emitted and len(buffer):
+        yield start, buffer
+
+
+def _batched(items: Iterable, size: int) -> Iterator[list]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ----------------------------
+# Results
+# ----------------------------
+@dataclass
+class WindowPrediction:
+    """Classification of one window; ``start``/``end`` are seconds into the recording"""
+    start: float
+    end: float
+    prediction: audio_engine.AudioPrediction
+
+    def to_row(self) -> Dict:
+        return {"Start (s)": round(self.start, 2), "End (s)": round(self.end, 2), **self.prediction.to_row()}
+
+
+@dataclass
+class StreamingAnalysis:
+    """Per-window timeline plus the verdict aggregated over all windows.
+
+    The verdict is a soft vote: the mean of the window probabilities, which is
+    kept as a running sum so it can be read at any point while streaming.
+    """
+    model: str
+    windows: List[WindowPrediction] = field(default_factory=list)
+    _total: Optional[np.ndarray] = field(default=None, repr=False)
+
+    def add(self, window: WindowPrediction) -> None:
+        self.windows.append(window)
+        probabilities = window.prediction.probabilities.astype(np.float64)
+        self._total = probabilities if self._total is None else self._total + probabilities
+
+    @property
+    def probabilities(self) -> np.ndarray:
+        if self._total is None:
+            raise ValueError("No windows have been analysed")
+        return (self._total / len(self.windows)).astype(np.float32)
+
+    @property
+    def verdict(self) -> audio_engine.AudioPrediction:
+        features = np.mean([w.prediction.features for w in self.windows], axis=0)
+        return audio_engine.build_prediction(self.model, self.probabilities, features)
+
+    @property
+    def duration(self) -> float:
+        return self.windows[-1].end if self.windows else 0.0
+
+    def label_counts(self) -> Dict[str, int]:
+        """Number of windows won by each condition"""
+        counts = {c['name']: 0 for c in audio_engine.get_spec(self.model).conditions.values()}
+        for window in self.windows:
+            counts[window.prediction.name] += 1
+        return counts
+
+    def abnormal_fraction(self) -> float:
+        return sum(not w.prediction.is_normal for w in self.windows) / max(1, len(self.windows))
+
+    def timeline(self) -> List[Dict]:
+        return [window.to_row() for window in self.windows]
+
+    def segments(self) -> List[Dict]:
+        """Runs of consecutive windows with the same label, as non-overlapping time spans.
+
+        Each window owns the audio from its start to the next window's start
+        (the last one to its end), so overlapping windows never double count.
+        """
+        segments = []
+        for i, window in enumerate(self.windows):
+            end = self.windows[i + 1].start if i + 1 < len(self.windows) else window.end
+            if segments and segments[-1]["Condition"] == window.prediction.name:
+                segment = segments[-1]
+                segment["End (s)"] = round(end, 2)
+                segment["Windows"] += 1
+                segment["_confidence"] += window.prediction.confidence
+            else:
+                segments.append({
+                    "Start (s)": round(window.start, 2),
+                    "End (s)": round(end, 2),
+                    "Condition": window.prediction.name,
+                    "Windows": 1,
+                    "_confidence": window.prediction.confidence,
+                })
+        for segment in segments:
+            segment["Mean Confidence (%)"] = round(segment.pop("_confidence") / segment["Windows"] * 100, 2)
+        return segments
+
+    def to_dict(self) -> Dict:
+        return {
+            "verdict": self.verdict.to_dict(),
+            "windows": len(self.windows),
+            "duration": self.duration,
+            "label_counts": self.label_counts(),
+            "segments": self.segments(),
+            "timeline": [
+                {"start": w.start, "end": w.end, **w.prediction.to_dict()} for w in self.windows
+            ],
+        }
+
+
+# ----------------------------
+# Pipeline
+# ----------------------------
+def stream_windows(key: str, source: audio_engine.AudioSource, window: float = WINDOW_SECONDS,
+                   hop: float = HOP_SECONDS, batch_size: int = BATCH_SIZE,
+                   backend: str = audio_engine.DEFAULT_BACKEND) -> Iterator[WindowPrediction]:
+    """Lazily classify every window of a recording, one batched predict call per ``batch_size`` windows"""
+    stream = AudioStream(source)
+    chunks = iter(stream)
+    # The librosa fallback only learns the rate once decoding starts
+    first = next(chunks, None)
+    if first is None:
+        raise ValueError("Recording contains no audio")
+    sr = stream.sr
+
+    def _all_chunks():
+        yield first
+        yield from chunks
+
+    size, step = int(window * sr), max(1, int(hop * sr))
+    for batch in _batched(sliding_windows(_all_chunks(), size, step), batch_size):
+        signals = [audio_engine.resample(y, sr) for _, y in batch]
+        features = np.stack(audio_engine.extract_mfcc_batch(signals))
+        probabilities = audio_engine.predict_features(key, features, backend)
+        for (start, y), vector, probs in zip(batch, features, probabilities):
+            yield WindowPrediction(
+                start=start / sr,
+                end=(start + len(y)) / sr,
+                prediction=audio_engine.build_prediction(key, probs, vector),
+            )
+
+
+def analyze_stream(key: str, source: audio_engine.AudioSource, window: float = WINDOW_SECONDS,
+                   hop: float = HOP_SECONDS, batch_size: int = BATCH_SIZE,
+                   backend: str = audio_engine.DEFAULT_BACKEND) -> StreamingAnalysis:
+    """Classify the whole recording and aggregate the windows into one verdict"""
+    result = StreamingAnalysis(key)
+    for window_prediction in stream_windows(key, source, window, hop, batch_size, backend):
+        result.add(window_prediction)
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Sliding-window classification of whole recordings")
+    parser.add_argument("model", choices=sorted(audio_engine.AUDIO_MODELS))
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--window", type=float, default=WINDOW_SECONDS)
+    parser.add_argument("--hop", type=float, default=HOP_SECONDS)
+    parser.add_argument("--backend", choices=sorted(audio_engine.BACKENDS), default=audio_engine.DEFAULT_BACKEND)
+    args = parser.parse_args()
+
+    for path in args.files:
+        result = analyze_stream(args.model, path, args.window, args.hop, backend=args.backend)
+        print(json.dumps({"file": path, **result.to_dict()}))
@@ -0,0 +1,402 @@
+"""In-process risk prediction with the diabetes, heart-attack and lung-cancer models.
+
+The three scikit-learn models trained in ``Text/*/*.ipynb`` ship as pickles at
+the repository root. This module describes the columns each one was trained
+on (names, order, encodings and accepted ranges), validates and encodes input
+records against them and returns class probabilities. The models are loaded
+once per worker through the shared model pool as ``tabular/<key>/<backend>``.
+
+``Diabetes_model_pickle`` and ``Heart_model_pickle`` are fully grown decision
+trees, so their probabilities are leaf frequencies and almost always 0 or 1.
+``Lung_cancer_model_pickle`` is a linear ``SVC`` trained without
+``probability=True``; it has no ``predict_proba``, so its positive-class
+probability is the logistic sigmoid of the SVM margin. That is a monotone
+risk score (0.5 on the decision boundary), not a calibrated probability.
+
+Two backends serve the same probabilities: ``numpy`` (default) evaluates the
+model artifact converted from the pickle by ``caresphere.model_artifact``
+(``<model>.artifact/``: a JSON manifest plus a memory-mapped array payload)
+and never unpickles or imports scikit-learn; ``sklearn`` unpickles the
+original estimator.
+"""
+import hashlib
+import pickle
+import warnings
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from caresphere import model_artifact
+from caresphere.model_pool import POOL
+
+MODEL_DIR = Path(__file__).resolve().parent.parent
+
+
+class FeatureValidationError(ValueError):
+    """Input records that cannot be turned into a model's feature matrix"""
+
+    def __init__(self, problems: List[str]):
+        super().__init__("; ".join(problems))
+        self.problems = problems
+
+
+# ----------------------------
+# Model Registry
+# ----------------------------
+@dataclass(frozen=True)
+class Feature:
+    """One training column: its name, accepted range and, for categoricals, the encoding"""
+    name: str
+    label: str
+    minimum: float
+    maximum: float
+    integer: bool = True
+    # Categorical input label -> encoded training value (e.g. LabelEncoder codes)
+    choices: Optional[Dict[str, int]] = None
+    help: str = ""
+    # Further accepted labels, not offered in forms (e.g. "Male" for "M")
+    synonyms: Optional[Dict[str, int]] = None
+
+    @property
+    def accepted_labels(self) -> Dict[str, int]:
+        """Lower-cased label -> code for every label ``encode`` accepts"""
+        labels = {**(self.choices or {}), **(self.synonyms or {})}
+        return {label.lower(): code for label, code in labels.items()}
+
+    def encode(self, value) -> float:
+        """Encoded numeric value for ``value``; raises ``ValueError`` with a readable message"""
+        if self.choices is not None and isinstance(value, str):
+            code = self.accepted_labels.get(value.strip().lower())
+            if code is not None:
+                return float(code)
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            expected = f"one of {list(self.choices)}" if self.choices else "a number"
+            raise ValueError(f"{self.name}: {value!r} is not {expected}") from None
+        if not np.isfinite(number):
+            raise ValueError(f"{self.name}: {value!r} is not a finite number")
+        if self.integer and not number.is_integer():
+            raise ValueError(f"{self.name}: {value!r} is not a whole number")
+        if self.choices is not None and number not in self.choices.values():
+            raise ValueError(f"{self.name}: {value!r} is not one of {self.choices}")
+        if not self.minimum <= number <= self.maximum:
+            raise ValueError(f"{self.name}: {number:g} is outside [{self.minimum:g}, {self.maximum:g}]")
+        return number
+
+
+@dataclass
+class TabularModelSpec:
+    """Everything needed to load, feed and interpret one tabular disease model"""
+    key: str
+    title: str
+    model_file: str
+    notebook: str
+    features: Tuple[Feature, ...]
+    # Class index -> outcome name, as encoded by the training notebook
+    outcomes: Dict[int, str]
+    positive_label: int = 1
+
+    @property
+    def model_path(self) -> Path:
+        return MODEL_DIR / self.model_file
+
+    @property
+    def artifact_path(self) -> Path:
+        """``Diabetes_model_pickle`` -> ``Diabetes_model.artifact/``"""
+        return MODEL_DIR / (self.model_file.replace("_pickle", "") + ".artifact")
+
+    @property
+    def feature_names(self) -> List[str]:
+        return [f.name for f in self.features]
+
+    @cached_property
+    def version(self) -> str:
+        """Short digest of the pickled model"""
+        return hashlib.blake2b(self.model_path.read_bytes(), digest_size=6).hexdigest()
+
+
+# Symptom columns in the lung-cancer survey are coded NO=1, YES=2
+YES_NO = {"NO": 1, "YES": 2}
+
+DIABETES_FEATURES = (
+    Feature("Pregnancies", "Pregnancies", 0, 20, help="Number of pregnancies"),
+    Feature("Glucose", "Glucose (mg/dL)", 0, 300, help="Plasma glucose concentration"),
+    Feature("BloodPressure", "Blood Pressure (mm Hg)", 0, 200, help="Diastolic blood pressure"),
+    Feature("SkinThickness", "Skin Thickness (mm)", 0, 120, help="Triceps skin fold thickness"),
+    Feature("Insulin", "Insulin (mu U/ml)", 0, 900, help="2-hour serum insulin"),
+    Feature("BMI", "BMI", 0, 90, integer=False, help="Body mass index (kg/m²)"),
+    Feature("DiabetesPedigreeFunction", "Diabetes Pedigree Function", 0, 3, integer=False,
+            help="Family history score"),
+    Feature("Age", "Age (years)", 1, 120),
+)
+
+HEART_FEATURES = (
+    Feature("age", "Age (years)", 1, 120),
+    Feature("gender", "Gender", 0, 1, choices={"Female": 0, "Male": 1}, synonyms={"F": 0, "M": 1}),
+    Feature("impluse", "Heart Rate (bpm)", 20, 1200, help="Pulse; the training data contains outliers up to 1111"),
+    Feature("pressurehight", "Systolic Pressure (mm Hg)", 40, 250),
+    Feature("pressurelow", "Diastolic Pressure (mm Hg)", 30, 160),
+    Feature("glucose", "Blood Sugar (mg/dL)", 30, 600, integer=False),
+    Feature("kcm", "CK-MB (ng/mL)", 0, 300, integer=False, help="Creatine kinase-MB"),
+    Feature("troponin", "Troponin (ng/mL)", 0, 15, integer=False),
+)
+
+LUNG_CANCER_FEATURES = (
+    # LabelEncoder sorted the GENDER labels, so F=0 and M=1
+    Feature("GENDER", "Gender", 0, 1, choices={"F": 0, "M": 1}, synonyms={"Female": 0, "Male": 1}),
+    Feature("AGE", "Age (years)", 1, 120),
+    Feature("SMOKING", "Smoking", 1, 2, choices=YES_NO),
+    Feature("YELLOW_FINGERS", "Yellow Fingers", 1, 2, choices=YES_NO),
+    Feature("ANXIETY", "Anxiety", 1, 2, choices=YES_NO),
+    Feature("PEER_PRESSURE", "Peer Pressure", 1, 2, choices=YES_NO),
+    Feature("CHRONIC DISEASE", "Chronic Disease", 1, 2, choices=YES_NO),
+    # The survey's column names really do end with a space
+    Feature("FATIGUE ", "Fatigue", 1, 2, choices=YES_NO),
+    Feature("ALLERGY ", "Allergy", 1, 2, choices=YES_NO),
+    Feature("WHEEZING", "Wheezing", 1, 2, choices=YES_NO),
+    Feature("ALCOHOL CONSUMING", "Alcohol Consuming", 1, 2, choices=YES_NO),
+    Feature("COUGHING", "Coughing", 1, 2, choices=YES_NO),
+    Feature("SHORTNESS OF BREATH", "Shortness of Breath", 1, 2, choices=YES_NO),
+    Feature("SWALLOWING DIFFICULTY", "Swallowing Difficulty", 1, 2, choices=YES_NO),
+    Feature("CHEST PAIN", "Chest Pain", 1, 2, choices=YES_NO),
+)
+
+TABULAR_MODELS: Dict[str, TabularModelSpec] = {}
+
+
+def register_model(spec: TabularModelSpec) -> None:
+    TABULAR_MODELS[spec.key] = spec
+
+
+def get_spec(key: str) -> TabularModelSpec:
+    try:
+        return TABULAR_MODELS[key]
+    except KeyError:
+        raise KeyError(f"Unknown tabular model '{key}'. Available: {sorted(TABULAR_MODELS)}") from None
+
+
+register_model(TabularModelSpec(
+    "diabetes", "Diabetes", "Diabetes_model_pickle", "Text/Diabetes/Diabetes_text.ipynb",
+    DIABETES_FEATURES, {0: "No Diabetes", 1: "Diabetes"},
+))
+register_model(TabularModelSpec(
+    "heart", "Heart Attack", "Heart_model_pickle", "Text/Heart attack/Heart_attack_predictor_text.ipynb",
+    HEART_FEATURES, {0: "Negative", 1: "Positive"},
+))
+register_model(TabularModelSpec(
+    "lung_cancer", "Lung Cancer", "Lung_cancer_model_pickle", "Text/Lung Cancer/Lung_Cancer_text.ipynb",
+    LUNG_CANCER_FEATURES, {0: "No Lung Cancer", 1: "Lung Cancer"},
+))
+
+
+# ----------------------------
+# Model Loading
+# ----------------------------
+class SklearnClassifier:
+    """Adapter giving a fitted scikit-learn classifier a ``predict(X) -> probabilities`` call"""
+
+    def __init__(self, model, spec: TabularModelSpec):
+        trained_on = list(getattr(model, "feature_names_in_", spec.feature_names))
+        if trained_on != spec.feature_names:
+            raise ValueError(f"{spec.model_file} was trained on {trained_on}, expected {spec.feature_names}")
+        self.model = model
+        self.classes = [int(c) for c in model.classes_]
+        self.calibrated = hasattr(model, "predict_proba")
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        with warnings.catch_warnings():
+            # Column order is validated against ``feature_names_in_`` at load time, so plain
+            # arrays are passed to the estimator; silence sklearn's reminder about that
+            warnings.filterwarnings("ignore", message="X does not have valid feature names", category=UserWarning)
+            if self.calibrated:
+                # Trees pickled by scikit-learn < 1.4 store leaf sample counts, which newer
+                # versions return unnormalised from predict_proba; normalise every row
+                probabilities = np.asarray(self.model.predict_proba(X), dtype=np.float64)
+                return probabilities / probabilities.sum(axis=1, keepdims=True)
+            # Binary margin classifiers (SVC without probability=True): sigmoid of the margin
+            margin = np.asarray(self.model.decision_function(X), dtype=np.float64)
+        positive = 1.0 / (1.0 + np.exp(-margin))
+        return np.column_stack([1.0 - positive, positive])
+
+
+def _load_sklearn(spec: TabularModelSpec) -> SklearnClassifier:
+    with warnings.catch_warnings():
+        # The pickles were written by scikit-learn 1.3; the estimators used here are stable across versions
+        warnings.filterwarnings("ignore", message="Trying to unpickle estimator")
+        with open(spec.model_path, "rb") as fh:
+            return SklearnClassifier(pickle.load(fh), spec)
+
+
+def convert_model(spec: TabularModelSpec) -> Path:
+    """(Re)write ``spec.artifact_path`` from the pickle, with the spec's encodings in the manifest"""
+    encodings = {f.name: {**f.choices, **(f.synonyms or {})} for f in spec.features if f.choices is not None}
+    return model_artifact.convert_pickle(spec.model_path, spec.artifact_path, spec.feature_names,
+                                         model=spec.key, label_encodings=encodings,
+                                         outcomes={str(k): v for k, v in spec.outcomes.items()},
+                                         positive_label=spec.positive_label)
+
+
+def _load_numpy(spec: TabularModelSpec):
+    if not (spec.artifact_path / model_artifact.MANIFEST).exists():
+        # Serving never unpickles; converting the pickle is an explicit build step
+        raise FileNotFoundError(f"{spec.artifact_path.name} is missing; convert it with "
+                                f"`python -m caresphere.tabular_engine {spec.key} --export`")
+    return model_artifact.load(spec.artifact_path, spec.feature_names).scorer()
+
+
+# Backend name -> loader returning an object with ``predict(X) -> (N, 2)``
+BACKENDS = {
+    "numpy": _load_numpy,
+    "sklearn": _load_sklearn,
+}
+BACKEND_LABELS = {
+    "numpy": "NumPy (fast, no scikit-learn)",
+    "sklearn": "scikit-learn (original pickle)",
+}
+DEFAULT_BACKEND = "numpy"
+
+
+def _pool_name(key: str, backend: str) -> str:
+    return f"tabular/{key}/{backend}"
+
+
+for _key, _spec in TABULAR_MODELS.items():
+    for _backend, _loader in BACKENDS.items():
+        POOL.register(_pool_name(_key, _backend), lambda spec=_spec, loader=_loader: loader(spec),
+                      # Both are a few KB; unpickling also imports scikit-learn, which eviction cannot return
+                      heavy=False, size_hint=lambda model: getattr(model, "nbytes", 0))
+
+
+def get_model(key: str, backend: str = DEFAULT_BACKEND):
+    """Return the loaded classifier for ``key`` on ``backend`` from the process-wide model pool"""
+    get_spec(key)
+    if backend not in BACKENDS:
+        raise KeyError(f"Unknown tabular backend '{backend}'. Available: {sorted(BACKENDS)}")
+    return POOL.get(_pool_name(key, backend))
+
+
+# ----------------------------
+# Feature Validation
+# ----------------------------
+Record = Mapping[str, object]
+
+
+def feature_matrix(key: str, records: Union[Record, Sequence[Record], np.ndarray]) -> np.ndarray:
+    """Validate and encode records into the ``(N, n_features)`` matrix the model was trained on.
+
+    Records are mappings from training column name to value; categorical
+    columns accept either their label (``"M"``, ``"YES"``) or the encoded
+    value. Column names are matched ignoring case and surrounding spaces.
+    A numeric array must already be encoded and in training column order.
+    Every problem found is reported in one ``FeatureValidationError``.
+    """
+    spec = get_spec(key)
+    if isinstance(records, np.ndarray):
+        X = np.atleast_2d(records).astype(np.float64)
+        if X.ndim != 2 or X.shape[1] != len(spec.features):
+            raise FeatureValidationError([f"expected shape (n, {len(spec.features)}), got {records.shape}"])
+        records = [dict(zip(spec.feature_names, row)) for row in X]
+    elif isinstance(records, Mapping):
+        records = [records]
+
+    X = np.empty((len(records), len(spec.features)), dtype=np.float64)
+    problems = []
+    for i, record in enumerate(records):
+        by_name = {str(name).strip().lower(): value for name, value in record.items()}
+        prefix = f"row {i}: " if len(records) > 1 else ""
+        for j, feature in enumerate(spec.features):
+            value = by_name.get(feature.name.strip().lower())
+            if value is None:
+                problems.append(f"{prefix}{feature.name}: missing")
+                continue
+            try:
+                X[i, j] = feature.encode(value)
+            except ValueError as e:
+                problems.append(f"{prefix}{e}")
+    if problems:
+        raise FeatureValidationError(problems)
+    return X
+
+
+def predict_proba(key: str, X: np.ndarray, backend: str = DEFAULT_BACKEND) -> np.ndarray:
+    """Class probabilities ``(N, 2)`` for an already validated feature matrix"""
+    return get_model(key, backend).predict(X)
+
+
+# ----------------------------
+# Result Schema
+# ----------------------------
+@dataclass
+class TabularPrediction:
+    model: str
+    label: int
+    name: str
+    risk: float
+    probabilities: np.ndarray
+    features: np.ndarray = field(repr=False)
+
+    @property
+    def is_positive(self) -> bool:
+        return self.label == get_spec(self.model).positive_label
+
+    def to_dict(self) -> Dict:
+        outcomes = get_spec(self.model).outcomes
+        return {
+            "model": self.model,
+            "label": self.label,
+            "name": self.name,
+            "risk": self.risk,
+            "probabilities": {outcomes[i]: float(p) for i, p in enumerate(self.probabilities)},
+        }
+
+
+def build_prediction(key: str, probabilities: np.ndarray, features: np.ndarray) -> TabularPrediction:
+    spec = get_spec(key)
+    label = int(np.argmax(probabilities))
+    return TabularPrediction(
+        model=key,
+        label=label,
+        name=spec.outcomes[label],
+        risk=float(probabilities[spec.positive_label]),
+        probabilities=probabilities,
+        features=features,
+    )
+
+
+def predict(key: str, records: Union[Record, Sequence[Record], np.ndarray],
+            backend: str = DEFAULT_BACKEND) -> List[TabularPrediction]:
+    """Validate ``records`` and return one prediction per record"""
+    X = feature_matrix(key, records)
+    return [build_prediction(key, p, x) for p, x in zip(predict_proba(key, X, backend), X)]
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import sys
+
+    parser = argparse.ArgumentParser(description="Score patient records with a tabular disease model")
+    parser.add_argument("model", choices=sorted(TABULAR_MODELS))
+    parser.add_argument("records", nargs="?", help="JSON object or list of objects (default: stdin)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND)
+    parser.add_argument("--export", action="store_true", help="(re)write every model's artifact from its pickle")
+    args = parser.parse_args()
+
+    if args.export:
+        for spec in TABULAR_MODELS.values():
+            print(f"Wrote {convert_model(spec)}")
+        sys.exit(0)
+
+    payload = json.loads(args.records if args.records is not None else sys.stdin.read())
+    try:
+        predictions = predict(args.model, payload, args.backend)
+    except FeatureValidationError as e:
+        for problem in e.problems:
+            print(problem, file=sys.stderr)
+        sys.exit(2)
+    for prediction in predictions:
+        print(json.dumps(prediction.to_dict()))
@@ -1,10 +1,14 @@
 import streamlit as st
-import os
-import tensorflow as tf
-from keras.models import load_model
-import librosa
-import numpy as np
-import time
+from contextlib import nullcontext
+
+from caresphere import audio_engine, live, model_pool, streaming
+from caresphere.lazy import lazy_import
+from caresphere.metrics import StageTimer
+
+pd = lazy_import("pandas")
+
+# Load any models named in CARESPHERE_PREWARM in the background (once per worker)
+model_pool.prewarm_from_env()
 
 # ----------------------------
 # Streamlit Page Config
@@ -283,84 +287,54 @@ st.markdown("""
 # ----------------------------
 # Helper Functions
 # ----------------------------
-@st.cache_resource
-def load_ml_model():
+MODEL_KEY = "heartbeat"
+
+
+def load_ml_model(backend):
+    # Served from the shared model pool, so every session in the worker reuses one instance
     try:
-        model = tf.keras.models.load_model("Heartbeat_audioclassification.keras")
-        return model
+        return audio_engine.get_model(MODEL_KEY, backend)
     except Exception as e:
         st.error(f"Error loading model: {str(e)}")
         return None
 
+
+ANALYSIS_MODES = ["Single Recording", "Full Recording Timeline", "Live Capture", "Batch Screening"]
+ANALYSIS_STAGES = ["cache", "decode", "resample", "mfcc", "predict", "render"]
+BATCH_STAGES = ["cache", "features", "predict", "render"]
+STAGE_LABELS = {
+    "cache": "Cache Lookup",
+    "decode": "Decode",
+    "features": "Decode + MFCC",
+    "analyze": "Stream + Predict",
+    "resample": "Resample",
+    "mfcc": "MFCC",
+    "predict": "Model Predict",
+    "render": "Render",
+}
+
+
+def render_stage_timings(durations, stages=ANALYSIS_STAGES):
+    """Show the measured duration of every pipeline stage that ran"""
+    st.markdown("### Pipeline Timings ⏱️")
+    skipped = [stage for stage in stages if stage not in durations]
+    stages = [stage for stage in stages if stage in durations]
+    if skipped and "cache" in durations:
+        st.caption("♻️ Cache hit: skipped " + ", ".join(STAGE_LABELS[stage] for stage in skipped))
+    cols = st.columns(len(stages) + 1)
+    for col, stage in zip(cols, stages + ["total"]):
+        with col:
+            st.markdown(f"""
+            <div class='metric-card'>
+                <div class='metric-value'>{durations.get(stage, 0.0):.0f} ms</div>
+                <div class='metric-label'>{STAGE_LABELS.get(stage, 'Total')}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
 # ----------------------------
 # Condition Information
 # ----------------------------
-condition_info = {
-    0: {
-        'name': 'Artifact',
-        'class': 'result-artifact',
-        'emoji': '⚡',
-        'description': 'Audio artifacts detected - this may be due to noise, poor recording quality, or technical interference in the heartbeat recording.',
-        'recommendation': 'Please try recording again in a quieter environment with better audio quality. Ensure proper placement of recording device.',
-        'confidence_class': 'conf-artifact'
-    },
-    1: {
-        'name': 'A-Unlabelled Test',
-        'class': 'result-aunlabelledtest',
-        'emoji': '🔍',
-        'description': 'An unlabelled cardiac pattern (Type A) has been detected. This requires further medical evaluation for proper classification.',
-        'recommendation': 'Consult with a cardiologist for comprehensive cardiac evaluation and proper diagnosis of this heart pattern.',
-        'confidence_class': 'conf-aunlabelledtest'
-    },
-    2: {
-        'name': 'B-Unlabelled Test',
-        'class': 'result-bunlabelledtest',
-        'emoji': '🔬',
-        'description': 'An unlabelled cardiac pattern (Type B) has been identified. Professional medical assessment is needed for accurate classification.',
-        'recommendation': 'Schedule an appointment with a cardiac specialist for detailed heart examination and proper diagnosis.',
-        'confidence_class': 'conf-bunlabelledtest'
-    },
-    3: {
-        'name': 'Extrahls',
-        'class': 'result-extrahls',
-        'emoji': '🎵',
-        'description': 'Extra heart sounds (gallops) detected - these are additional sounds that may indicate cardiac conditions like heart failure or ventricular dysfunction.',
-        'recommendation': 'Medical evaluation recommended. Extra heart sounds can be significant and may require cardiac assessment and treatment.',
-        'confidence_class': 'conf-extrahls'
-    },
-    4: {
-        'name': 'Extrasystole',
-        'class': 'result-extrastole',
-        'emoji': '💓',
-        'description': 'Extrasystoles (premature heartbeats) detected. These are early heartbeats that can be benign or indicate underlying cardiac issues.',
-        'recommendation': 'Consult with a cardiologist to determine if these irregular beats require treatment or monitoring.',
-        'confidence_class': 'conf-extrastole'
-    },
-    5: {
-        'name': 'Murmur',
-        'class': 'result-murmur',
-        'emoji': '🌊',
-        'description': 'A heart murmur has been detected. This is an extra sound during heartbeat cycle, which can be innocent or indicate heart valve problems.',
-        'recommendation': 'Cardiac evaluation recommended to determine if the murmur is benign or requires treatment. Further tests like echocardiogram may be needed.',
-        'confidence_class': 'conf-murmur'
-    },
-    6: {
-        'name': 'Normal',
-        'class': 'result-normal',
-        'emoji': '✅',
-        'description': 'Excellent news! Normal heart sounds detected. Your cardiac rhythm appears healthy with regular heart beats and normal sound patterns.',
-        'recommendation': 'Continue maintaining good cardiovascular health with regular exercise, healthy diet, and routine check-ups.',
-        'confidence_class': 'conf-normal'
-    },
-    7: {
-        'name': 'Unlabelled Test',
-        'class': 'result-unlabelledtest',
-        'emoji': '❓',
-        'description': 'An unclassified cardiac pattern has been detected. This pattern doesn\'t match standard categories and needs professional evaluation.',
-        'recommendation': 'Medical consultation strongly recommended for proper cardiac assessment and diagnosis of this unusual heart pattern.',
-        'confidence_class': 'conf-unlabelledtest'
-    }
-}
+condition_info = audio_engine.get_spec(MODEL_KEY).conditions
 
 # Header
 st.markdown('<h1 class="main-header">🫀 Cardiac Sound Analysis for Heart Health</h1>', unsafe_allow_html=True)
@@ -396,14 +370,8 @@ st.markdown("---")
 # ----------------------------
 # Main Application
 # ----------------------------
-def main():
-    # Load model
-    model = load_ml_model()
-
-    if model is None:
-        st.error("⚠️ Model could not be loaded. Please check if the model file exists.")
-        st.stop()
-
+def single_analysis(backend):
+    """Analyze one uploaded recording"""
     # File Upload Section
     st.markdown("### Upload Heartbeat Audio File 🎵")
     file = st.file_uploader(
@@ -447,107 +415,108 @@ def main():
         if st.button("Analyze Heartbeat Sounds 🫀"):
             try:
                 with st.spinner("🫀 AI is analyzing your heartbeat sounds..."):
-                    # Progress indicator
-                    progress_bar = st.progress(0)
-                    for i in range(100):
-                        time.sleep(0.015)
-                        progress_bar.progress(i + 1)
-
-                    # Load and process audio
-                    y, sr = librosa.load(file, duration=3, offset=0.5)
-                    mfcc = np.mean(librosa.feature.mfcc(y=y, sr=sr, n_mfcc=40).T, axis=0)
-                    mfcc = mfcc.reshape(1, -1)
-
-                    # Make prediction
-                    prediction = model.predict(mfcc)
-                    predicted_label = np.argmax(prediction, axis=-1)[0]
-                    confidence = np.max(prediction) * 100
-
-                    # Clear progress bar
-                    progress_bar.empty()
-
-                    # Display Results
-                    st.markdown("### Cardiac Analysis Results 📊")
-
-                    condition = condition_info[predicted_label]
-
-                    # Main Result Card
-                    st.markdown(f"""
-                    <div class='result-card {condition['class']}'>
-                        <div class='result-condition'>
-                            {condition['emoji']} {condition['name']}
-                        </div>
-                        <div class='result-confidence'>
-                            Confidence Level: {confidence:.1f}%
-                        </div>
-                        <div class='result-description'>
-                            <p><b>🔍 Analysis:</b> {condition['description']}</p>
-                            <p><b>💡 Recommendation:</b> {condition['recommendation']}</p>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-                    # Detailed Analysis Metrics
-                    st.markdown("### Detailed Analysis 📈")
-                    col1, col2, col3 = st.columns(3)
-
-                    with col1:
-                        st.markdown(f"""
-                        <div class='metric-card'>
-                            <div class='metric-value'>{condition['name']}</div>
-                            <div class='metric-label'>Primary Detection</div>
-                        </div>
-                        """, unsafe_allow_html=True)
-
-                    with col2:
+                    # Progress is driven by the real pipeline stages
+                    progress_bar = st.progress(0.0, text="Decoding audio...")
+                    timer = StageTimer(
+                        "cardioecho.analyze",
+                        stages=ANALYSIS_STAGES,
+                        on_progress=lambda fraction, stage: progress_bar.progress(
+                            fraction, text=f"{STAGE_LABELS[stage]} done"),
+                    )
+
+                    # Decode, extract features and predict through the shared engine
+                    result = audio_engine.analyze(MODEL_KEY, file, timer=timer, backend=backend)
+                    prediction = result.probabilities
+                    predicted_label = result.label
+                    confidence = result.confidence * 100
+
+                    with timer.stage("render"):
+                        # Display Results
+                        st.markdown("### Cardiac Analysis Results 📊")
+
+                        condition = condition_info[predicted_label]
+
+                        # Main Result Card
                         st.markdown(f"""
-                        <div class='metric-card'>
-                            <div class='metric-value'>{confidence:.1f}%</div>
-                            <div class='metric-label'>Confidence Score</div>
+                        <div class='result-card {condition['class']}'>
+                            <div class='result-condition'>
+                                {condition['emoji']} {condition['name']}
+                            </div>
+                            <div class='result-confidence'>
+                                Confidence Level: {confidence:.1f}%
+                            </div>
+                            <div class='result-description'>
+                                <p><b>🔍 Analysis:</b> {condition['description']}</p>
+                                <p><b>💡 Recommendation:</b> {condition['recommendation']}</p>
+                            </div>
                         </div>
                         """, unsafe_allow_html=True)
 
-                    with col3:
-                        st.markdown(f"""
-                        <div class='metric-card'>
-                            <div class='metric-value'>40</div>
-                            <div class='metric-label'>MFCC Features</div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                        # Detailed Analysis Metrics
+                        st.markdown("### Detailed Analysis 📈")
+                        col1, col2, col3 = st.columns(3)
 
-                    # Confidence Breakdown
-                    st.markdown("### All Conditions Analysis 🎯")
-                    st.markdown("""
-                    <div class='info-card'>
-                        <h5>Confidence Breakdown</h5>
-                        <p>Here's how confident our AI is about each possible cardiac condition:</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                        with col1:
+                            st.markdown(f"""
+                            <div class='metric-card'>
+                                <div class='metric-value'>{condition['name']}</div>
+                                <div class='metric-label'>Primary Detection</div>
+                            </div>
+                            """, unsafe_allow_html=True)
 
-                    for i, (label, info) in enumerate(condition_info.items()):
-                        conf_value = prediction[0][i] * 100
-                        st.markdown(f"""
-                        <div class='confidence-item'>
-                            <div class='confidence-label'>
-                                <span>{info['emoji']} <strong>{info['name']}</strong></span>
-                                <span><strong>{conf_value:.1f}%</strong></span>
+                        with col2:
+                            st.markdown(f"""
+                            <div class='metric-card'>
+                                <div class='metric-value'>{confidence:.1f}%</div>
+                                <div class='metric-label'>Confidence Score</div>
                             </div>
-                            <div class='confidence-bar'>
-                                <div class='confidence-fill {info['confidence_class']}' style='width: {conf_value}%;'></div>
+                            """, unsafe_allow_html=True)
+
+                        with col3:
+                            st.markdown(f"""
+                            <div class='metric-card'>
+                                <div class='metric-value'>40</div>
+                                <div class='metric-label'>MFCC Features</div>
                             </div>
+                            """, unsafe_allow_html=True)
+
+                        # Confidence Breakdown
+                        st.markdown("### All Conditions Analysis 🎯")
+                        st.markdown("""
+                        <div class='info-card'>
+                            <h5>Confidence Breakdown</h5>
+                            <p>Here's how confident our AI is about each possible cardiac condition:</p>
                         </div>
                         """, unsafe_allow_html=True)
 
-                    # Medical Disclaimer and Recommendations
-                    if predicted_label == 6:  # Normal
-                        st.success(
-                            "🎉 Great news! Your heartbeat patterns appear normal. Continue maintaining good cardiovascular health!")
-                    else:
-                        st.warning(
-                            "⚠️ This cardiac screening suggests you should consult with a cardiologist for proper medical evaluation and personalized treatment advice.")
+                        for i, (label, info) in enumerate(condition_info.items()):
+                            conf_value = prediction[i] * 100
+                            st.markdown(f"""
+                            <div class='confidence-item'>
+                                <div class='confidence-label'>
+                                    <span>{info['emoji']} <strong>{info['name']}</strong></span>
+                                    <span><strong>{conf_value:.1f}%</strong></span>
+                                </div>
+                                <div class='confidence-bar'>
+                                    <div class='confidence-fill {info['confidence_class']}' style='width: {conf_value}%;'></div>
+                                </div>
+                            </div>
+                            """, unsafe_allow_html=True)
+
+                        # Medical Disclaimer and Recommendations
+                        if result.is_normal:  # Normal
+                            st.success(
+                                "🎉 Great news! Your heartbeat patterns appear normal. Continue maintaining good cardiovascular health!")
+                        else:
+                            st.warning(
+                                "⚠️ This cardiac screening suggests you should consult with a cardiologist for proper medical evaluation and personalized treatment advice.")
 
-                    st.info(
-                        "🏥 **Important:** This AI cardiac screening tool is designed to assist in early detection and should not replace professional medical diagnosis. Please consult with qualified cardiologists for comprehensive evaluation and treatment.")
+                        st.info(
+                            "🏥 **Important:** This AI cardiac screening tool is designed to assist in early detection and should not replace professional medical diagnosis. Please consult with qualified cardiologists for comprehensive evaluation and treatment.")
+
+                    # Clear progress bar and report the measured stage timings
+                    progress_bar.empty()
+                    render_stage_timings(timer.finish())
 
             except Exception as e:
                 st.error(f"❌ Error during analysis: {str(e)}")
@@ -557,6 +526,238 @@ def main():
         # Footer Information
         st.markdown("---")
 
+
+def timeline_analysis(backend):
+    """Classify a whole recording in overlapping windows and aggregate the verdict"""
+    st.markdown("### Upload Heartbeat Audio File 🎵")
+    file = st.file_uploader(
+        "Choose a heartbeat recording of any length (WAV, MP3, M4A):",
+        type=["wav", "mp3", "m4a"],
+        key="cardioecho_timeline_upload",
+        help="The whole recording is analysed in overlapping windows instead of only its first seconds.",
+    )
+    col1, col2 = st.columns(2)
+    with col1:
+        window = st.slider("Window length (s)", 2.0, 6.0, float(streaming.WINDOW_SECONDS), 0.5)
+    with col2:
+        hop = st.slider("Window step (s)", 0.5, 6.0, float(streaming.HOP_SECONDS), 0.5)
+
+    if file is None or not st.button("Analyze Full Recording 🫀"):
+        return
+
+    try:
+        progress_bar = st.progress(0.0, text="Analyzing windows...")
+        timer = StageTimer("cardioecho.timeline", stages=["analyze", "render"])
+        result = streaming.StreamingAnalysis(MODEL_KEY)
+        with timer.stage("analyze"):
+            stream = streaming.stream_windows(MODEL_KEY, file, window=window, hop=hop, backend=backend)
+            duration = streaming.AudioStream(file).duration
+            for window_prediction in stream:
+                result.add(window_prediction)
+                if duration:
+                    fraction = min(1.0, window_prediction.end / duration)
+                    progress_bar.progress(fraction, text=f"Analyzed {window_prediction.end:.0f} s of {duration:.0f} s")
+        progress_bar.empty()
+
+        with timer.stage("render"):
+            verdict = result.verdict
+            condition = verdict.condition
+            st.markdown("### Full Recording Verdict 📊")
+            st.markdown(f"""
+            <div class='result-card {condition['class']}'>
+                <div class='result-condition'>
+                    {condition['emoji']} {condition['name']}
+                </div>
+                <div class='result-confidence'>
+                    Mean Confidence: {verdict.confidence * 100:.1f}% over {len(result.windows)} windows
+                </div>
+                <div class='result-description'>
+                    <p><b>🔍 Analysis:</b> {condition['description']}</p>
+                    <p><b>💡 Recommendation:</b> {condition['recommendation']}</p>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+
+            col1, col2, col3 = st.columns(3)
+            for col, value, label in (
+                (col1, f"{result.duration:.1f} s", "Recording Covered"),
+                (col2, len(result.windows), "Windows Analyzed"),
+                (col3, f"{result.abnormal_fraction() * 100:.0f}%", "Abnormal Windows"),
+            ):
+                with col:
+                    st.markdown(f"""
+                    <div class='metric-card'>
+                        <div class='metric-value'>{value}</div>
+                        <div class='metric-label'>{label}</div>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+            st.markdown("### Condition Timeline 📈")
+            timeline = pd.DataFrame(result.timeline())
+            chart = timeline.set_index("Start (s)")[[f"{c['name']} (%)" for c in condition_info.values()]]
+            st.line_chart(chart)
+            st.dataframe(timeline, use_container_width=True, hide_index=True)
+            st.download_button(
+                "Download Timeline CSV 📥",
+                data=timeline.to_csv(index=False),
+                file_name="cardioecho_timeline.csv",
+                mime="text/csv",
+            )
+            st.info(
+                "🏥 **Important:** This AI cardiac screening tool is designed to assist in early detection and should not replace professional medical diagnosis. Please consult with qualified cardiologists for comprehensive evaluation and treatment.")
+        render_stage_timings(timer.finish(), ["analyze", "render"])
+
+    except Exception as e:
+        st.error(f"❌ Error during analysis: {str(e)}")
+        st.info("Please ensure you uploaded a valid audio file and try again. Supported formats: WAV, MP3, M4A")
+
+
+def live_analysis(backend):
+    """Rolling classification of a live feed from the microphone or a replayed recording"""
+    st.markdown("### Live Capture 🎙️")
+    source_kind = st.radio("Audio Source", ["Microphone", "Recording (replayed live)"], horizontal=True)
+    if source_kind == "Microphone":
+        # The browser delivers the clip when recording stops; it is then fed through in capture-sized
+        # chunks as fast as they can be classified (it was already captured in real time)
+        audio = st.audio_input("Record heartbeat with your microphone", key="cardioecho_live_mic")
+    else:
+        audio = st.file_uploader(
+            "Choose a heartbeat recording to replay as a live feed (WAV, MP3, M4A):",
+            type=["wav", "mp3", "m4a"],
+            key="cardioecho_live_upload",
+        )
+    update_ms = st.slider("Update every (ms)", 100, 1000, int(live.UPDATE_SECONDS * 1000), 100,
+                          help="How often the rolling verdict over the last 3 seconds is refreshed.")
+
+    if audio is None or not st.button("Start Live Analysis 🫀"):
+        return
+
+    try:
+        verdict_slot = st.empty()
+        metrics_slot = st.empty()
+        chart_slot = st.empty()
+        rows, latencies = [], []
+        for update in live.live_session(MODEL_KEY, audio, update_every=update_ms / 1000,
+                                        realtime=source_kind != "Microphone", backend=backend):
+            condition = update.prediction.condition
+            rows.append(update.to_row())
+            latencies.append(update.latency_ms)
+            verdict_slot.markdown(f"""
+            <div class='result-card {condition['class']}'>
+                <div class='result-condition'>
+                    {condition['emoji']} {condition['name']}
+                </div>
+                <div class='result-confidence'>
+                    Confidence Level: {update.prediction.confidence * 100:.1f}% at {update.time:.1f} s
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+            metrics_slot.markdown(f"""
+            <div class='metric-card'>
+                <div class='metric-value'>{update.latency_ms:.2f} ms</div>
+                <div class='metric-label'>Sound-to-Verdict Latency (median {sorted(latencies)[len(latencies) // 2]:.2f} ms)</div>
+            </div>
+            """, unsafe_allow_html=True)
+            history = pd.DataFrame(rows).set_index("Time (s)")
+            chart_slot.line_chart(history[[f"{c['name']} (%)" for c in condition_info.values()]])
+
+        if not rows:
+            st.warning("The recording is too short for a live verdict; at least one second of audio is needed.")
+            return
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+        st.info(
+            "🏥 **Important:** This AI cardiac screening tool is designed to assist in early detection and should not replace professional medical diagnosis. Please consult with qualified cardiologists for comprehensive evaluation and treatment.")
+
+    except Exception as e:
+        st.error(f"❌ Error during live analysis: {str(e)}")
+
+
+def batch_key(files):
+    return tuple((f.name, f.size) for f in files)
+
+
+def batch_analysis(backend):
+    """Screen many recordings with one batched model call"""
+    st.markdown("### Upload Heartbeat Audio Files 🎵")
+    files = st.file_uploader(
+        "Choose heartbeat recordings for batch screening (WAV, MP3, M4A):",
+        type=["wav", "mp3", "m4a"],
+        accept_multiple_files=True,
+        help="All recordings are decoded in parallel and classified together in a single model call.",
+    )
+
+    if files and st.button(f"Analyze {len(files)} Recordings 🫀"):
+        progress_bar = st.progress(0.0, text="Extracting features...")
+        timer = StageTimer(
+            "cardioecho.batch",
+            stages=BATCH_STAGES,
+            on_progress=lambda fraction, stage: progress_bar.progress(
+                fraction, text=f"{STAGE_LABELS[stage]} done"),
+        )
+        batch = audio_engine.analyze_batch(MODEL_KEY, files, backend=backend, timer=timer)
+
+        rows = []
+        for i, (uploaded, prediction) in enumerate(zip(files, batch.predictions)):
+            if prediction is None:
+                rows.append({"File": uploaded.name, "Condition": f"Error: {batch.errors[i]}"})
+            else:
+                rows.append({"File": uploaded.name, **prediction.to_row()})
+        # Kept in session state so the table survives the rerun triggered by the download button
+        st.session_state["cardioecho_batch"] = (batch_key(files), pd.DataFrame(rows))
+        st.session_state["cardioecho_batch_timer"] = timer
+        progress_bar.empty()
+
+    saved = st.session_state.get("cardioecho_batch")
+    if files and saved is not None and saved[0] == batch_key(files):
+        results = saved[1]
+        timer = st.session_state.pop("cardioecho_batch_timer", None)
+        with (timer.stage("render") if timer is not None else nullcontext()):
+            st.markdown("### Batch Screening Results 📊")
+            st.dataframe(results, use_container_width=True, hide_index=True)
+            st.download_button(
+                "Download Results CSV 📥",
+                data=results.to_csv(index=False),
+                file_name="cardioecho_batch_results.csv",
+                mime="text/csv",
+            )
+        if timer is not None:
+            render_stage_timings(timer.finish(), BATCH_STAGES)
+
+
+def main():
+    # Inference engine selection and model load
+    backend = st.selectbox(
+        "Inference Engine ⚙️",
+        options=list(audio_engine.BACKEND_LABELS),
+        format_func=audio_engine.BACKEND_LABELS.get,
+        help="NumPy evaluates the exported model weights directly; Keras runs the original TensorFlow model, and the compiled options run it as a traced (optionally XLA) graph. All give the same results.",
+    )
+    model = load_ml_model(backend)
+
+    if model is None:
+        st.error("⚠️ Model could not be loaded. Please check if the model file exists.")
+        st.stop()
+
+    with st.expander("Loaded Models & Memory 🧠"):
+        # Plain markdown so the page load does not pull in pandas
+        rows = [row for row in model_pool.POOL.report() if row["Loaded"]]
+        st.markdown("| Model | Resident (MB) | Load (ms) | Hits |\n|---|---|---|---|\n" + "\n".join(
+            f"| {row['Model']} | {row['Resident (MB)']} | {row['Load (ms)']} | {row['Hits']} |" for row in rows))
+        budget = model_pool.POOL.budget_bytes
+        st.caption(f"Pool total: {model_pool.POOL.total_bytes() / 2 ** 20:.1f} MB"
+                   + (f" of a {budget / 2 ** 20:.0f} MB budget" if budget else " (no budget set)"))
+
+    # Analysis mode
+    mode = st.radio("Analysis Mode 🗂️", ANALYSIS_MODES, horizontal=True)
+    if mode == "Batch Screening":
+        batch_analysis(backend)
+    elif mode == "Full Recording Timeline":
+        timeline_analysis(backend)
+    elif mode == "Live Capture":
+        live_analysis(backend)
+    else:
+        single_analysis(backend)
+
     col1, col2, col3 = st.columns(3)
     with col1:
         st.markdown("""
@@ -1,17 +1,15 @@
 ﻿import streamlit as st
 import requests
 import os
-import easyocr
-import tempfile
 from groq import Groq
-import cv2
 import numpy as np
-from PIL import Image, ImageEnhance, ImageFilter
-import pytesseract
 import re
 from typing import List, Tuple
 from dotenv import load_dotenv
-import os
+
+from caresphere import image_enhance, model_pool, ocr
+
+model_pool.prewarm_from_env()
 
 
 # --- Groq API Setup ---
@@ -20,109 +18,26 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 groq_client = Groq(api_key=GROQ_API_KEY)
 
 
-# --- OCR Setup ---
-reader = easyocr.Reader(['en'])
-
-
 # --- Image Enhancement Functions ---
-def enhance_image_quality(image_path: str) -> str:
-    """Enhance image quality for better OCR results"""
+def enhance_image_quality(img: np.ndarray) -> np.ndarray:
+    """Enhance image quality for better OCR results (BGR array in, grayscale array out)"""
     try:
-        # Read image with OpenCV
-        img = cv2.imread(image_path)
-
-        # Convert to PIL Image for easier manipulation
-        pil_img = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
-
-        # 1. Resize image if too small
-        width, height = pil_img.size
-        if width < 800 or height < 600:
-            scale_factor = max(800 / width, 600 / height)
-            new_width = int(width * scale_factor)
-            new_height = int(height * scale_factor)
-            pil_img = pil_img.resize((new_width, new_height), Image.LANCZOS)
-
-        # 2. Enhance contrast
-        enhancer = ImageEnhance.Contrast(pil_img)
-        pil_img = enhancer.enhance(2.0)
-
-        # 3. Enhance brightness
-        enhancer = ImageEnhance.Brightness(pil_img)
-        pil_img = enhancer.enhance(1.2)
-
-        # 4. Enhance sharpness
-        enhancer = ImageEnhance.Sharpness(pil_img)
-        pil_img = enhancer.enhance(2.0)
-
-        # 5. Apply unsharp mask filter
-        pil_img = pil_img.filter(ImageFilter.UnsharpMask(radius=2, percent=150, threshold=3))
-
-        # Convert back to OpenCV format
-        enhanced_img = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
-
-        # 6. Apply additional OpenCV enhancements
-        # Convert to grayscale
-        gray = cv2.cvtColor(enhanced_img, cv2.COLOR_BGR2GRAY)
-
-        # Apply CLAHE (Contrast Limited Adaptive Histogram Equalization)
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        enhanced_gray = clahe.apply(gray)
-
-        # Apply Gaussian blur and then unsharp masking
-        blurred = cv2.GaussianBlur(enhanced_gray, (0, 0), 2.0)
-        unsharp_mask = cv2.addWeighted(enhanced_gray, 1.5, blurred, -0.5, 0)
-
-        # Apply morphological operations to clean up text
-        kernel = np.ones((1, 1), np.uint8)
-        cleaned = cv2.morphologyEx(unsharp_mask, cv2.MORPH_CLOSE, kernel)
-
-        # Save enhanced image
-        enhanced_path = image_path.replace('.jpg', '_enhanced.jpg')
-        cv2.imwrite(enhanced_path, cleaned)
-
-        return enhanced_path
+        # Contrast, brightness, sharpening, CLAHE and unsharp masking on one grayscale plane
+        return image_enhance.enhance(img)
 
     except Exception as e:
         st.warning(f"Image enhancement failed: {e}. Using original image.")
-        return image_path
+        return img
 
 
-def extract_text_multiple_methods(image_path: str) -> List[str]:
-    """Extract text using multiple OCR methods for better accuracy"""
+def extract_text_multiple_methods(image: np.ndarray) -> List[str]:
+    """Extract text using multiple OCR methods for better accuracy (all engines run concurrently)"""
     extracted_texts = []
-
-    try:
-        # Method 1: EasyOCR (good for multiple languages and handwriting)
-        result_easyocr = reader.readtext(image_path, detail=0)
-        text_easyocr = " ".join(result_easyocr).strip()
-        if text_easyocr:
-            extracted_texts.append(("EasyOCR", text_easyocr))
-    except Exception as e:
-        st.warning(f"EasyOCR failed: {e}")
-
-    try:
-        # Method 2: Pytesseract with different PSM modes
-        img = cv2.imread(image_path)
-
-        # PSM 6: Uniform block of text
-        text_tesseract_6 = pytesseract.image_to_string(img,
-                                                       config='--psm 6 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789 ').strip()
-        if text_tesseract_6:
-            extracted_texts.append(("Tesseract PSM-6", text_tesseract_6))
-
-        # PSM 8: Single word
-        text_tesseract_8 = pytesseract.image_to_string(img, config='--psm 8').strip()
-        if text_tesseract_8:
-            extracted_texts.append(("Tesseract PSM-8", text_tesseract_8))
-
-        # PSM 13: Raw line (no specific word or character limits)
-        text_tesseract_13 = pytesseract.image_to_string(img, config='--psm 13').strip()
-        if text_tesseract_13:
-            extracted_texts.append(("Tesseract PSM-13", text_tesseract_13))
-
-    except Exception as e:
-        st.warning(f"Tesseract OCR failed: {e}")
-
+    for result in ocr.run_engines(image):
+        if not result.ok:
+            st.warning(f"{result.engine} failed: {result.error}")
+        elif result.text:
+            extracted_texts.append((result.engine, result.text))
     return extracted_texts
 
 
@@ -397,35 +312,40 @@ if st.button("🔎 Scan & Analyze Medicine", type="primary", use_container_width
             st.markdown("### 📸 Original Image")
             st.image(uploaded_file, caption="Uploaded Image", use_column_width=True)
 
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp_file:
-            tmp_file.write(uploaded_file.read())
-            tmp_path = tmp_file.name
+        # Decode the upload once; enhancement and every OCR engine share the array
+        try:
+            image = ocr.decode_image(uploaded_file.getvalue())
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            st.stop()
+        scan = ocr.scan_id()
+        ocr.save_image(image, f"{scan}-upload")
 
         # Step 1: Image Enhancement
         if enhance_image:
             with st.spinner("🔧 Enhancing image quality for better recognition..."):
-                enhanced_path = enhance_image_quality(tmp_path)
+                enhanced = enhance_image_quality(image)
 
                 with col2:
                     st.markdown("### ✨ Enhanced Image")
-                    if os.path.exists(enhanced_path):
-                        st.image(enhanced_path, caption="Enhanced for OCR", use_column_width=True)
+                    if enhanced is not image:
+                        st.image(enhanced, caption="Enhanced for OCR", use_column_width=True)
+                        ocr.save_image(enhanced, f"{scan}-enhanced")
                     else:
-                        enhanced_path = tmp_path
                         st.info("Using original image")
         else:
-            enhanced_path = tmp_path
+            enhanced = image
 
         # Step 2: Text Extraction
         with st.spinner("📖 Extracting text from image using advanced OCR..."):
             if multiple_ocr:
-                extracted_texts = extract_text_multiple_methods(enhanced_path)
+                extracted_texts = extract_text_multiple_methods(enhanced)
             else:
                 # Use only EasyOCR
-                result = reader.readtext(enhanced_path, detail=0)
-                extracted_text = " ".join(result)
-                extracted_texts = [("EasyOCR", extracted_text)]
+                result = ocr.run_engines(enhanced, [ocr.EASYOCR])[0]
+                if not result.ok:
+                    st.warning(f"EasyOCR failed: {result.error}")
+                extracted_texts = [("EasyOCR", result.text)]
 
         # Display extracted text
         if extracted_texts:
@@ -493,14 +413,6 @@ if st.button("🔎 Scan & Analyze Medicine", type="primary", use_container_width
             st.error(
                 "❌ No text could be extracted from the image. Please try with a clearer image or different lighting.")
 
-        # Cleanup temporary files
-        try:
-            os.remove(tmp_path)
-            if enhance_image and os.path.exists(enhanced_path) and enhanced_path != tmp_path:
-                os.remove(enhanced_path)
-        except:
-            pass
-
     else:
         st.error("📷 Please upload an image first!")
 
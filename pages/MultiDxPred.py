@@ -1,5 +1,14 @@
+import hashlib
+import tempfile
+
+import pandas as pd
 import streamlit as st
 
+from caresphere import bulk_scoring, model_pool, tabular_engine
+
+# Load any models named in CARESPHERE_PREWARM in the background (once per worker)
+model_pool.prewarm_from_env()
+
 # Page config
 st.set_page_config(page_title="MultiDx Prediction", page_icon="🩺", layout="wide")
 
@@ -55,27 +64,26 @@ st.markdown("""
         line-height: 1.5;
         color: #e2e8f0;
     }
-    .cta-button {
-        display: flex;
-        justify-content: center;
-        margin: 3rem 0;
+    .result-card {
+        background-color: #ffffff;
+        border-radius: 12px;
+        padding: 1.5rem 2rem;
+        margin: 1.5rem 0;
+        box-shadow: 0 4px 16px rgba(0,0,0,0.1);
+        border-left: 5px solid;
     }
-    .cta-button a {
-        background: linear-gradient(135deg, #3b82f6, #2563eb);
-        color: white;
-        padding: 1rem 3rem;
-        border-radius: 50px;
+    .result-positive { border-left-color: #dc2626; }
+    .result-negative { border-left-color: #16a34a; }
+    .result-card h3 {
+        color: #1a3c5e;
         font-size: 1.8rem;
-        font-weight: bold;
-        text-decoration: none;
-        box-shadow: 0 6px 12px rgba(0,0,0,0.2);
-        transition: all 0.3s ease;
-        white-space: nowrap;
+        font-weight: 700;
+        margin-bottom: 0.5rem;
     }
-    .cta-button a:hover {
-        background: linear-gradient(135deg, #2563eb, #1e40af);
-        transform: scale(1.05);
-        box-shadow: 0 8px 16px rgba(0,0,0,0.3);
+    .result-card p {
+        color: #4a5568;
+        font-size: 1.05rem;
+        line-height: 1.6;
     }
     .section-title {
         color: #1a3c5e;
@@ -123,9 +131,141 @@ with col3:
     </div>
     """, unsafe_allow_html=True)
 
-# Call to Action Button
-st.markdown("""
-<div class="cta-button">
-    <a href="https://predictive-wellness.lovable.app/" target="_self">🚀 LAUNCH PREDICTOR</a>
-</div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+# Predictor
+st.markdown('<h2 class="section-title">Run a Prediction</h2>', unsafe_allow_html=True)
+
+# Scored rows are spooled to disk past SPOOL_BYTES; results larger than the download cap are
+# not offered in the browser (Streamlit holds a download in memory), only via the CLI
+SPOOL_BYTES = 8 * 1024 * 1024
+MAX_DOWNLOAD_BYTES = 200 * 1024 * 1024
+# Scored rows shown in the page; the download has them all
+PREVIEW_ROWS = 1000
+
+RISK_NOTES = {
+    "diabetes": "Decision tree trained on the Healthcare Diabetes dataset.",
+    "heart": "Decision tree trained on the Heart Attack clinical dataset.",
+    "lung_cancer": ("Linear SVM trained on a lung cancer symptom survey. Its risk is the sigmoid of the "
+                    "SVM margin, a relative score rather than a calibrated probability."),
+}
+
+
+def feature_input(feature, key):
+    """One form widget for a training column; returns the raw value for validation"""
+    if feature.choices is not None:
+        return st.selectbox(feature.label, list(feature.choices), help=feature.help or None,
+                            key=key)
+    if feature.integer:
+        return st.number_input(feature.label, min_value=int(feature.minimum), max_value=int(feature.maximum),
+                               value=int(feature.minimum), step=1, help=feature.help or None,
+                               key=key)
+    return st.number_input(feature.label, min_value=float(feature.minimum), max_value=float(feature.maximum),
+                           value=float(feature.minimum), help=feature.help or None,
+                           key=key)
+
+
+def render_prediction(spec, prediction):
+    positive = prediction.is_positive
+    st.markdown(f"""
+    <div class="result-card {'result-positive' if positive else 'result-negative'}">
+        <h3>{'⚠️' if positive else '✅'} {prediction.name}</h3>
+        <p><b>Estimated {spec.title.lower()} risk:</b> {prediction.risk * 100:.1f}%</p>
+        <p>{RISK_NOTES.get(spec.key, "")}</p>
+    </div>
+    """, unsafe_allow_html=True)
+    st.progress(min(max(prediction.risk, 0.0), 1.0))
+    st.caption("This is a screening aid, not a diagnosis. Please consult a doctor about any health concern.")
+
+
+def predictor_form(spec):
+    with st.form(f"form-{spec.key}"):
+        columns = st.columns(2)
+        record = {}
+        for i, feature in enumerate(spec.features):
+            with columns[i % 2]:
+                record[feature.name] = feature_input(feature, f"{spec.key}-{feature.name}")
+        submitted = st.form_submit_button(f"🔍 Predict {spec.title} Risk")
+
+    if submitted:
+        try:
+            prediction = tabular_engine.predict(spec.key, record)[0]
+        except tabular_engine.FeatureValidationError as e:
+            for problem in e.problems:
+                st.error(f"❌ {problem}")
+            return
+        except Exception as e:
+            st.error(f"❌ Error during prediction: {str(e)}")
+            return
+        render_prediction(spec, prediction)
+
+
+def bulk_screening():
+    st.markdown("Score a whole patient registry at once. The CSV needs the model's training columns "
+                "(names are matched ignoring case); rows are processed in chunks, so large files are fine.")
+    key = st.selectbox("Model", list(tabular_engine.TABULAR_MODELS),
+                       format_func=lambda k: tabular_engine.get_spec(k).title, key="bulk-model")
+    spec = tabular_engine.get_spec(key)
+    with st.expander("Expected columns"):
+        st.markdown("\n".join(
+            f"- `{f.name.strip()}`: " + (", ".join(f"{label}={code}" for label, code in f.choices.items())
+                                       if f.choices else f"{f.minimum:g} to {f.maximum:g}")
+            for f in spec.features
+        ))
+    uploaded = st.file_uploader("Upload patient CSV", type=["csv"], key="bulk-file")
+    keep = st.text_input("ID column to copy into the results (optional)", key="bulk-keep")
+    if uploaded is None:
+        return
+    # Results are kept per upload, model and ID column, so reruns (e.g. the download) do not rescore
+    run_key = (hashlib.blake2b(uploaded.getbuffer(), digest_size=16).hexdigest(), key, keep.strip())
+
+    if st.button("📊 Score Registry", key="bulk-run"):
+        progress_bar = st.progress(0.0, text="Scoring...")
+        total = max(uploaded.size, 1)
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES, mode="w+", newline="", encoding="utf-8") as output:
+            try:
+                summary = bulk_scoring.score_csv(
+                    key, uploaded, output, keep=[keep] if keep.strip() else [],
+                    progress=lambda s: progress_bar.progress(min(uploaded.tell() / total, 1.0),
+                                                             text=f"Scored {s.rows:,} rows"),
+                )
+            except tabular_engine.FeatureValidationError as e:
+                progress_bar.empty()
+                st.error(f"❌ The CSV does not match the {spec.title} model: {e}")
+                return
+            except Exception as e:
+                progress_bar.empty()
+                st.error(f"❌ Error during bulk scoring: {str(e)}")
+                return
+            size = output.tell()
+            results = None
+            if size <= MAX_DOWNLOAD_BYTES:
+                output.seek(0)
+                results = pd.read_csv(output)
+        st.session_state["multidx_bulk"] = (run_key, summary, results, size)
+        progress_bar.empty()
+
+    saved = st.session_state.get("multidx_bulk")
+    if saved is None or saved[0] != run_key:
+        return
+    _, summary, results, size = saved
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Rows", f"{summary.rows:,}")
+    col2.metric("Positive", f"{summary.positive:,}")
+    col3.metric("Invalid", f"{summary.invalid:,}")
+    col4.metric("Rows / s", f"{summary.rows_per_second:,.0f}")
+    if results is None:
+        st.warning(f"The results are {size / 2**20:,.0f} MB, too large to download here. Score the file with "
+                   f"`python -m caresphere.bulk_scoring {key} patients.csv scores.csv` instead.")
+        return
+    st.dataframe(results.head(PREVIEW_ROWS), use_container_width=True, hide_index=True)
+    if len(results) > PREVIEW_ROWS:
+        st.caption(f"Showing the first {PREVIEW_ROWS:,} of {len(results):,} rows; the download has them all.")
+    st.download_button("⬇️ Download Results (CSV)", results.to_csv(index=False),
+                       file_name=f"{key}_scores.csv", mime="text/csv")
+
+
+tabs = st.tabs(["🧬 Diabetes", "❤️ Heart Attack", "🫁 Lung Cancer", "📂 Bulk CSV Screening"])
+for tab, key in zip(tabs, ["diabetes", "heart", "lung_cancer"]):
+    with tab:
+        predictor_form(tabular_engine.get_spec(key))
+with tabs[3]:
+    bulk_screening()
@@ -1,10 +1,14 @@
 import streamlit as st
-import os
-import tensorflow as tf
-from keras.models import load_model
-import librosa
-import numpy as np
-import time
+from contextlib import nullcontext
+
+from caresphere import audio_engine, live, model_pool, streaming
+from caresphere.lazy import lazy_import
+from caresphere.metrics import StageTimer
+
+pd = lazy_import("pandas")
+
+# Load any models named in CARESPHERE_PREWARM in the background (once per worker)
+model_pool.prewarm_from_env()
 
 # ----------------------------
 # Streamlit Page Config
@@ -247,61 +251,55 @@ st.markdown("""
 # ----------------------------
 # Helper Functions
 # ----------------------------
-@st.cache_resource
-def load_ml_model():
+MODEL_KEY = "respiratory"
+
+
+def load_ml_model(backend):
+    # Served from the shared model pool, so every session in the worker reuses one instance
     try:
-        model = tf.keras.models.load_model("Asthma_audioclassification.keras")
-        return model
+        return audio_engine.get_model(MODEL_KEY, backend)
     except Exception as e:
         st.error(f"Error loading model: {str(e)}")
         return None
 
 
+ANALYSIS_MODES = ["Single Recording", "Full Recording Timeline", "Live Capture", "Batch Screening"]
+ANALYSIS_STAGES = ["cache", "decode", "resample", "mfcc", "predict", "render"]
+BATCH_STAGES = ["cache", "features", "predict", "render"]
+STAGE_LABELS = {
+    "cache": "Cache Lookup",
+    "decode": "Decode",
+    "features": "Decode + MFCC",
+    "analyze": "Stream + Predict",
+    "resample": "Resample",
+    "mfcc": "MFCC",
+    "predict": "Model Predict",
+    "render": "Render",
+}
+
+
+def render_stage_timings(durations, stages=ANALYSIS_STAGES):
+    """Show the measured duration of every pipeline stage that ran"""
+    st.markdown("### Pipeline Timings ⏱️")
+    skipped = [stage for stage in stages if stage not in durations]
+    stages = [stage for stage in stages if stage in durations]
+    if skipped and "cache" in durations:
+        st.caption("♻️ Cache hit: skipped " + ", ".join(STAGE_LABELS[stage] for stage in skipped))
+    cols = st.columns(len(stages) + 1)
+    for col, stage in zip(cols, stages + ["total"]):
+        with col:
+            st.markdown(f"""
+            <div class='metric-card'>
+                <div class='metric-value'>{durations.get(stage, 0.0):.0f} ms</div>
+                <div class='metric-label'>{STAGE_LABELS.get(stage, 'Total')}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+
 # ----------------------------
 # Condition Information
 # ----------------------------
-condition_info = {
-    0: {
-        'name': 'Asthma',
-        'class': 'result-asthma',
-        'emoji': '🫁',
-        'description': 'The AI has detected respiratory patterns consistent with asthma. This includes characteristic wheeze patterns and airway obstruction indicators in the audio analysis.',
-        'recommendation': 'Please consult with a pulmonologist or your primary care physician for proper diagnosis and treatment planning. Early intervention can significantly improve quality of life.',
-        'confidence_class': 'conf-asthma'
-    },
-    1: {
-        'name': 'Bronchial',
-        'class': 'result-bronchial',
-        'emoji': '🌬️',
-        'description': 'Bronchial has been detected in the breath patterns. The audio shows signs of bronchial tube irritation and inflammation.',
-        'recommendation': 'Seek medical advice for appropriate bronchial treatment and management. Your doctor may recommend anti-inflammatory treatments or further testing.',
-        'confidence_class': 'conf-bronchial'
-    },
-    2: {
-        'name': 'Chronic Obstructive Pulmonary Disease',
-        'class': 'result-copd',
-        'emoji': '⚠️',
-        'description': 'The analysis suggests possible Chronic Obstructive Pulmonary Disease. Audio indicates airflow limitation and breathing difficulties.',
-        'recommendation': 'Medical evaluation is strongly recommended for COPD assessment and management. Early diagnosis and treatment can help slow disease progression.',
-        'confidence_class': 'conf-copd'
-    },
-    3: {
-        'name': 'Healthy',
-        'class': 'result-healthy',
-        'emoji': '✅',
-        'description': 'Excellent news! Normal breathing patterns have been detected. Your respiratory health appears to be in good condition based on the audio analysis.',
-        'recommendation': 'Continue maintaining good respiratory health with regular exercise, clean air exposure, and avoiding smoking. Keep up the good work!',
-        'confidence_class': 'conf-healthy'
-    },
-    4: {
-        'name': 'Pneumonia',
-        'class': 'result-pneumonia',
-        'emoji': '🚨',
-        'description': 'The respiratory patterns may indicate pneumonia. The audio analysis shows signs consistent with lung infection and possible fluid accumulation.',
-        'recommendation': 'Immediate medical consultation is strongly recommended for proper diagnosis and treatment. Pneumonia requires prompt medical attention.',
-        'confidence_class': 'conf-pneumonia'
-    }
-}
+condition_info = audio_engine.get_spec(MODEL_KEY).conditions
 
 
 # Page Header
@@ -376,14 +374,8 @@ st.markdown("---")
 # ----------------------------
 # Main Application
 # ----------------------------
-def main():
-    # Load model
-    model = load_ml_model()
-
-    if model is None:
-        st.error("⚠️ Model could not be loaded. Please check if the model file exists.")
-        st.stop()
-
+def single_analysis(backend):
+    """Analyze one uploaded recording"""
     # File Upload Section
     st.markdown("### Upload Audio File📁")
     file = st.file_uploader(
@@ -427,107 +419,108 @@ def main():
         if st.button("Analyze Breath Sounds🤖"):
             try:
                 with st.spinner("🤖 AI is analyzing your breath sounds..."):
-                    # Progress indicator
-                    progress_bar = st.progress(0)
-                    for i in range(100):
-                        time.sleep(0.015)
-                        progress_bar.progress(i + 1)
-
-                    # Load and process audio
-                    y, sr = librosa.load(file, duration=3, offset=0.5)
-                    mfcc = np.mean(librosa.feature.mfcc(y=y, sr=sr, n_mfcc=40).T, axis=0)
-                    mfcc = mfcc.reshape(1, -1)
-
-                    # Make prediction
-                    prediction = model.predict(mfcc)
-                    predicted_label = np.argmax(prediction, axis=-1)[0]
-                    confidence = np.max(prediction) * 100
-
-                    # Clear progress bar
-                    progress_bar.empty()
-
-                    # Display Results
-                    st.markdown("### Analysis Results📊")
-
-                    condition = condition_info[predicted_label]
-
-                    # Main Result Card
-                    st.markdown(f"""
-                    <div class='result-card {condition['class']}'>
-                        <div class='result-condition'>
-                            {condition['emoji']} {condition['name']}
-                        </div>
-                        <div class='result-confidence'>
-                            Confidence Level: {confidence:.1f}%
-                        </div>
-                        <div class='result-description'>
-                            <p><b>🔍 Analysis:</b> {condition['description']}</p>
-                            <p><b>💡 Recommendation:</b> {condition['recommendation']}</p>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-                    # Detailed Analysis Metrics
-                    st.markdown("### Detailed Analysis📈")
-                    col1, col2, col3 = st.columns(3)
-
-                    with col1:
-                        st.markdown(f"""
-                        <div class='metric-card'>
-                            <div class='metric-value'>{condition['name']}</div>
-                            <div class='metric-label'>Primary Detection</div>
-                        </div>
-                        """, unsafe_allow_html=True)
-
-                    with col2:
+                    # Progress is driven by the real pipeline stages
+                    progress_bar = st.progress(0.0, text="Decoding audio...")
+                    timer = StageTimer(
+                        "respecho.analyze",
+                        stages=ANALYSIS_STAGES,
+                        on_progress=lambda fraction, stage: progress_bar.progress(
+                            fraction, text=f"{STAGE_LABELS[stage]} done"),
+                    )
+
+                    # Decode, extract features and predict through the shared engine
+                    result = audio_engine.analyze(MODEL_KEY, file, timer=timer, backend=backend)
+                    prediction = result.probabilities
+                    predicted_label = result.label
+                    confidence = result.confidence * 100
+
+                    with timer.stage("render"):
+                        # Display Results
+                        st.markdown("### Analysis Results📊")
+
+                        condition = condition_info[predicted_label]
+
+                        # Main Result Card
                         st.markdown(f"""
-                        <div class='metric-card'>
-                            <div class='metric-value'>{confidence:.1f}%</div>
-                            <div class='metric-label'>Confidence Score</div>
+                        <div class='result-card {condition['class']}'>
+                            <div class='result-condition'>
+                                {condition['emoji']} {condition['name']}
+                            </div>
+                            <div class='result-confidence'>
+                                Confidence Level: {confidence:.1f}%
+                            </div>
+                            <div class='result-description'>
+                                <p><b>🔍 Analysis:</b> {condition['description']}</p>
+                                <p><b>💡 Recommendation:</b> {condition['recommendation']}</p>
+                            </div>
                         </div>
                         """, unsafe_allow_html=True)
 
-                    with col3:
-                        st.markdown(f"""
-                        <div class='metric-card'>
-                            <div class='metric-value'>40</div>
-                            <div class='metric-label'>MFCC Features</div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                        # Detailed Analysis Metrics
+                        st.markdown("### Detailed Analysis📈")
+                        col1, col2, col3 = st.columns(3)
 
-                    # Confidence Breakdown
-                    st.markdown("### All Conditions Analysis🎯")
-                    st.markdown("""
-                    <div class='info-card'>
-                        <h5>Confidence Breakdown</h5>
-                        <p>Here's how confident our AI is about each possible condition:</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                        with col1:
+                            st.markdown(f"""
+                            <div class='metric-card'>
+                                <div class='metric-value'>{condition['name']}</div>
+                                <div class='metric-label'>Primary Detection</div>
+                            </div>
+                            """, unsafe_allow_html=True)
 
-                    for i, (label, info) in enumerate(condition_info.items()):
-                        conf_value = prediction[0][i] * 100
-                        st.markdown(f"""
-                        <div class='confidence-item'>
-                            <div class='confidence-label'>
-                                <span>{info['emoji']} <strong>{info['name']}</strong></span>
-                                <span><strong>{conf_value:.1f}%</strong></span>
+                        with col2:
+                            st.markdown(f"""
+                            <div class='metric-card'>
+                                <div class='metric-value'>{confidence:.1f}%</div>
+                                <div class='metric-label'>Confidence Score</div>
                             </div>
-                            <div class='confidence-bar'>
-                                <div class='confidence-fill {info['confidence_class']}' style='width: {conf_value}%;'></div>
+                            """, unsafe_allow_html=True)
+
+                        with col3:
+                            st.markdown(f"""
+                            <div class='metric-card'>
+                                <div class='metric-value'>40</div>
+                                <div class='metric-label'>MFCC Features</div>
                             </div>
+                            """, unsafe_allow_html=True)
+
+                        # Confidence Breakdown
+                        st.markdown("### All Conditions Analysis🎯")
+                        st.markdown("""
+                        <div class='info-card'>
+                            <h5>Confidence Breakdown</h5>
+                            <p>Here's how confident our AI is about each possible condition:</p>
                         </div>
                         """, unsafe_allow_html=True)
 
-                    # Medical Disclaimer and Recommendations
-                    if predicted_label == 3:  # Healthy
-                        st.success(
-                            "🎉 Great news! Your breathing patterns appear healthy. Continue maintaining good respiratory health!")
-                    else:
-                        st.warning(
-                            "⚠️ This screening suggests you should consult with a healthcare professional for proper medical evaluation and personalized treatment advice.")
+                        for i, (label, info) in enumerate(condition_info.items()):
+                            conf_value = prediction[i] * 100
+                            st.markdown(f"""
+                            <div class='confidence-item'>
+                                <div class='confidence-label'>
+                                    <span>{info['emoji']} <strong>{info['name']}</strong></span>
+                                    <span><strong>{conf_value:.1f}%</strong></span>
+                                </div>
+                                <div class='confidence-bar'>
+                                    <div class='confidence-fill {info['confidence_class']}' style='width: {conf_value}%;'></div>
+                                </div>
+                            </div>
+                            """, unsafe_allow_html=True)
+
+                        # Medical Disclaimer and Recommendations
+                        if result.is_normal:  # Healthy
+                            st.success(
+                                "🎉 Great news! Your breathing patterns appear healthy. Continue maintaining good respiratory health!")
+                        else:
+                            st.warning(
+                                "⚠️ This screening suggests you should consult with a healthcare professional for proper medical evaluation and personalized treatment advice.")
 
-                    st.info(
-                        "🏥 **Important:** This AI screening tool is designed to assist in early detection and should not replace professional medical diagnosis. Please consult with qualified healthcare professionals for comprehensive evaluation and treatment.")
+                        st.info(
+                            "🏥 **Important:** This AI screening tool is designed to assist in early detection and should not replace professional medical diagnosis. Please consult with qualified healthcare professionals for comprehensive evaluation and treatment.")
+
+                    # Clear progress bar and report the measured stage timings
+                    progress_bar.empty()
+                    render_stage_timings(timer.finish())
 
             except Exception as e:
                 st.error(f"❌ Error during analysis: {str(e)}")
@@ -538,6 +531,241 @@ def main():
     # Footer Information
         st.markdown("---")
 
+
+def timeline_analysis(backend):
+    """Segment a whole breath recording into windows and show the per-segment conditions"""
+    st.markdown("### Upload Breath Sound Recording 📁")
+    file = st.file_uploader(
+        "Choose a breath sound recording of any length (WAV, MP3, M4A):",
+        type=["wav", "mp3", "m4a"],
+        key="respecho_timeline_upload",
+        help="The whole recording is analysed in overlapping windows instead of only its first seconds.",
+    )
+    col1, col2 = st.columns(2)
+    with col1:
+        window = st.slider("Window length (s)", 2.0, 6.0, float(streaming.WINDOW_SECONDS), 0.5)
+    with col2:
+        hop = st.slider("Window step (s)", 0.5, 6.0, float(streaming.HOP_SECONDS), 0.5)
+
+    if file is None or not st.button("Analyze Full Recording 🤖"):
+        return
+
+    try:
+        progress_bar = st.progress(0.0, text="Analyzing windows...")
+        timer = StageTimer("respecho.timeline", stages=["analyze", "render"])
+        result = streaming.StreamingAnalysis(MODEL_KEY)
+        with timer.stage("analyze"):
+            stream = streaming.stream_windows(MODEL_KEY, file, window=window, hop=hop, backend=backend)
+            duration = streaming.AudioStream(file).duration
+            for window_prediction in stream:
+                result.add(window_prediction)
+                if duration:
+                    fraction = min(1.0, window_prediction.end / duration)
+                    progress_bar.progress(fraction, text=f"Analyzed {window_prediction.end:.0f} s of {duration:.0f} s")
+        progress_bar.empty()
+
+        with timer.stage("render"):
+            verdict = result.verdict
+            condition = verdict.condition
+            st.markdown("### Full Recording Verdict📊")
+            st.markdown(f"""
+            <div class='result-card {condition['class']}'>
+                <div class='result-condition'>
+                    {condition['emoji']} {condition['name']}
+                </div>
+                <div class='result-confidence'>
+                    Mean Confidence: {verdict.confidence * 100:.1f}% over {len(result.windows)} windows
+                </div>
+                <div class='result-description'>
+                    <p><b>🔍 Analysis:</b> {condition['description']}</p>
+                    <p><b>💡 Recommendation:</b> {condition['recommendation']}</p>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+
+            segments = pd.DataFrame(result.segments())
+            col1, col2, col3 = st.columns(3)
+            for col, value, label in (
+                (col1, f"{result.duration:.1f} s", "Recording Covered"),
+                (col2, len(segments), "Segments"),
+                (col3, f"{result.abnormal_fraction() * 100:.0f}%", "Non-Healthy Windows"),
+            ):
+                with col:
+                    st.markdown(f"""
+                    <div class='metric-card'>
+                        <div class='metric-value'>{value}</div>
+                        <div class='metric-label'>{label}</div>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+            st.markdown("### Segment Timeline🕒")
+            st.dataframe(segments, use_container_width=True, hide_index=True)
+
+            st.markdown("### Condition Probabilities Over Time📈")
+            timeline = pd.DataFrame(result.timeline())
+            chart = timeline.set_index("Start (s)")[[f"{c['name']} (%)" for c in condition_info.values()]]
+            st.line_chart(chart)
+            st.download_button(
+                "Download Timeline CSV 📥",
+                data=timeline.to_csv(index=False),
+                file_name="respecho_timeline.csv",
+                mime="text/csv",
+            )
+            st.info(
+                "🏥 **Important:** This AI screening tool is designed to assist in early detection and should not replace professional medical diagnosis. Please consult with qualified healthcare professionals for comprehensive evaluation and treatment.")
+        render_stage_timings(timer.finish(), ["analyze", "render"])
+
+    except Exception as e:
+        st.error(f"❌ Error during analysis: {str(e)}")
+        st.info("Please ensure you uploaded a valid audio file and try again. Supported formats: WAV, MP3, M4A")
+
+
+def live_analysis(backend):
+    """Rolling classification of a live feed from the microphone or a replayed recording"""
+    st.markdown("### Live Capture 🎙️")
+    source_kind = st.radio("Audio Source", ["Microphone", "Recording (replayed live)"], horizontal=True)
+    if source_kind == "Microphone":
+        # The browser delivers the clip when recording stops; it is then fed through in capture-sized
+        # chunks as fast as they can be classified (it was already captured in real time)
+        audio = st.audio_input("Record breath sound with your microphone", key="respecho_live_mic")
+    else:
+        audio = st.file_uploader(
+            "Choose a breath sound recording to replay as a live feed (WAV, MP3, M4A):",
+            type=["wav", "mp3", "m4a"],
+            key="respecho_live_upload",
+        )
+    update_ms = st.slider("Update every (ms)", 100, 1000, int(live.UPDATE_SECONDS * 1000), 100,
+                          help="How often the rolling verdict over the last 3 seconds is refreshed.")
+
+    if audio is None or not st.button("Start Live Analysis 🤖"):
+        return
+
+    try:
+        verdict_slot = st.empty()
+        metrics_slot = st.empty()
+        chart_slot = st.empty()
+        rows, latencies = [], []
+        for update in live.live_session(MODEL_KEY, audio, update_every=update_ms / 1000,
+                                        realtime=source_kind != "Microphone", backend=backend):
+            condition = update.prediction.condition
+            rows.append(update.to_row())
+            latencies.append(update.latency_ms)
+            verdict_slot.markdown(f"""
+            <div class='result-card {condition['class']}'>
+                <div class='result-condition'>
+                    {condition['emoji']} {condition['name']}
+                </div>
+                <div class='result-confidence'>
+                    Confidence Level: {update.prediction.confidence * 100:.1f}% at {update.time:.1f} s
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+            metrics_slot.markdown(f"""
+            <div class='metric-card'>
+                <div class='metric-value'>{update.latency_ms:.2f} ms</div>
+                <div class='metric-label'>Sound-to-Verdict Latency (median {sorted(latencies)[len(latencies) // 2]:.2f} ms)</div>
+            </div>
+            """, unsafe_allow_html=True)
+            history = pd.DataFrame(rows).set_index("Time (s)")
+            chart_slot.line_chart(history[[f"{c['name']} (%)" for c in condition_info.values()]])
+
+        if not rows:
+            st.warning("The recording is too short for a live verdict; at least one second of audio is needed.")
+            return
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+        st.info(
+            "🏥 **Important:** This AI screening tool is designed to assist in early detection and should not replace professional medical diagnosis. Please consult with qualified healthcare professionals for comprehensive evaluation and treatment.")
+
+    except Exception as e:
+        st.error(f"❌ Error during live analysis: {str(e)}")
+
+
+def batch_key(files):
+    return tuple((f.name, f.size) for f in files)
+
+
+def batch_analysis(backend):
+    """Screen many recordings with one batched model call"""
+    st.markdown("### Upload Breath Sound Audio Files 📁")
+    files = st.file_uploader(
+        "Choose breath sound recordings for batch screening (WAV, MP3, M4A):",
+        type=["wav", "mp3", "m4a"],
+        accept_multiple_files=True,
+        help="All recordings are decoded in parallel and classified together in a single model call.",
+    )
+
+    if files and st.button(f"Analyze {len(files)} Recordings 🤖"):
+        progress_bar = st.progress(0.0, text="Extracting features...")
+        timer = StageTimer(
+            "respecho.batch",
+            stages=BATCH_STAGES,
+            on_progress=lambda fraction, stage: progress_bar.progress(
+                fraction, text=f"{STAGE_LABELS[stage]} done"),
+        )
+        batch = audio_engine.analyze_batch(MODEL_KEY, files, backend=backend, timer=timer)
+
+        rows = []
+        for i, (uploaded, prediction) in enumerate(zip(files, batch.predictions)):
+            if prediction is None:
+                rows.append({"File": uploaded.name, "Condition": f"Error: {batch.errors[i]}"})
+            else:
+                rows.append({"File": uploaded.name, **prediction.to_row()})
+        # Kept in session state so the table survives the rerun triggered by the download button
+        st.session_state["respecho_batch"] = (batch_key(files), pd.DataFrame(rows))
+        st.session_state["respecho_batch_timer"] = timer
+        progress_bar.empty()
+
+    saved = st.session_state.get("respecho_batch")
+    if files and saved is not None and saved[0] == batch_key(files):
+        results = saved[1]
+        timer = st.session_state.pop("respecho_batch_timer", None)
+        with (timer.stage("render") if timer is not None else nullcontext()):
+            st.markdown("### Batch Screening Results 📊")
+            st.dataframe(results, use_container_width=True, hide_index=True)
+            st.download_button(
+                "Download Results CSV 📥",
+                data=results.to_csv(index=False),
+                file_name="respecho_batch_results.csv",
+                mime="text/csv",
+            )
+        if timer is not None:
+            render_stage_timings(timer.finish(), BATCH_STAGES)
+
+
+def main():
+    # Inference engine selection and model load
+    backend = st.selectbox(
+        "Inference Engine ⚙️",
+        options=list(audio_engine.BACKEND_LABELS),
+        format_func=audio_engine.BACKEND_LABELS.get,
+        help="NumPy evaluates the exported model weights directly; Keras runs the original TensorFlow model, and the compiled options run it as a traced (optionally XLA) graph. All give the same results.",
+    )
+    model = load_ml_model(backend)
+
+    if model is None:
+        st.error("⚠️ Model could not be loaded. Please check if the model file exists.")
+        st.stop()
+
+    with st.expander("Loaded Models & Memory 🧠"):
+        # Plain markdown so the page load does not pull in pandas
+        rows = [row for row in model_pool.POOL.report() if row["Loaded"]]
+        st.markdown("| Model | Resident (MB) | Load (ms) | Hits |\n|---|---|---|---|\n" + "\n".join(
+            f"| {row['Model']} | {row['Resident (MB)']} | {row['Load (ms)']} | {row['Hits']} |" for row in rows))
+        budget = model_pool.POOL.budget_bytes
+        st.caption(f"Pool total: {model_pool.POOL.total_bytes() / 2 ** 20:.1f} MB"
+                   + (f" of a {budget / 2 ** 20:.0f} MB budget" if budget else " (no budget set)"))
+
+    # Analysis mode
+    mode = st.radio("Analysis Mode 🗂️", ANALYSIS_MODES, horizontal=True)
+    if mode == "Batch Screening":
+        batch_analysis(backend)
+    elif mode == "Full Recording Timeline":
+        timeline_analysis(backend)
+    elif mode == "Live Capture":
+        live_analysis(backend)
+    else:
+        single_analysis(backend)
+
     col1, col2, col3 = st.columns(3)
     with col1:
         st.markdown("""
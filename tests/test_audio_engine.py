@@ -0,0 +1,13 @@
+from pathlib import Path
+
+from caresphere import audio_engine
+
+SAMPLE = Path(__file__).resolve().parent.parent / "Webapp Testing Data" / "P1AsthmaIE_5.wav"
+
+
+def test_unreadable_source_fails_alone_with_the_cache():
+    sources = [str(SAMPLE), "does-not-exist.wav", SAMPLE.read_bytes()]
+    batch = audio_engine.analyze_batch("respiratory", sources, backend="numpy")
+    assert list(batch.errors) == [1]
+    assert batch.predictions[1] is None
+    assert batch.predictions[0] is not None and batch.predictions[2] is not None
@@ -0,0 +1,21 @@
+import numpy as np
+
+from caresphere import audio_engine
+from caresphere.live import LiveClassifier
+
+
+def test_finish_flushes_the_resampler_tail():
+    input_sr, seconds = 44100, 2.0
+    t = np.arange(int(input_sr * seconds)) / input_sr
+    signal = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    classifier = LiveClassifier("heartbeat", input_sr=input_sr, backend="numpy")
+    for start in range(0, len(signal), 4410):
+        classifier.push(signal[start:start + 4410])
+    held_back = int(seconds * audio_engine.SAMPLE_RATE) - classifier.received
+    assert held_back > 0
+
+    update = classifier.finish()
+    assert classifier.received == int(seconds * audio_engine.SAMPLE_RATE)
+    assert update is not None and update.time == seconds
+    # Every received sample is framed: the hop-aligned remainder is all that stays pending
+    assert len(classifier.pending) < classifier.extractor.n_fft
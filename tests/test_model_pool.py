@@ -0,0 +1,33 @@
+import threading
+
+from caresphere.model_pool import ModelPool
+
+
+def test_eviction_runs_outside_the_pool_lock():
+    pool = ModelPool(budget_mb=1)
+    reported = []
+
+    def on_evict(model):
+        # Another session's lookup must not wait for the eviction to finish
+        thread = threading.Thread(target=lambda: reported.append(pool.report()))
+        thread.start()
+        thread.join(timeout=2)
+        assert not thread.is_alive(), "pool lock held during on_evict"
+
+    for name in ("a", "b"):
+        pool.register(name, object, size_hint=lambda _: 2 ** 20, on_evict=on_evict)
+    pool.get("a")
+    pool.get("b")
+    assert reported
+    assert [row["Model"] for row in pool.report() if row["Loaded"]] == ["b"]
+
+
+def test_evicts_least_recently_used_until_within_budget():
+    pool = ModelPool(budget_mb=2)
+    for name in ("a", "b", "c"):
+        pool.register(name, object, size_hint=lambda _: 2 ** 20)
+    pool.get("a")
+    pool.get("b")
+    pool.get("a")
+    pool.get("c")
+    assert {row["Model"] for row in pool.report() if row["Loaded"]} == {"a", "c"}
@@ -0,0 +1,33 @@
+import time
+
+import numpy as np
+
+from caresphere import ocr
+
+IMAGE = np.zeros((8, 8, 3), dtype=np.uint8)
+
+
+def _sleeps(seconds):
+    def run(image, timeout):
+        time.sleep(seconds)
+        return "text"
+    return run
+
+
+def test_queue_time_does_not_count_against_the_timeout(monkeypatch):
+    monkeypatch.setitem(ocr.ENGINES, ocr.EASYOCR, _sleeps(0.1))
+    # Another session's scan holds the single EasyOCR worker for longer than the timeout
+    busy = ocr._executor(ocr.EASYOCR).submit(time.sleep, 0.5)
+    result, = ocr.run_engines(IMAGE, [ocr.EASYOCR], {ocr.EASYOCR: 0.3})
+    busy.result()
+    assert result.ok, result.error
+    assert result.text == "text"
+
+
+def test_engine_running_past_its_timeout_is_reported(monkeypatch):
+    engine = "Tesseract PSM-8"
+    monkeypatch.setitem(ocr.ENGINES, engine, _sleeps(0.5))
+    start = time.perf_counter()
+    result, = ocr.run_engines(IMAGE, [engine], {engine: 0.1})
+    assert time.perf_counter() - start < 0.4
+    assert not result.ok and "timed out" in result.error
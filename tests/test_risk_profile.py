@@ -0,0 +1,21 @@
+from caresphere.risk_profile import score_patients
+
+DIABETES = {"Pregnancies": 2, "Glucose": 130, "diastolic_bp": 70, "SkinThickness": 20, "Insulin": 80,
+            "BMI": 31.5, "pedigree": 0.4, "Age": 45}
+
+
+def test_empty_records_each_get_a_profile():
+    profiles = score_patients([{}, {}], models=["diabetes"])
+    assert len(profiles) == 2
+    for profile in profiles:
+        assert profile.risks == {"diabetes": None}
+        assert profile.errors["diabetes"].startswith("missing")
+
+
+def test_partial_record_is_reported_alongside_complete_ones():
+    partial = {"Glucose": 130, "Age": 45}
+    profiles = score_patients([DIABETES, partial, {}], models=["diabetes"])
+    assert len(profiles) == 3
+    assert profiles[0].risks["diabetes"] is not None and not profiles[0].errors
+    assert profiles[1].risks["diabetes"] is None and "Pregnancies" in profiles[1].errors["diabetes"]
+    assert profiles[2].risks["diabetes"] is None and "diabetes" in profiles[2].errors
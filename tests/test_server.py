@@ -0,0 +1,24 @@
+import json
+
+import pytest
+from starlette.testclient import TestClient
+
+from caresphere import audio_engine
+from caresphere.server import create_app
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(create_app(warm=False)) as client:
+        yield client
+
+
+@pytest.mark.parametrize("bad", [None, float("nan"), float("inf")])
+def test_non_finite_features_are_rejected(client, bad):
+    features = [0.0] * audio_engine.N_MFCC
+    features[3] = bad
+    # json.dumps writes NaN/Infinity literals, which the server's json.loads accepts
+    response = client.post("/v1/heartbeat", content=json.dumps({"features": features}),
+                           headers={"content-type": "application/json"})
+    assert response.status_code == 400
+    assert "finite" in response.json()["error"]
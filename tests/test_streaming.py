@@ -0,0 +1,24 @@
+import numpy as np
+
+from caresphere.streaming import sliding_windows
+
+
+def _chunks(signal, size):
+    return (signal[i:i + size] for i in range(0, len(signal), size))
+
+
+def test_hop_larger_than_window_skips_unread_samples():
+    # 9 "seconds" at 10 samples/s, read 5 samples at a time; window 2 s, hop 6 s
+    signal = np.arange(90, dtype=np.float32)
+    windows = list(sliding_windows(_chunks(signal, 5), size=20, hop=60))
+    assert [start for start, _ in windows] == [0, 60]
+    for start, window in windows:
+        np.testing.assert_array_equal(window, signal[start:start + 20])
+
+
+def test_overlapping_windows_match_the_signal():
+    signal = np.arange(100, dtype=np.float32)
+    windows = list(sliding_windows(_chunks(signal, 7), size=20, hop=10))
+    assert [start for start, _ in windows] == list(range(0, 81, 10))
+    for start, window in windows:
+        np.testing.assert_array_equal(window, signal[start:start + 20])